@@ -2,30 +2,33 @@
 # Run: streamlit run Main.py
 
 import streamlit as st
-from dotenv import load_dotenv
 
 from src import (
-    GREETING, PERSUASION_WITH_CDL,
-    CDL_QUESTION, YEARS_QUESTION, YEARS_FOLLOWUP, NIGHTS_QUESTION,
-    EARLY_EXIT_CDL, EARLY_EXIT_YEARS, EARLY_EXIT_NIGHTS,
-    POST_THANKS_AND_Q, FINAL_GOODBYE,
     ensure_seed_room, generate_random_name,
-    ensure_session_state, current_state, new_state,
-    say_assistant, say_user, is_negative, mentions_no_experience,
-    render_eligibility_panel,
-    classify, answer_user_question_anytopic
+    ensure_session_state, current_state, create_room, open_room, list_rooms, ROOMS_PER_PAGE, is_admin, owns_room,
+    say_assistant, say_user, render_history,
+    render_eligibility_panel, render_metrics_panel, render_faq_panel, metrics,
+    ScreeningEngine, ConversationState, AnswerStream, stream_user_question_anytopic
 )
 
 # --------- Boot ---------
-load_dotenv()
+# .env is loaded once, when src is first imported.
 st.set_page_config(page_title="Happy Hauler Assistant", page_icon="🚚", layout="wide")
 
-# Ensure conversations & current_room exist
+OUTCOME_MARKS = {"eligible": "✅", "not_eligible": "❌", "in_progress": "💬"}
+
+# Ensure current_room exists
 ensure_session_state()
 ensure_seed_room()
 
+@st.cache_resource
+def screening_engine() -> ScreeningEngine:
+    # Stateless, so one instance serves every session and rerun.
+    return ScreeningEngine(stream_answer=stream_user_question_anytopic)
+
 # Aliases
 state = current_state()
+engine = screening_engine()
 
 # --------- Header ---------
 st.header(f"💬 {st.session_state.current_room or 'Double Nickel Chatbot'}")
@@ -40,35 +43,80 @@ with st.sidebar:
         new_clicked = st.button("➕", key="btn_new_room", type="tertiary", help="New chat")
 
     if new_clicked:
-        name = generate_random_name()
-        st.session_state.conversations[name] = new_state()
-        st.session_state.current_room = name
+        create_room(generate_random_name())
+        st.session_state.room_page = 0
         st.rerun()
 
-    rooms = list(st.session_state.conversations.keys())
-    current_idx = rooms.index(st.session_state.current_room)
-    selected = st.radio("Select a chat", rooms, index=current_idx)
-    if selected != st.session_state.current_room:
-        st.session_state.current_room = selected
+    # Applicants see only the chats this session started; the recruiter view lists every room.
+    rooms, total_rooms = list_rooms(st.session_state.room_page, everyone=is_admin())
+    names = [r["room"] for r in rooms]
+    marks = {r["room"]: OUTCOME_MARKS.get(r["outcome"], "") for r in rooms}
+    current = st.session_state.current_room
+    selected = st.radio(
+        "Select a chat", names,
+        index=names.index(current) if current in names else None,
+        format_func=lambda n: f"{marks[n]} {n}",
+    )
+    if selected is not None and selected != current:
+        open_room(selected)
         st.rerun()
 
+    last_page = max(total_rooms - 1, 0) // ROOMS_PER_PAGE
+    if last_page > 0:
+        prev_col, page_col, next_col = st.columns([1, 2, 1])
+        with prev_col:
+            if st.button("◀", key="btn_prev_page", type="tertiary", disabled=st.session_state.room_page == 0):
+                st.session_state.room_page -= 1
+                st.rerun()
+        with page_col:
+            st.caption(f"Page {st.session_state.room_page + 1} of {last_page + 1}")
+        with next_col:
+            if st.button("▶", key="btn_next_page", type="tertiary",
+                         disabled=st.session_state.room_page >= last_page):
+                st.session_state.room_page += 1
+                st.rerun()
+
+    if is_admin():
+        render_metrics_panel()
+        render_faq_panel()
+
 # --------- Render history ---------
-for m in state["history"]:
-    with st.chat_message(m["role"]):
-        st.markdown(m["content"])
+with metrics.span("render_history"):
+    render_history(state["history"])
+
+# --------- Recruiter view of another session's chat: read-only ---------
+if not owns_room(st.session_state.current_room):
+    st.chat_input("Viewing as recruiter", disabled=True, key="chat_readonly")
+    st.divider()
+    render_eligibility_panel(state)
+    st.stop()
+
+# --------- Replies ---------
+def show_replies(replies, conv):
+    """
+    Render and record the engine's replies; a streamed answer settles the state once consumed
+    (or once it fails, with the offline answer).
+    """
+    for reply in replies:
+        with st.chat_message("assistant"):
+            if isinstance(reply, AnswerStream):
+                bubble = st.empty()
+                try:
+                    bubble.write_stream(reply)
+                except Exception:
+                    # The state already says post_qa_chat; settle with the offline answer, replacing the partial one.
+                    bubble.markdown(reply.fail())
+                conv = engine.settle(conv, reply)
+                reply = reply.text
+            else:
+                st.markdown(reply)
+        say_assistant(reply)
+    state.apply(conv.to_dict())
 
 # --------- First-load greeting ---------
-if state["step"] == "greeting" and not state["has_greeted"]:
-    say_assistant(GREETING)
-    state["has_greeted"] = True
-    state["step"] = "await_consent"
-    with st.chat_message("assistant"):
-        st.markdown(GREETING)
-
-# --------- Lock helper ---------
-def lock_and_rerun():
-    state["input_enabled"] = False
-    st.rerun()
+replies, conv = engine.start(ConversationState.from_dict(state))
+if replies:
+    show_replies(replies, conv)
 
 # --------- Disabled pane (single place) ---------
 if not state["input_enabled"]:
@@ -91,100 +139,9 @@ say_user(user_text)
 with st.chat_message("user"):
     st.markdown(user_text)
 
-step = state["step"]
-
-if step == "await_consent":
-    result = classify(user_text, intent_hint="consent_boolean")
-    nextmsg = CDL_QUESTION if result["answer_type"] == "affirmative" else PERSUASION_WITH_CDL
-    say_assistant(nextmsg)
-    with st.chat_message("assistant"):
-        st.markdown(nextmsg)
-    state["step"] = "ask_cdl"
-
-elif step == "ask_cdl":
-    result = classify(user_text, intent_hint="cdl_boolean")
-    if result["answer_type"] == "negative":
-        state["has_cdl"] = False
-        say_assistant(EARLY_EXIT_CDL)
-        with st.chat_message("assistant"):
-            st.markdown(EARLY_EXIT_CDL)
-        state["step"] = "done"
-        lock_and_rerun()
-    elif result["answer_type"] == "affirmative":
-        state["has_cdl"] = True
-        say_assistant(YEARS_QUESTION)
-        with st.chat_message("assistant"):
-            st.markdown(YEARS_QUESTION)
-        state["step"] = "ask_years"
-    else:
-        msg = "Just to confirm — do you have a valid Class A CDL? (Yes/No)"
-        say_assistant(msg)
-        with st.chat_message("assistant"):
-            st.markdown(msg)
-
-elif step == "ask_years":
-    result = classify(user_text, intent_hint="years_number")
-    no_exp = (
-        result["answer_type"] == "negative"
-        or (result["answer_type"] == "number" and isinstance(result["number_value"], int) and result["number_value"] <= 0)
-        or mentions_no_experience(user_text)
-    )
-    if no_exp:
-        state["years_experience"] = 0
-        say_assistant(EARLY_EXIT_YEARS)
-        with st.chat_message("assistant"):
-            st.markdown(EARLY_EXIT_YEARS)
-        state["step"] = "done"
-        lock_and_rerun()
-    elif result["answer_type"] == "number" and isinstance(result["number_value"], int) and result["number_value"] >= 1:
-        state["years_experience"] = result["number_value"]
-        say_assistant(NIGHTS_QUESTION)
-        with st.chat_message("assistant"):
-            st.markdown(NIGHTS_QUESTION)
-        state["step"] = "ask_nights"
-    else:
-        say_assistant(YEARS_FOLLOWUP)
-        with st.chat_message("assistant"):
-            st.markdown(YEARS_FOLLOWUP)
-
-elif step == "ask_nights":
-    result = classify(user_text, intent_hint="nights_boolean")
-    if result["answer_type"] == "negative":
-        state["nights_ok"] = False
-        say_assistant(EARLY_EXIT_NIGHTS)
-        with st.chat_message("assistant"):
-            st.markdown(EARLY_EXIT_NIGHTS)
-        state["step"] = "done"
-        lock_and_rerun()
-    elif result["answer_type"] == "affirmative":
-        state["nights_ok"] = True
-        say_assistant(POST_THANKS_AND_Q)
-        with st.chat_message("assistant"):
-            st.markdown(POST_THANKS_AND_Q)
-        state["step"] = "post_offer"
-    else:
-        msg = "Please let me know if two nights on the road each week is okay. (Yes/No)"
-        say_assistant(msg)
-        with st.chat_message("assistant"):
-            st.markdown(msg)
+with metrics.span("turn", step=state["step"]):
+    replies, conv = engine.step(ConversationState.from_dict(state), user_text)
+    show_replies(replies, conv)
 
-elif step in ("post_offer", "post_qa_chat"):
-    if is_negative(user_text):
-        say_assistant(FINAL_GOODBYE)
-        with st.chat_message("assistant"):
-            st.markdown(FINAL_GOODBYE)
-        state["step"] = "done"
-        lock_and_rerun()
-    else:
-        answer, on_topic = answer_user_question_anytopic(user_text)
-        say_assistant(answer)
-        with st.chat_message("assistant"):
-            st.markdown(answer)
-        if not on_topic:
-            state["step"] = "done"
-            lock_and_rerun()
-        else:
-            state["step"] = "post_qa_chat"
-
-elif step == "done":
-    lock_and_rerun()
+if not state["input_enabled"]:
+    st.rerun()
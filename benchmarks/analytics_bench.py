@@ -0,0 +1,133 @@
+# benchmarks/analytics_bench.py
+# Run: python -m benchmarks.analytics_bench --conversations 50000
+#
+# Fills a throwaway SQLite conversation store with synthetic screenings, then
+# compares the funnel computed per conversation dict (eligibility.py helpers
+# in a Python loop) with src/analytics.py: column build from the store,
+# vectorized aggregates, compressed export, and an incremental re-export after
+# a share of the conversations changed.
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def synthetic_rows(n: int, seed: int = 0) -> list[tuple]:
+    """
+    :return: conversations rows (room, FIELDS..., outcome, message_count, created_at, updated_at)
+    """
+    import numpy as np
+    from src import eligibility
+    from src.store import FIELDS, _to_db
+
+    rng = np.random.default_rng(seed)
+    now = time.time()
+    rows = []
+    for i in range(n):
+        state = {"step": "await_consent", "has_greeted": True, "has_cdl": None, "years_experience": None,
+                 "nights_ok": None, "input_enabled": True, "exit_reason": None}
+        r = rng.random(5)
+        if r[0] < 0.9:
+            state.update(step="ask_cdl")
+            if r[1] < 0.85:
+                state.update(has_cdl=bool(rng.random() < 0.8), step="ask_years")
+                if not state["has_cdl"]:
+                    state.update(step="done", exit_reason="no_cdl")
+                elif r[2] < 0.9:
+                    years = int(rng.choice([0, 1, 2, 3, 4, 5, 7, 10, 15, 20]))
+                    state.update(years_experience=years, step="ask_nights")
+                    if years < 1:
+                        state.update(step="done", exit_reason="no_experience")
+                    elif r[3] < 0.9:
+                        state.update(nights_ok=bool(rng.random() < 0.75), step="post_offer")
+                        if not state["nights_ok"]:
+                            state.update(step="done", exit_reason="no_nights")
+                        elif r[4] < 0.8:
+                            state.update(step="done", exit_reason="off_topic" if rng.random() < 0.1 else "finished")
+        if state["step"] == "done":
+            state["input_enabled"] = False
+        created = now - 3600 - 86400 * 30 * rng.random()
+        # Built from FIELDS, so a new state column is filled with None instead of breaking the INSERT.
+        rows.append((f"bench-{i}", *(_to_db(f, state.get(f)) for f in FIELDS),
+                     eligibility.outcome(state), int(rng.integers(2, 16)), created, created + 600 * rng.random()))
+    return rows
+
+def per_dict_funnel(store) -> dict:
+    # The pre-analytics way: one dict per conversation through eligibility.py.
+    from src.eligibility import missing_requirements
+
+    outcomes, steps, missing, exits, years = {}, {}, {}, {}, []
+    for row in store.iter_rows():
+        outcomes[row["outcome"]] = outcomes.get(row["outcome"], 0) + 1
+        if row["outcome"] == "in_progress":
+            steps[row["step"]] = steps.get(row["step"], 0) + 1
+        else:
+            for req in missing_requirements(row):
+                missing[req] = missing.get(req, 0) + 1
+            exits[row["exit_reason"]] = exits.get(row["exit_reason"], 0) + 1
+        if row["years_experience"] is not None:
+            years.append(row["years_experience"])
+    return {"outcomes": outcomes, "dropoff": steps, "missing": missing, "exits": exits, "years": len(years)}
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, round((time.perf_counter() - t0) * 1000, 1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-dict vs columnar funnel analytics.")
+    parser.add_argument("--conversations", type=int, default=50000)
+    parser.add_argument("--changed", type=float, default=0.01, help="share updated before the incremental export")
+    parser.add_argument("--out", default="bench_results/analytics_bench.json")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from src.store import SQLiteStore, FIELDS
+    from src.analytics import ConversationTable, funnel, export
+
+    tmp = tempfile.mkdtemp(prefix="analytics_bench_")
+    try:
+        store = SQLiteStore(os.path.join(tmp, "conversations.sqlite3"))
+        rows = synthetic_rows(args.conversations)
+        db = store._db()
+        db.execute("BEGIN")
+        db.executemany(
+            f"INSERT INTO conversations (room, {', '.join(FIELDS)}, outcome, message_count, created_at, updated_at)"
+            f" VALUES ({', '.join('?' for _ in range(len(FIELDS) + 5))})", rows)
+        db.execute("COMMIT")
+
+        _, per_dict_ms = timed(per_dict_funnel, store)
+        table, build_ms = timed(ConversationTable.from_store, store)
+        report, funnel_ms = timed(funnel, table)
+        npz = os.path.join(tmp, "analytics.npz")
+        full, full_export_ms = timed(export, npz, store=store)
+
+        changed = int(args.conversations * args.changed)
+        db.execute("UPDATE conversations SET step = 'done', input_enabled = 0, exit_reason = 'finished', "
+                   "updated_at = ? WHERE rowid <= ?", (time.time(), changed))
+        inc, incremental_ms = timed(export, npz, incremental=True, store=store)
+        (loaded, _), load_ms = timed(ConversationTable.load, npz)
+        _, report_ms = timed(funnel, loaded)
+        result = {
+            "conversations": args.conversations,
+            "per_dict_funnel_ms": per_dict_ms,
+            "columnar": {"build_ms": build_ms, "funnel_ms": funnel_ms, "full_export_ms": full_export_ms,
+                         "report_from_export_ms": round(load_ms + report_ms, 1)},
+            "incremental": {"changed": changed, "fetched": inc["fetched"], "export_ms": incremental_ms},
+            "bytes": {"sqlite": os.path.getsize(os.path.join(tmp, "conversations.sqlite3")),
+                      "npz": os.path.getsize(npz)},
+            "funnel": report,
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+    print(json.dumps(result, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2)
+
+if __name__ == "__main__":
+    main()
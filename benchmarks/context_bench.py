@@ -0,0 +1,93 @@
+# benchmarks/context_bench.py
+# Run: python -m benchmarks.context_bench --questions 60
+#
+# One long post-screening chat driven through ScreeningEngine with a stub
+# answerer: every question is on topic and gets a canned answer of realistic
+# length. For each turn the fused answer request is built three ways and its
+# prompt tokens estimated (~4 characters each):
+#   latest    the question alone (before src/context.py)
+#   full      every earlier exchange of the chat ahead of the question
+#   bounded   what the engine actually sends: facts, recent window, rolling summary
+# Also reports the time the engine spends building and updating the context per turn.
+import os
+import sys
+import json
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTIONS = [
+    "what's the home time like?",
+    "and what about weekends?",
+    "do you run team or solo?",
+    "what trucks are in the fleet, automatic or manual?",
+    "is there a sign-on bonus?",
+    "how does health insurance work and when does it start?",
+    "can I bring my dog on the road with me?",
+    "what lanes do you run most of the time?",
+    "is the freight mostly dry van or reefer?",
+    "how soon could I start after orientation?",
+]
+ANSWER = ("Thanks for asking. Most drivers are home every weekend, with routes planned around a 34-hour reset. "
+          "A recruiter can walk you through the exact schedule and lanes for your area during the next step.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-turn Q&A prompt size: latest message, full history, bounded.")
+    parser.add_argument("--questions", type=int, default=60)
+    parser.add_argument("--out", default="bench_results/context_bench.json")
+    args = parser.parse_args(argv)
+
+    os.environ.pop("OPENAI_API_KEY", None)
+    sys.path.insert(0, ROOT)
+    from benchmarks.fake_openai import _tokens
+    from src.engine import ScreeningEngine, ConversationState
+    from src.prompts import ANSWER_FUSED
+
+    def prompt_tokens(text: str, context: str) -> int:
+        body = ANSWER_FUSED.request(text=text, context=f"{context}\n\n" if context else "")
+        return sum(_tokens(m["content"]) for m in body["messages"])
+
+    sent = []
+
+    def answer(text, context=""):
+        sent.append(context)
+        return ANSWER, True
+
+    engine = ScreeningEngine(answer=answer)
+    state = ConversationState(step="post_offer", has_greeted=True, has_cdl=True, years_experience=5, nights_ok=True)
+    history, per_turn, engine_us = [], [], []
+    for i in range(args.questions):
+        text = QUESTIONS[i % len(QUESTIONS)]
+        t0 = time.perf_counter()
+        _, state = engine.step(state, text)
+        engine_us.append((time.perf_counter() - t0) * 1e6)
+        full = "\n".join(f"Applicant: {q}\nAssistant: {a}" for q, a in history)
+        per_turn.append({
+            "turn": i + 1,
+            "latest": prompt_tokens(text, ""),
+            "full": prompt_tokens(text, full),
+            "bounded": prompt_tokens(text, sent[-1]),
+        })
+        history.append((text, ANSWER))
+
+    def summary(key):
+        values = [t[key] for t in per_turn]
+        return {"first": values[0], "turn_10": values[min(9, len(values) - 1)], "last": values[-1],
+                "max": max(values), "total": sum(values)}
+
+    engine_us.sort()
+    report = {
+        "questions": args.questions,
+        "prompt_tokens": {key: summary(key) for key in ("latest", "full", "bounded")},
+        "state_bytes_at_end": len((state.qa_memory or "").encode("utf-8")),
+        "engine_step_us": {"p50": round(engine_us[len(engine_us) // 2], 1), "max": round(engine_us[-1], 1)},
+        "per_turn": per_turn,
+    }
+    print(json.dumps({k: v for k, v in report.items() if k != "per_turn"}, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
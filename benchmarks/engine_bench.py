@@ -0,0 +1,94 @@
+# benchmarks/engine_bench.py
+# Run: python -m benchmarks.engine_bench --conversations 20000
+#
+# Drives the load-test personas through ScreeningEngine in-process, with no
+# Streamlit and no network, and compares the memory of one conversation's
+# screening state as a ConversationState versus the legacy new_state() dict.
+#   --classify stub     canned classifier from the fake server (engine overhead only)
+#   --classify offline  the app's own offline path (local intent model + heuristics)
+import os
+import sys
+import json
+import time
+import argparse
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def run(engine, personas: list[list[str]], conversations: int) -> dict:
+    from src.engine import ConversationState
+
+    turns = 0
+    outcomes = {}
+    started = time.perf_counter()
+    for i in range(conversations):
+        _, state = engine.start(ConversationState())
+        for text in personas[i % len(personas)]:
+            if not state.input_enabled:
+                break
+            _, state = engine.step(state, text)
+            turns += 1
+        outcomes[state.step] = outcomes.get(state.step, 0) + 1
+    wall = time.perf_counter() - started
+    return {
+        "conversations": conversations,
+        "turns": turns,
+        "wall_s": round(wall, 3),
+        "conversations_per_s": round(conversations / wall, 1),
+        "turns_per_s": round(turns / wall, 1),
+        "us_per_turn": round(wall / turns * 1e6, 2),
+        "final_steps": outcomes,
+    }
+
+def state_bytes(factory, n: int = 10000) -> float:
+    """
+    :return: mean traced bytes per object built by factory()
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    keep = [factory() for _ in range(n)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del keep
+    return round((after - before) / n, 1)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="In-process throughput of the screening engine.")
+    parser.add_argument("--conversations", type=int, default=20000)
+    parser.add_argument("--classify", choices=("stub", "offline"), default="stub")
+    parser.add_argument("--out", default="bench_results/engine_bench.json")
+    args = parser.parse_args(argv)
+
+    os.environ.pop("OPENAI_API_KEY", None)
+    os.environ["CLASSIFY_CACHE_PATH"] = ""
+    sys.path.insert(0, ROOT)
+    from benchmarks.fake_openai import _classify_reply
+    from benchmarks.load_test import PERSONAS
+    from src.engine import ScreeningEngine, ConversationState
+    from src.matcher import scan
+
+    if args.classify == "stub":
+        engine = ScreeningEngine(
+            classify=lambda text, intent_hint: _classify_reply(text),
+            answer=lambda text, context="": ("A recruiter can share the details on that.", "truck" in scan(text)),
+        )
+    else:
+        engine = ScreeningEngine()
+
+    def legacy_state():
+        return {"step": "greeting", "history": [], "has_greeted": False, "has_cdl": None,
+                "years_experience": None, "nights_ok": None, "input_enabled": True}
+
+    report = {
+        "classify": args.classify,
+        **run(engine, list(PERSONAS.values()), args.conversations),
+        "state_bytes": {"ConversationState": state_bytes(ConversationState),
+                        "legacy_dict": state_bytes(legacy_state)},
+    }
+    print(json.dumps(report, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# benchmarks/fake_openai.py
+# Local stand-in for the OpenAI chat completions endpoint, for offline benchmarks.
+# Run: python -m benchmarks.fake_openai --port 8765 --latency-ms 300 --jitter-ms 100
+#
+# Point the app at it with OPENAI_BASE_URL=http://127.0.0.1:8765/v1 and any OPENAI_API_KEY.
+# Replies are canned from the request's system prompt (classify JSON, fused
+# {on_topic, answer}, streamed TRUCK|/OTHER| answers, packed batches), or taken
+# from a recorded responses file: a JSON list of {"match": substring, "content": text}.
+# GET /stats returns call and token counters; POST /stats/reset clears them.
+# --error-rate answers that fraction of requests with 503; --stall-rate holds that
+# fraction for an extra --stall-ms first, to rehearse upstream incidents.
+# Usage reports prompt_tokens_details.cached_tokens the way OpenAI's prefix cache
+# does: prompts of 1024+ tokens reuse the longest prefix already seen, in 128-token blocks.
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.matcher import scan
+from src.prompts import QUESTION_MARKER
+
+_SAID = re.compile(r"Applicant said: (.*)")
+_DIGITS = re.compile(r"-?\d+")
+
+def _tokens(text: str) -> int:
+    # Rough tokenizer-free estimate (~4 characters per token), good enough for relative comparisons.
+    return max(1, len(text) // 4)
+
+def _classify_reply(text: str) -> dict:
+    found = scan(text)
+    if "no_experience" in found:
+        return {"answer_type": "negative", "number_value": None, "reason": "no experience"}
+    if "no" in found:
+        return {"answer_type": "negative", "number_value": None, "reason": "no"}
+    m = _DIGITS.search(text)
+    if m:
+        return {"answer_type": "number", "number_value": int(m.group()), "reason": "number"}
+    if "yes" in found:
+        return {"answer_type": "affirmative", "number_value": None, "reason": "yes"}
+    return {"answer_type": "unknown", "number_value": None, "reason": "vague"}
+
+def canned_reply(body: dict) -> str:
+    """
+    Produce a plausible completion for one of the app's request shapes.
+    :param body: chat completions request body
+    :return: assistant message content
+    """
+    messages = body.get("messages", [])
+    system = messages[0]["content"] if messages else ""
+    user = messages[-1]["content"] if messages else ""
+    on_topic = "truck" in scan(user.rpartition(QUESTION_MARKER)[2])  # the question, not the context ahead of it
+    if "JSON list" in system:
+        items = json.loads(user.split("\n", 1)[0])
+        return json.dumps({"results": [dict(_classify_reply(it["text"]), id=it["id"]) for it in items]})
+    if '"on_topic"' in system:
+        return json.dumps({"on_topic": on_topic, "answer": "A recruiter can share the details on that."})
+    if "answer_type" in system:
+        m = _SAID.search(user)
+        return json.dumps(_classify_reply(m.group(1) if m else user))
+    if "binary classifier" in system:
+        return "truck" if on_topic else "other"
+    if "TRUCK|" in system:
+        tag = "TRUCK|" if on_topic else "OTHER|"
+        return f"{tag} Thanks for asking. A recruiter can share the details on that during the next step."
+    return "Thanks for asking. A recruiter can share the details on that during the next step."
+
+class PrefixCache:
+    """
+    Simulated provider prompt cache over the estimated token stream.
+    """
+
+    def __init__(self, min_tokens: int = 1024, block_tokens: int = 128):
+        self.min_tokens = min_tokens
+        self.block_tokens = block_tokens
+        self._seen = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, prompt: str) -> int:
+        """
+        :param prompt: full prompt text, in message order
+        :return: prompt tokens that would be served from cache
+        """
+        block_chars = self.block_tokens * 4  # matches _tokens()
+        prefixes = [hash(prompt[:i * block_chars]) for i in range(1, _tokens(prompt) // self.block_tokens + 1)]
+        cached = 0
+        with self._lock:
+            if _tokens(prompt) >= self.min_tokens:
+                for i, h in enumerate(prefixes):
+                    if h not in self._seen:
+                        break
+                    cached = (i + 1) * self.block_tokens
+            self._seen.update(prefixes)
+        return cached if cached >= self.min_tokens else 0
+
+class FakeOpenAI:
+    def __init__(self, latency_ms: float = 300, jitter_ms: float = 100, token_ms: float = 15,
+                 recorded: list | None = None, seed: int = 0,
+                 error_rate: float = 0.0, stall_rate: float = 0.0, stall_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.token_ms = token_ms
+        self.error_rate = error_rate
+        self.stall_rate = stall_rate
+        self.stall_ms = stall_ms
+        self.recorded = recorded or []
+        self._rng = random.Random(seed)
+        self.prefix_cache = PrefixCache()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.stats = {"calls": 0, "stream_calls": 0, "prompt_tokens": 0, "cached_tokens": 0,
+                          "completion_tokens": 0, "errors": 0, "stalls": 0}
+
+    def delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            stall = self.stall_ms if self._rng.random() < self.stall_rate else 0.0
+            self.stats["stalls"] += bool(stall)
+        return (max(0.0, self.latency_ms + jitter) + stall) / 1000
+
+    def fail(self) -> bool:
+        with self._lock:
+            failed = self._rng.random() < self.error_rate
+            self.stats["errors"] += failed
+        return failed
+
+    def reply(self, body: dict) -> tuple[str, dict]:
+        """
+        :return: reply content and an OpenAI-style usage dict
+        """
+        prompt = "".join(m.get("content") or "" for m in body.get("messages", []))
+        content = next((r["content"] for r in self.recorded if r["match"] in prompt), None)
+        if content is None:
+            content = canned_reply(body)
+        prompt_tokens, completion_tokens = _tokens(prompt), _tokens(content)
+        cached = self.prefix_cache.lookup(prompt)
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["stream_calls"] += bool(body.get("stream"))
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["cached_tokens"] += cached
+            self.stats["completion_tokens"] += completion_tokens
+        return content, {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                         "total_tokens": prompt_tokens + completion_tokens,
+                         "prompt_tokens_details": {"cached_tokens": cached}}
+
+def _handler(fake: FakeOpenAI):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, payload: dict, status: int = 200):
+            out = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(out)))
+            self.end_headers()
+            self.wfile.write(out)
+
+        def _chunk(self, data: bytes):
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            if self.path.rstrip("/") == "/stats":
+                with fake._lock:
+                    self._send_json(dict(fake.stats))
+            else:
+                self._send_json({"error": "not found"}, 404)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            if self.path.rstrip("/") == "/stats/reset":
+                fake.reset()
+                return self._send_json({"ok": True})
+            if not self.path.endswith("/chat/completions"):
+                return self._send_json({"error": "not found"}, 404)
+
+            time.sleep(fake.delay())
+            if fake.fail():
+                return self._send_json({"error": {"message": "overloaded", "type": "server_error"}}, 503)
+            content, usage = fake.reply(body)
+            model = body.get("model", "gpt-4o-mini")
+            if not body.get("stream"):
+                return self._send_json({
+                    "id": "chatcmpl-fake", "object": "chat.completion", "created": int(time.time()), "model": model,
+                    "choices": [{"index": 0, "finish_reason": "stop",
+                                 "message": {"role": "assistant", "content": content}}],
+                    "usage": usage,
+                })
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for piece in re.findall(r"\S*\s*", content):
+                if not piece:
+                    continue
+                chunk = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                         "model": model, "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                self._chunk(f"data: {json.dumps(chunk)}\n\n".encode())
+                time.sleep(fake.token_ms / 1000)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                final = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                         "model": model, "choices": [], "usage": usage}
+                self._chunk(f"data: {json.dumps(final)}\n\n".encode())
+            self._chunk(b"data: [DONE]\n\n")
+            self._chunk(b"")
+
+    return Handler
+
+def serve(fake: FakeOpenAI, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """
+    Start the fake server on a background thread.
+    :return: running server; server.server_address has the bound port
+    """
+    server = ThreadingHTTPServer((host, port), _handler(fake))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fake OpenAI chat completions server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300, help="mean time before the reply (or first token)")
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--token-ms", type=float, default=15, help="delay between streamed chunks")
+    parser.add_argument("--responses", help="recorded responses JSON file")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="fraction of requests delayed by --stall-ms")
+    parser.add_argument("--stall-ms", type=float, default=30000)
+    args = parser.parse_args(argv)
+
+    recorded = None
+    if args.responses:
+        with open(args.responses, encoding="utf-8") as f:
+            recorded = json.load(f)
+    fake = FakeOpenAI(args.latency_ms, args.jitter_ms, args.token_ms, recorded,
+                      error_rate=args.error_rate, stall_rate=args.stall_rate, stall_ms=args.stall_ms)
+    server = serve(fake, args.host, args.port)
+    print(f"fake OpenAI listening on http://{args.host}:{server.server_address[1]}/v1", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+# benchmarks/faq_bench.py
+# Run: python -m benchmarks.faq_bench [--thresholds 0.4,0.5,0.6,0.7]
+#
+# Held-out paraphrases of post-screening questions, labelled with the FAQ entry
+# that should answer them (None: must fall through to the LLM). Reports hit
+# rate, precision and false hits per threshold (with the job-topic keyword gate
+# llm.py applies, and without it at the default threshold), lookup latency, and
+# the model time saved per question against the fake server's configured
+# answer latency.
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+QUESTIONS = [
+    ("what is home time like", "home_time"),
+    ("how often do I get to go home?", "home_time"),
+    ("will I be home on weekends?", "home_time"),
+    ("how many nights a week am I out?", "home_time"),
+    ("whats the schedule", "home_time"),
+    ("where's the job located?", "location"),
+    ("where is this based out of?", "location"),
+    ("which routes would I run?", "location"),
+    ("is this regional or local?", "location"),
+    ("what kind of trucks do you run?", "equipment"),
+    ("what equipment do you use?", "equipment"),
+    ("are trucks automatic?", "equipment"),
+    ("do you pull reefer?", "equipment"),
+    ("what are the benefits?", "benefits"),
+    ("do you have health insurance?", "benefits"),
+    ("do you offer a 401k", "benefits"),
+    ("how much PTO do I get?", "benefits"),
+    ("what do I need to qualify for this?", "requirements"),
+    ("what are the job requirements?", "requirements"),
+    ("what happens next?", "next_steps"),
+    ("when will I hear from a recruiter?", "next_steps"),
+    ("what's the next step?", "next_steps"),
+    ("how can I contact a recruiter?", "contact"),
+    ("what's your email address?", "contact"),
+    ("do I need hazmat?", "endorsements"),
+    ("which endorsements are required?", "endorsements"),
+    ("is it a team job?", "team_or_solo"),
+    ("can my dog ride with me?", "team_or_solo"),
+    ("who won the game last night?", None),
+    ("what's the weather tomorrow?", None),
+    ("can you recommend a good pizza place?", None),
+    ("do you have a sign on bonus?", None),
+    ("do you do drug testing?", None),
+    ("is there orientation?", None),
+    ("what is the company's safety record?", None),
+    ("tell me a joke", None),
+    ("what time is it?", None),
+    ("how often do you eat?", None),
+    ("what is your name?", None),
+]
+
+def evaluate(faq, threshold: float, topic_gate: bool = True) -> dict:
+    from src.matcher import scan
+
+    hits = correct = false_hits = 0
+    expected_hits = sum(1 for _, key in QUESTIONS if key)
+    for text, key in QUESTIONS:
+        found = scan(text)
+        if topic_gate and "truck" not in found and "job" not in found:
+            continue  # as in llm._local_answer: no job topic, no FAQ answer
+        row, score = faq.index().search(text)
+        if row is None or score < threshold:
+            continue
+        hits += 1
+        if row["key"] == key:
+            correct += 1
+        elif key is None:
+            false_hits += 1
+    return {
+        "threshold": threshold,
+        "hit_rate": round(hits / len(QUESTIONS), 3),
+        "recall": round(correct / expected_hits, 3),
+        "precision": round(correct / hits, 3) if hits else 0.0,
+        "off_topic_answered": false_hits,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="FAQ index hit rate and latency.")
+    parser.add_argument("--thresholds", default="0.4,0.5,0.6,0.7")
+    parser.add_argument("--llm-ms", type=float, default=900, help="typical end-to-end LLM answer time to compare")
+    parser.add_argument("--out", default="bench_results/faq_bench.json")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from src.faq import FaqBase
+
+    faq = FaqBase(db_path="")
+    t0 = time.perf_counter()
+    faq.index()
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    timings = []
+    for _ in range(20):
+        for text, _key in QUESTIONS:
+            t0 = time.perf_counter()
+            faq.index().search(text)
+            timings.append((time.perf_counter() - t0) * 1000)
+
+    levels = [evaluate(faq, float(t)) for t in args.thresholds.split(",") if t.strip()]
+    at_default = evaluate(faq, faq.threshold)
+    lookup_ms = statistics.median(timings)
+    report = {
+        "questions": len(QUESTIONS),
+        "index_rows": len(faq.index().rows),
+        "index_build_ms": round(build_ms, 2),
+        "lookup_ms_p50": round(lookup_ms, 4),
+        "lookup_ms_max": round(max(timings), 4),
+        "thresholds": levels,
+        "default_threshold": at_default,
+        "default_threshold_without_topic_gate": evaluate(faq, faq.threshold, topic_gate=False),
+        "llm_ms_saved_per_question": round(at_default["hit_rate"] * (args.llm_ms - lookup_ms), 1),
+    }
+    print(json.dumps(report, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
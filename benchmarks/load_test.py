@@ -0,0 +1,161 @@
+# benchmarks/load_test.py
+# Run: python -m benchmarks.load_test --levels 1,10,100 --out bench_results/load_test.json
+#
+# Drives complete screening conversations through Main.py (via Streamlit's
+# AppTest) against benchmarks/fake_openai.py, so it runs with no network.
+# AppTest keeps process-global runtime state, so each simulated candidate
+# runs in its own forked worker process; the fake server is a separate process.
+import os
+import sys
+import json
+import time
+import argparse
+import subprocess
+import urllib.request
+import multiprocessing as mp
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "Main.py")
+
+PERSONAS = {
+    "pass_with_questions": ["yes", "yes I have my class A", "5 years", "sure",
+                            "what's the home time like?", "where is the job based?", "no thanks"],
+    "fail_cdl": ["ok", "no I don't"],
+    "fail_years": ["yes", "yes", "no experience"],
+    "fail_nights": ["sure", "yes", "3 years", "no I can't do nights"],
+    "off_topic": ["yes", "yes", "10 years", "yes", "who won the game last night?"],
+    "vague": ["hmm maybe", "yep", "a while", "about 4 years", "okay", "no"],
+}
+
+def percentiles(values: list[float]) -> dict:
+    if not values:
+        return {"p50": None, "p95": None, "p99": None}
+    ordered = sorted(values)
+
+    def rank(q):
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 2)
+
+    return {"p50": rank(0.50), "p95": rank(0.95), "p99": rank(0.99)}
+
+def run_conversation(persona: str) -> dict:
+    """
+    Play one persona through Main.py in this process.
+    :return: per-turn latencies (ms), total latency and classify tier deltas
+    """
+    from streamlit.testing.v1 import AppTest
+    from src import tier_stats
+
+    before = tier_stats()
+    started = time.perf_counter()
+    at = AppTest.from_file(MAIN, default_timeout=120).run()
+    turns = [(time.perf_counter() - started) * 1000]
+    for text in PERSONAS[persona]:
+        if not at.chat_input or at.chat_input[0].disabled:
+            break
+        t0 = time.perf_counter()
+        at.chat_input[0].set_value(text).run()
+        turns.append((time.perf_counter() - t0) * 1000)
+    after = tier_stats()
+    return {
+        "persona": persona,
+        "turn_ms": turns,
+        "conversation_ms": (time.perf_counter() - started) * 1000,
+        "errors": len(at.exception),
+        "tiers": {k: after[k] - before[k] for k in after if k != "offline_ratio"},
+    }
+
+def _fake_stats(base: str, reset: bool = False) -> dict:
+    req = urllib.request.Request(f"{base}/stats" + ("/reset" if reset else ""),
+                                 data=b"{}" if reset else None, method="POST" if reset else "GET")
+    with urllib.request.urlopen(req, timeout=10) as resp:
+        return json.loads(resp.read())
+
+def run_level(base: str, concurrency: int, conversations: int) -> dict:
+    personas = [list(PERSONAS)[i % len(PERSONAS)] for i in range(conversations)]
+    _fake_stats(base, reset=True)
+    started = time.perf_counter()
+    # maxtasksperchild=1: every conversation starts from a fresh fork, like a new candidate.
+    with mp.get_context("fork").Pool(concurrency, maxtasksperchild=1) as pool:
+        results = pool.map(run_conversation, personas, chunksize=1)
+    wall = time.perf_counter() - started
+    server = _fake_stats(base)
+
+    tiers = {}
+    for r in results:
+        for k, v in r["tiers"].items():
+            tiers[k] = tiers.get(k, 0) + v
+    n = len(results)
+    return {
+        "concurrency": concurrency,
+        "conversations": n,
+        "wall_s": round(wall, 3),
+        "throughput_conversations_per_s": round(n / wall, 3),
+        "turn_latency_ms": percentiles([t for r in results for t in r["turn_ms"][1:]]),
+        "first_render_ms": percentiles([r["turn_ms"][0] for r in results]),
+        "conversation_latency_ms": percentiles([r["conversation_ms"] for r in results]),
+        "llm_calls_per_conversation": round(server["calls"] / n, 3),
+        "prompt_tokens_per_conversation": round(server["prompt_tokens"] / n, 1),
+        "cached_prompt_tokens_per_conversation": round(server.get("cached_tokens", 0) / n, 1),
+        "completion_tokens_per_conversation": round(server["completion_tokens"] / n, 1),
+        "classify_tiers": tiers,
+        "errors": sum(r["errors"] for r in results),
+    }
+
+def _start_fake(args) -> tuple[subprocess.Popen, str]:
+    cmd = [sys.executable, "-m", "benchmarks.fake_openai", "--port", str(args.port),
+           "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms),
+           "--token-ms", str(args.token_ms)]
+    if args.responses:
+        cmd += ["--responses", args.responses]
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True)
+    proc.stdout.readline()  # wait for the "listening" line
+    return proc, f"http://127.0.0.1:{args.port}"
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test of the screening flow.")
+    parser.add_argument("--levels", default="1,10,100", help="comma-separated concurrent candidates")
+    parser.add_argument("--conversations", type=int, default=0,
+                        help="conversations per level (default: max(2 x level, 12))")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--token-ms", type=float, default=15)
+    parser.add_argument("--responses", help="recorded responses JSON for the fake server")
+    parser.add_argument("--cache", action="store_true", help="keep the classify disk cache enabled")
+    parser.add_argument("--out", default="bench_results/load_test.json")
+    args = parser.parse_args(argv)
+
+    proc, base = _start_fake(args)
+    # Set before the workers fork so the shared client and settings pick them up.
+    os.environ["OPENAI_BASE_URL"] = f"{base}/v1"
+    os.environ["OPENAI_API_KEY"] = os.environ.get("BENCH_OPENAI_API_KEY", "sk-fake-bench")
+    if not args.cache:
+        os.environ["CLASSIFY_CACHE_PATH"] = ""
+    sys.path.insert(0, ROOT)
+    # Import once in the parent so forked workers start warm.
+    import streamlit.testing.v1  # noqa: F401
+    from src.intent_model import default_model
+    default_model()
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "levels": [],
+    }
+    try:
+        for level in (int(x) for x in args.levels.split(",") if x.strip()):
+            conversations = args.conversations or max(2 * level, 12)
+            result = run_level(base, level, conversations)
+            report["levels"].append(result)
+            print(json.dumps(result), flush=True)
+    finally:
+        proc.terminate()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
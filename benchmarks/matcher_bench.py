@@ -0,0 +1,99 @@
+# benchmarks/matcher_bench.py
+# Run: python -m benchmarks.matcher_bench
+#
+# Compares the single-pass matcher in src/matcher.py with the substring
+# scans it replaced, on timing and on the messages where they disagree, and
+# checks that possessives still match their keyword (exits 1 if one doesn't).
+import re
+import timeit
+
+from src.matcher import scan
+
+CORPUS = [
+    "yes", "yep I have it", "no", "nope", "I know how to drive a truck", "not really",
+    "5 years", "about 3 years of OTR", "never drove a truck", "no experience", "zero",
+    "what's the pay?", "how many miles per week", "is there overtime?", "where is the job based?",
+    "do you offer benefits", "what does the schedule look like", "I'm good, thanks",
+    "no questions", "that's all", "what is the weather today", "tell me a joke",
+    "can I bring my dog", "nothing else", "Is this a dedicated route or regional?",
+    "Not sure, maybe", "okay sounds good", "yeah that works", "I don't have one",
+    "I have a cdl class a with hazmat endorsement", "what about home time on weekends",
+    "who won the game last night", "can you note that I prefer flatbed", "another question",
+    "is my cdl's hazmat endorsement enough?", "the truck's transmission", "I have a driver's license",
+]
+
+# Possessive forms the substring helpers matched: (message, category it must hit).
+POSSESSIVES = [
+    ("what about my cdl's expiration", "truck"), ("the truck's age", "truck"), ("driver's seat comfort", "truck"),
+    ("the company's 401k", "job"), ("is the recruiter's number the same", "job"), ("that's all", "closing"),
+]
+
+def legacy_is_truck_related(t):
+    t = (t or "").strip().lower()
+    truck_keywords = [
+        "truck", "driv", "cdl", "class a", "mvr", "routes", "lanes", "miles", "cents per mile",
+        "orientation", "ot", "home time", "dispatch", "equipment", "benefit", "policy", "policies",
+        "pay", "salary", "wage", "compensation", "dedicated", "regional", "otr",
+        "night", "shift", "schedule", "hazmat", "endorsement", "hours of service", "hos", "dot",
+        "pre-trip", "post-trip", "trailer", "reefer", "flatbed",
+        "location", "where", "based", "days off", "pto", "vacation", "holiday"
+    ]
+    return any(k in t for k in truck_keywords)
+
+def legacy_is_negative(t):
+    t = (t or "").strip().lower()
+    negative_terms = [
+        "no", "nope", "nah", "not really", "i'm good", "im good", "all good",
+        "no questions", "no question", "nothing", "that's all", "thats all", "i'm fine", "im fine",
+        "no thanks", "no thank you"
+    ]
+    return any(term in t for term in negative_terms)
+
+def legacy_mentions_no_experience(t):
+    t = (t or "").strip().lower()
+    patterns = [
+        r"\bno experience\b", r"\bnone\b", r"\bzero\b", r"\b0\b", r"\bnever\b",
+        r"\bno exp\b", r"\bnew driver\b", r"\bno driving experience\b"
+    ]
+    return any(re.search(p, t) for p in patterns)
+
+def legacy_yes_no(t):
+    t = (t or "").strip().lower()
+    if any(x in t for x in ["yes", "yep", "yeah", "sure", "ok", "okay", "affirmative", "yup", "ya"]):
+        return "yes"
+    if any(x in t for x in ["no", "nope", "nah", "don't have", "do not have", "not really"]):
+        return "no"
+    return None
+
+def legacy_all(t):
+    return (legacy_is_truck_related(t), legacy_is_negative(t),
+            legacy_mentions_no_experience(t), legacy_yes_no(t))
+
+def new_all(t):
+    found = scan(t)
+    yes_no = "yes" if "yes" in found else "no" if "no" in found else None
+    return ("truck" in found, "closing" in found, "no_experience" in found, yes_no)
+
+def main(repeat: int = 2000):
+    missed = [(text, category) for text, category in POSSESSIVES if category not in scan(text)]
+    for text, category in missed:
+        print(f"possessive not matched: {text!r} should hit {category}")
+
+    labels = ("truck", "closing", "no_experience", "yes/no")
+    print("Disagreements (legacy -> new):")
+    for text in CORPUS:
+        old, new = legacy_all(text), new_all(text)
+        for label, a, b in zip(labels, old, new):
+            if a != b:
+                print(f"  {text!r:55} {label:14} {a!s:>6} -> {b}")
+
+    n = repeat * len(CORPUS)
+    t_old = timeit.timeit(lambda: [legacy_all(t) for t in CORPUS], number=repeat)
+    t_new = timeit.timeit(lambda: [new_all(t) for t in CORPUS], number=repeat)
+    print(f"\nlegacy helpers: {t_old / n * 1e6:7.2f} us/message")
+    print(f"single pass:    {t_new / n * 1e6:7.2f} us/message  ({t_old / t_new:.1f}x)")
+    if missed:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
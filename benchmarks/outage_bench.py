@@ -0,0 +1,121 @@
+# benchmarks/outage_bench.py
+# Run: python -m benchmarks.outage_bench --conversations 30
+#
+# Plays the load-test personas through ScreeningEngine (real classify/answer
+# code, LLM tier forced on) against the fake OpenAI server in four upstream
+# conditions: healthy, flaky (a share of 503s), down (every request 503) and
+# stalled (every request hangs for --stall-ms). Reports per-turn latency
+# percentiles, how many turns fell back to heuristics, and the breaker's
+# counters, so the p99 bound of src/resilience.py can be checked. Budgets are
+# scaled down (--turn-budget/--call-timeout/--cooldown) to keep the run short.
+import os
+import sys
+import json
+import time
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCENARIOS = {
+    "healthy": {},
+    "flaky": {"error_rate": 0.3},
+    "down": {"error_rate": 1.0},
+    "stalled": {"stall_rate": 1.0},
+}
+
+def play(engine, personas: list[list[str]], conversations: int) -> tuple[list[float], dict]:
+    from src.engine import ConversationState
+
+    latencies, outcomes = [], {}
+    for i in range(conversations):
+        _, state = engine.start(ConversationState())
+        for text in personas[i % len(personas)]:
+            if not state.input_enabled:
+                break
+            t0 = time.perf_counter()
+            _, state = engine.step(state, text)
+            latencies.append((time.perf_counter() - t0) * 1000)
+        outcomes[state.step] = outcomes.get(state.step, 0) + 1
+    return latencies, outcomes
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Turn latency under upstream failures.")
+    parser.add_argument("--conversations", type=int, default=30, help="per scenario")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=150)
+    parser.add_argument("--jitter-ms", type=float, default=50)
+    parser.add_argument("--stall-ms", type=float, default=20000)
+    parser.add_argument("--turn-budget", type=float, default=3.0)
+    parser.add_argument("--call-timeout", type=float, default=1.5)
+    parser.add_argument("--cooldown", type=float, default=5.0)
+    parser.add_argument("--port", type=int, default=8767, help="fake OpenAI server port")
+    parser.add_argument("--out", default="bench_results/outage_bench.json")
+    args = parser.parse_args(argv)
+
+    # src/ reads these at import, so they are set before anything imports it.
+    os.environ.update({
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.port}/v1",
+        "OPENAI_API_KEY": "sk-fake-bench",
+        "INTENT_MODEL_PATH": "",
+        "CLASSIFY_CACHE_MEMORY": "0",
+        "CLASSIFY_CACHE_PATH": "",
+        "FAQ_DB_PATH": "",
+        "FAQ_THRESHOLD": "2",  # no FAQ hits: every question goes to the model
+    })
+    sys.path.insert(0, ROOT)
+    from benchmarks.fake_openai import FakeOpenAI, serve
+
+    fake = FakeOpenAI(args.latency_ms, args.jitter_ms, token_ms=0, stall_ms=args.stall_ms)
+    server = serve(fake, port=args.port)
+    from benchmarks.load_test import PERSONAS
+    from src import llm, resilience
+    from src.engine import ScreeningEngine
+
+    resilience.TURN_BUDGET = args.turn_budget
+    resilience.CALL_TIMEOUT = args.call_timeout
+    engine = ScreeningEngine()
+    report = {"config": {k: v for k, v in vars(args).items() if k != "out"}, "scenarios": []}
+    for name in (s.strip() for s in args.scenarios.split(",") if s.strip()):
+        faults = SCENARIOS[name]
+        fake.error_rate = faults.get("error_rate", 0.0)
+        fake.stall_rate = faults.get("stall_rate", 0.0)
+        fake.reset()
+        resilience.BREAKER = resilience.CircuitBreaker(cooldown=args.cooldown)
+        before = resilience.resilience_stats()
+        tiers_before = llm.tier_stats()
+
+        started = time.perf_counter()
+        latencies, outcomes = play(engine, list(PERSONAS.values()), args.conversations)
+        wall = time.perf_counter() - started
+
+        after = resilience.resilience_stats()
+        tiers = llm.tier_stats()
+        ordered = sorted(latencies)
+        result = {
+            "scenario": name,
+            "turns": len(latencies),
+            "wall_s": round(wall, 2),
+            "turn_ms": {"p50": round(ordered[len(ordered) // 2], 1),
+                        "p99": round(ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))], 1),
+                        "max": round(ordered[-1], 1)},
+            "classify_llm": tiers["llm"] - tiers_before["llm"],
+            "classify_fallback": tiers["heuristic"] - tiers_before["heuristic"],
+            "unavailable": {k[len("unavailable_"):]: after[k] - before[k]
+                            for k in after if k.startswith("unavailable_") and after[k] != before[k]},
+            "retries": after["retries"] - before["retries"],
+            "breaker_opened": after["opened"],
+            "breaker_rejected": after["rejected"],
+            "upstream": {k: fake.stats[k] for k in ("calls", "errors", "stalls")},
+            "final_steps": outcomes,
+        }
+        report["scenarios"].append(result)
+        print(json.dumps(result), flush=True)
+    server.shutdown()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+# benchmarks/prompt_bench.py
+# Run: python -m benchmarks.prompt_bench --conversations 200
+#
+# Prompt-token cost per conversation for the old request layout (classify
+# examples after the applicant's text) and the src/prompts.py templates (all
+# static text first, applicant's text last). Every model call the engine makes
+# for the load-test personas is rebuilt in both layouts and passed through the
+# fake server's prefix-cache simulation. Every post-screening question is
+# counted as one fused answer call, with no FAQ or keyword short-circuits.
+# Tokens are estimated at ~4 characters each. --min-cache-tokens sets the
+# provider's minimum cacheable prompt (1024 for OpenAI).
+import os
+import sys
+import json
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The classify request as it was built before the templates, kept for comparison.
+LEGACY_EXAMPLES = """
+        User: "yep I have it" -> {"answer_type":"affirmative","number_value":null,"reason":"yes cdl"}
+        User: "nope" -> {"answer_type":"negative","number_value":null,"reason":"no"}
+        User: "about 3 years" -> {"answer_type":"number","number_value":3,"reason":"3 years"}
+        User: "a while" -> {"answer_type":"unknown","number_value":null,"reason":"vague"}
+    """
+
+def legacy_classify(text: str, intent: str) -> dict:
+    from src.prompts import CLASSIFY_SYSTEM
+
+    user_msg = f"Current question intent: {intent}.\nApplicant said: {text}\n{LEGACY_EXAMPLES}"
+    return {"messages": [{"role": "system", "content": CLASSIFY_SYSTEM}, {"role": "user", "content": user_msg}]}
+
+def record_calls(conversations: int) -> list[tuple[str, str, str]]:
+    """
+    :return: (kind, intent, text) for every model call, in conversation order
+    """
+    from benchmarks.fake_openai import _classify_reply
+    from benchmarks.load_test import PERSONAS
+    from src.engine import ScreeningEngine, ConversationState
+    from src.matcher import scan
+
+    calls = []
+
+    def classify(text, intent_hint="generic"):
+        calls.append(("classify", intent_hint, text))
+        return _classify_reply(text)
+
+    def answer(text, context=""):
+        calls.append(("answer", "", text))
+        return "A recruiter can share the details on that.", "truck" in scan(text)
+
+    engine = ScreeningEngine(classify=classify, answer=answer)
+    personas = list(PERSONAS.values())
+    for i in range(conversations):
+        _, state = engine.start(ConversationState())
+        for text in personas[i % len(personas)]:
+            if not state.input_enabled:
+                break
+            _, state = engine.step(state, text)
+    return calls
+
+def price(calls, build, min_cache_tokens: int, cached_price: float) -> dict:
+    from benchmarks.fake_openai import PrefixCache, _tokens
+
+    cache = PrefixCache(min_tokens=min_cache_tokens)
+    prompt = cached = stable = 0
+    last = {}
+    for kind, intent, text in calls:
+        body = build(kind, intent, text)
+        full = "".join(m["content"] for m in body["messages"])
+        prompt += _tokens(full)
+        cached += cache.lookup(full)
+        # Prefix shared with the previous request of the same kind: what a provider could cache.
+        prev = last.get((kind, intent), "")
+        common = len(os.path.commonprefix([prev, full]))
+        stable += _tokens(full[:common]) if common else 0
+        last[(kind, intent)] = full
+    return {
+        "prompt_tokens": prompt,
+        "cached_tokens": cached,
+        "stable_prefix_share": round(stable / prompt, 3) if prompt else 0.0,
+        "billed_input_tokens": round(prompt - cached + cached * cached_price, 1),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prompt tokens per conversation, old layout vs templates.")
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--min-cache-tokens", type=int, default=1024)
+    parser.add_argument("--cached-price", type=float, default=0.5, help="price of a cached token vs. uncached")
+    parser.add_argument("--out", default="bench_results/prompt_bench.json")
+    args = parser.parse_args(argv)
+
+    os.environ.pop("OPENAI_API_KEY", None)
+    sys.path.insert(0, ROOT)
+    from src.prompts import classify_template, ANSWER_FUSED
+
+    def legacy(kind, intent, text):
+        return legacy_classify(text, intent) if kind == "classify" else ANSWER_FUSED.request(text=text, context="")
+
+    def templates(kind, intent, text):
+        if kind == "classify":
+            return classify_template(intent).request(intent=intent, text=text)
+        return ANSWER_FUSED.request(text=text, context="")
+
+    calls = record_calls(args.conversations)
+    n = args.conversations
+    report = {"conversations": n, "model_calls_per_conversation": round(len(calls) / n, 2), "layouts": {}}
+    for name, build in (("legacy", legacy), ("templates", templates)):
+        totals = price(calls, build, args.min_cache_tokens, args.cached_price)
+        report["layouts"][name] = {
+            "prompt_tokens_per_conversation": round(totals["prompt_tokens"] / n, 1),
+            "cached_tokens_per_conversation": round(totals["cached_tokens"] / n, 1),
+            "billed_input_tokens_per_conversation": round(totals["billed_input_tokens"] / n, 1),
+            "stable_prefix_share": totals["stable_prefix_share"],
+        }
+    print(json.dumps(report, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
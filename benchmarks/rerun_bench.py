@@ -0,0 +1,82 @@
+# benchmarks/rerun_bench.py
+# Run: python -m benchmarks.rerun_bench --sizes 10,100,1000 --reruns 20
+#
+# Measures how long one Streamlit rerun of Main.py takes as the open chat grows,
+# with the windowed history renderer and with every message rendered (the old loop).
+# Uses the in-memory conversation store and no OpenAI key, so it runs offline.
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "Main.py")
+
+def _history(n: int) -> list[dict]:
+    line = "Sure — **home time** is every weekend, and pay is _60 to 65 cents per mile_. Anything else?"
+    return [{"role": "user" if i % 2 else "assistant", "content": f"{i}: {line}"} for i in range(n)]
+
+def measure(size: int, reruns: int, window: int) -> dict:
+    """
+    :param size: messages in the open conversation
+    :param reruns: timed reruns after warm-up
+    :param window: live history window (a huge value renders everything)
+    :return: rerun timings in ms
+    """
+    from streamlit.testing.v1 import AppTest
+    import src.state
+    from src.store import get_store
+
+    src.state.HISTORY_WINDOW = window
+    at = AppTest.from_file(MAIN, default_timeout=120).run()
+    room = at.session_state["current_room"]
+    store = get_store()
+    for m in _history(size):
+        store.append_message(room, m["role"], m["content"])
+    del at.session_state["conversation"]  # reload the room from the store on the next run
+    at.run()
+
+    timings = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return {
+        "messages": len(at.session_state["conversation"]["history"]),
+        "rendered": len(at.chat_message),
+        "mean_ms": round(statistics.mean(timings), 2),
+        "p50_ms": round(statistics.median(timings), 2),
+        "max_ms": round(max(timings), 2),
+        "errors": len(at.exception),
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rerun cost of Main.py versus conversation length.")
+    parser.add_argument("--sizes", default="10,100,1000")
+    parser.add_argument("--reruns", type=int, default=20)
+    parser.add_argument("--out", default="bench_results/rerun_bench.json")
+    args = parser.parse_args(argv)
+
+    os.environ["CONVERSATION_STORE"] = "memory"
+    os.environ.pop("OPENAI_API_KEY", None)
+    sys.path.insert(0, ROOT)
+    import src.state
+
+    windowed = src.state.HISTORY_WINDOW
+    results = []
+    for size in (int(x) for x in args.sizes.split(",") if x.strip()):
+        for mode, window in (("windowed", windowed), ("full", 10 ** 9)):
+            row = {"mode": mode, "window": windowed if mode == "windowed" else None,
+                   **measure(size, args.reruns, window)}
+            results.append(row)
+            print(json.dumps(row), flush=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({"reruns": args.reruns, "results": results}, f, indent=2)
+    print(f"wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+# benchmarks/startup_bench.py
+# Run: python -m benchmarks.startup_bench --cold 5 --reruns 30
+#
+# Cold start: each sample is a fresh interpreter that imports the app package,
+# renders Main.py once (the greeting) and plays one deterministic turn answered
+# by the local intent model, recording which heavy modules got loaded on the way.
+# Warm rerun: one AppTest session rerunning Main.py with no new input.
+# Offline: in-memory store, and the OpenAI endpoint points at a closed port.
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "Main.py")
+HEAVY = ("openai", "httpx", "numpy", "dotenv")
+
+_COLD = """
+import sys, json, time
+t0 = time.perf_counter()
+import src
+t1 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t2 = time.perf_counter()
+at = AppTest.from_file(%(main)r, default_timeout=60).run()
+t3 = time.perf_counter()
+after_first_run = [m for m in %(heavy)r if m in sys.modules]
+at.chat_input[0].set_value("yes").run()
+t4 = time.perf_counter()
+print(json.dumps({
+    "import_src_ms": (t1 - t0) * 1000,
+    "first_run_ms": (t3 - t2) * 1000,
+    "first_turn_ms": (t4 - t3) * 1000,
+    "loaded_after_first_run": after_first_run,
+    "loaded_after_first_turn": [m for m in %(heavy)r if m in sys.modules],
+    "errors": len(at.exception),
+}))
+"""
+
+def _env() -> dict:
+    env = dict(os.environ)
+    env.update({
+        "CONVERSATION_STORE": "memory",
+        "OPENAI_API_KEY": "sk-fake-bench",
+        "OPENAI_BASE_URL": "http://127.0.0.1:9/v1",
+        "CLASSIFY_CACHE_PATH": "",
+        "FAQ_DB_PATH": "",
+    })
+    return env
+
+def cold(samples: int) -> dict:
+    runs = []
+    for _ in range(samples):
+        out = subprocess.run([sys.executable, "-c", _COLD % {"main": MAIN, "heavy": HEAVY}], cwd=ROOT, env=_env(),
+                             capture_output=True, text=True, check=True)
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    report = {k: round(statistics.median(r[k] for r in runs), 1)
+              for k in ("import_src_ms", "first_run_ms", "first_turn_ms")}
+    report["loaded_after_first_run"] = runs[-1]["loaded_after_first_run"]
+    report["loaded_after_first_turn"] = runs[-1]["loaded_after_first_turn"]
+    report["errors"] = sum(r["errors"] for r in runs)
+    return report
+
+def warm(reruns: int) -> dict:
+    os.environ.update(_env())
+    sys.path.insert(0, ROOT)
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(MAIN, default_timeout=60).run()
+    at.run()
+    timings = []
+    for _ in range(reruns):
+        t0 = time.perf_counter()
+        at.run()
+        timings.append((time.perf_counter() - t0) * 1000)
+    return {"p50_ms": round(statistics.median(timings), 2), "mean_ms": round(statistics.mean(timings), 2),
+            "max_ms": round(max(timings), 2), "errors": len(at.exception)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold start and warm rerun time of Main.py.")
+    parser.add_argument("--cold", type=int, default=5, help="fresh-interpreter samples")
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument("--out", default="bench_results/startup_bench.json")
+    args = parser.parse_args(argv)
+
+    report = {"cold_start": cold(args.cold), "warm_rerun": warm(args.reruns)}
+    print(json.dumps(report, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
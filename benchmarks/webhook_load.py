@@ -0,0 +1,186 @@
+# benchmarks/webhook_load.py
+# Run: python -m benchmarks.webhook_load --levels 10,100,500
+#
+# Load generator for the asyncio JSON channel (src/server.py). Starts the fake
+# OpenAI server and one screening server process, then plays the load-test
+# personas as N concurrent conversations over HTTP keep-alive connections.
+# By default the local intent model and the classify cache are switched off in
+# the server so every classify turn really waits on the (fake) LLM, which is
+# what shows overlap; --local-model / --cache turn them back on.
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import subprocess
+from datetime import datetime, timezone
+
+from benchmarks.load_test import PERSONAS, percentiles
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class Connection:
+    """
+    Minimal keep-alive HTTP/1.1 JSON client on asyncio streams. httpx's async
+    pool costs more CPU per request than the server under test, which would
+    make the generator the bottleneck on a small machine.
+    """
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, method: str, path: str, payload: dict | None = None,
+                      token: str | None = None) -> tuple[int, dict, dict]:
+        body = json.dumps(payload).encode() if payload is not None else b""
+        auth = f"Authorization: Bearer {token}\r\n" if token else ""
+        head = (f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n{auth}"
+                f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode()
+        for attempt in range(2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+            self.writer.write(head + body)
+            await self.writer.drain()
+            status_line = await self.reader.readline()
+            if status_line:
+                break
+            # The server closed an idle keep-alive connection; reconnect once.
+            self.close()
+        else:
+            raise ConnectionError("server closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        data = await self.reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection") == "close":
+            self.close()
+        return status, headers, json.loads(data or b"{}")
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            self.reader = self.writer = None
+
+async def conversation(conn: Connection, cid: str, persona: str, latencies: list, counts: dict):
+    token = None  # issued with the greeting
+    for text in ["hi"] + PERSONAS[persona]:
+        while True:
+            t0 = time.perf_counter()
+            status, headers, data = await conn.request("POST", f"/conversations/{cid}/messages", {"text": text},
+                                                       token)
+            if status == 503:
+                counts["rejected"] += 1
+                await asyncio.sleep(float(headers.get("retry-after", "1")))
+                continue
+            break
+        latencies.append((time.perf_counter() - t0) * 1000)
+        if status != 200:
+            counts["errors"] += 1
+            return
+        token = data.get("token", token)
+        if data["done"]:
+            return
+
+async def run_level(host: str, port: int, concurrency: int, conversations: int, run_id: str) -> dict:
+    latencies, counts = [], {"rejected": 0, "errors": 0}
+    stats_conn = Connection(host, port)
+    before = (await stats_conn.request("GET", "/stats"))[2]
+    queue = asyncio.Queue()
+    for i in range(conversations):
+        queue.put_nowait(i)
+
+    async def worker():
+        conn = Connection(host, port)
+        while not queue.empty():
+            i = queue.get_nowait()
+            persona = list(PERSONAS)[i % len(PERSONAS)]
+            await conversation(conn, f"{run_id}-{concurrency}-{i}", persona, latencies, counts)
+        conn.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - started
+    after = (await stats_conn.request("GET", "/stats"))[2]
+    stats_conn.close()
+    return {
+        "concurrency": concurrency,
+        "conversations": conversations,
+        "turns": len(latencies),
+        "wall_s": round(wall, 3),
+        "conversations_per_s": round(conversations / wall, 2),
+        "turns_per_s": round(len(latencies) / wall, 2),
+        "turn_latency_ms": percentiles(latencies),
+        "server_peak_inflight": after["peak_inflight"],
+        "llm_requests": after["connections"]["requests"] - before["connections"]["requests"],
+        "llm_new_connections": after["connections"]["new_connections"] - before["connections"]["new_connections"],
+        **counts,
+    }
+
+def _spawn(cmd: list[str], env: dict) -> subprocess.Popen:
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.PIPE, text=True)
+    proc.stdout.readline()  # wait for the "listening" line
+    return proc
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent conversations against the asyncio JSON channel.")
+    parser.add_argument("--levels", default="10,100,500", help="comma-separated concurrent conversations")
+    parser.add_argument("--conversations", type=int, default=0, help="per level (default: 2 x level)")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--fake-port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--max-inflight", type=int, default=256)
+    parser.add_argument("--llm-connections", type=int, default=256, help="OPENAI_MAX_CONNECTIONS for the server")
+    parser.add_argument("--local-model", action="store_true", help="keep the local intent model tier on")
+    parser.add_argument("--cache", action="store_true", help="keep the in-memory classify cache on")
+    parser.add_argument("--out", default="bench_results/webhook_load.json")
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    fake = _spawn([sys.executable, "-m", "benchmarks.fake_openai", "--port", str(args.fake_port),
+                   "--latency-ms", str(args.latency_ms), "--jitter-ms", str(args.jitter_ms)], env)
+    env.update({
+        "OPENAI_BASE_URL": f"http://127.0.0.1:{args.fake_port}/v1",
+        "OPENAI_API_KEY": os.environ.get("BENCH_OPENAI_API_KEY", "sk-fake-bench"),
+        "OPENAI_MAX_CONNECTIONS": str(args.llm_connections),
+        "OPENAI_MAX_KEEPALIVE": str(args.llm_connections),
+        "CONVERSATION_STORE": "memory",
+        "CLASSIFY_CACHE_PATH": "",
+        "FAQ_DB_PATH": "",
+    })
+    if not args.local_model:
+        env["INTENT_MODEL_PATH"] = ""
+    if not args.cache:
+        env["CLASSIFY_CACHE_MEMORY"] = "0"
+    server = _spawn([sys.executable, "-m", "src.server", "--port", str(args.port),
+                     "--max-inflight", str(args.max_inflight)], env)
+
+    report = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "levels": [],
+    }
+    run_id = str(int(time.time()))
+    try:
+        for level in (int(x) for x in args.levels.split(",") if x.strip()):
+            result = asyncio.run(run_level("127.0.0.1", args.port, level,
+                                           args.conversations or 2 * level, run_id))
+            report["levels"].append(result)
+            print(json.dumps(result), flush=True)
+    finally:
+        server.terminate()
+        fake.terminate()
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# benchmarks/years_bench.py
+# Run: python -m benchmarks.years_bench
+#
+# Answers to "how many years of truck driving experience?" as applicants phrase
+# them, each labelled with the completed years the screening should record, or
+# None when the answer is too vague to settle without the model. For the years
+# parser (src/years.py) and for the local tiers it sits in front of (intent
+# model, digit regex), reports how many answers are settled locally, how many of
+# those are wrong, and how many escalate to the LLM. Also reports parse latency.
+# Calendar years are resolved against a fixed date so the labels stay valid.
+import os
+import sys
+import json
+import time
+import argparse
+import datetime
+import statistics
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TODAY = datetime.date(2025, 6, 1)
+
+CORPUS = [
+    # digits
+    ("5", 5), ("5 years", 5), ("10 years", 10), ("3 yrs", 3), ("I have 7 years", 7), ("2yrs", 2),
+    ("I've been driving for 4 years", 4), ("6 years otr", 6), ("8 years driving", 8), ("25 years", 25),
+    ("1 year", 1), ("about 2", 2), ("15", 15), ("20+ years", 20), ("10+", 10), ("5ish years", 5),
+    ("2.5 years", 2), ("1.5 yrs", 1), ("yeah 4 years", 4), ("yes, 12 years", 12), ("12 yrs otr, all 48 states", 12),
+    # number words
+    ("three years", 3), ("two years", 2), ("one year", 1), ("a year", 1), ("fifteen years", 15),
+    ("twenty-five years", 25), ("twenty five years", 25), ("eleven", 11), ("four", 4), ("Seven years", 7),
+    ("thirty years on the road", 30), ("a dozen years", 12), ("a couple of years", 2), ("couple years", 2),
+    ("about three years", 3), ("around five years", 5), ("roughly six years", 6),
+    # halves and compounds
+    ("a year and a half", 1), ("one and a half years", 1), ("2 and a half years", 2), ("half a year", 0),
+    ("year and a half", 1), ("2 years 6 months", 2), ("1 year and 3 months", 1), ("3 years and 2 months", 3),
+    # months and weeks
+    ("18 months", 1), ("6 months", 0), ("six months", 0), ("11 months", 0), ("24 months", 2), ("36 months", 3),
+    ("about 8 months", 0), ("3 weeks", 0),
+    # decades
+    ("over a decade", 10), ("a decade", 10), ("two decades", 20), ("more than a decade", 10),
+    # hedges
+    ("almost a year", 0), ("nearly 9 years", 8), ("almost 2 years", 1), ("over 12 years", 12), ("at least 3 years", 3),
+    ("less than a year", 0), ("not quite a year", 0), ("just under 2 years", 1), ("more than 5 years", 5),
+    # ranges
+    ("3-4 years", 3), ("5 or 6", 5), ("two to three years", 2), ("like 4-5 yrs", 4),
+    # calendar years (TODAY is 2025-06-01)
+    ("since 2015", 9), ("since 2020", 4), ("I started in 2019", 5), ("been driving since 2010", 14),
+    ("2012 to 2020", 8), ("from 2016-2021", 5), ("2018 - present", 6), ("started driving back in 2008", 16),
+    # zero
+    ("zero", 0), ("0", 0), ("0 years", 0),
+    # vague or not a duration: must escalate
+    ("a while", None), ("some", None), ("a few", None), ("several years", None), ("many years", None),
+    ("long time", None), ("quite a bit", None), ("plenty", None), ("lots", None), ("hmm", None), ("what?", None),
+    ("depends how you count", None), ("a few years", None), ("since last year", None),
+    ("3 years otr and 2 local", None), ("I'm 45 years old", None), ("im 30 years old", None),
+    ("got my cdl 3 years ago", None), ("99 years", None),
+]
+
+def local_tiers(text: str) -> int | None:
+    # What classify() settled without the model before the parser: intent model, then no local answer.
+    from src.intent_model import default_model
+
+    model = default_model()
+    result = model.classify(text, "years_number") if model is not None else None
+    if result is None or result["answer_type"] != "number":
+        return None
+    return result["number_value"]
+
+def score(corpus, settle) -> dict:
+    settled = correct = wrong_settled = 0
+    missed = []
+    for text, expected in corpus:
+        got = settle(text)
+        if got is None:
+            if expected is not None:
+                missed.append(text)
+            continue
+        settled += 1
+        if got == expected:
+            correct += 1
+        else:
+            wrong_settled += 1
+            missed.append(f"{text} -> {got}")
+    answerable = sum(1 for _, e in corpus if e is not None)
+    return {
+        "settled_locally": settled,
+        "correct": correct,
+        "wrong": wrong_settled,
+        "escalated": len(corpus) - settled,
+        "answerable_settled_share": round(correct / answerable, 3),
+        "errors_or_escalations": missed,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Years parser accuracy and latency.")
+    parser.add_argument("--repeat", type=int, default=200, help="timing passes over the corpus")
+    parser.add_argument("--out", default="bench_results/years_bench.json")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    from src.years import parse_years, whole_years, THRESHOLD
+
+    def parser_tier(text):
+        years = parse_years(text, TODAY)
+        return whole_years(years) if years is not None and years.confidence >= THRESHOLD else None
+
+    def combined(text):
+        # classify(): a number the parser declines is never handed to the intent model.
+        years = parse_years(text, TODAY)
+        if years is not None:
+            return whole_years(years) if years.confidence >= THRESHOLD else None
+        return local_tiers(text)
+
+    timings = []
+    for _ in range(args.repeat):
+        for text, _ in CORPUS:
+            t0 = time.perf_counter()
+            parse_years(text, TODAY)
+            timings.append((time.perf_counter() - t0) * 1e6)
+    timings.sort()
+    report = {
+        "answers": len(CORPUS),
+        "answerable": sum(1 for _, e in CORPUS if e is not None),
+        "threshold": THRESHOLD,
+        "before_local_model": score(CORPUS, local_tiers),
+        "years_parser": score(CORPUS, parser_tier),
+        "parser_then_local_model": score(CORPUS, combined),
+        "parse_us": {"p50": round(statistics.median(timings), 2),
+                     "p99": round(timings[int(0.99 * (len(timings) - 1))], 2),
+                     "mean": round(statistics.mean(timings), 2)},
+    }
+    print(json.dumps(report, indent=2))
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
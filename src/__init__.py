@@ -1,5 +1,8 @@
 __version__ = "0.1.0"
 
+# Settings come from the environment; load .env before any module reads it.
+from . import config
+
 # Re-export frequently-used items for a tidy public API.
 from .constants import (
     GREETING, PERSUASION_WITH_CDL, OFFTOPIC_NOTE,
@@ -9,17 +12,34 @@ from .constants import (
 )
 
 from .state import (
-    new_state, ensure_session_state, current_state,
-    say_assistant, say_user, is_negative, mentions_no_experience,
-    render_eligibility_panel,
+    new_state, ensure_session_state, current_state, is_admin, owns_room,
+    create_room, open_room, list_rooms, ROOMS_PER_PAGE,
+    say_assistant, say_user, render_history, HISTORY_WINDOW,
+    render_eligibility_panel, render_metrics_panel, render_faq_panel,
 )
 
 from .llm import (
-    classify, is_truck_related,
-    answer_user_question, answer_user_question_anytopic,
+    classify, aclassify, classify_batch, is_truck_related,
+    answer_user_question, answer_user_question_anytopic, aanswer_user_question_anytopic,
+    stream_user_question_anytopic, AnswerStream,
+    connection_stats, tier_stats, token_stats,
 )
 
-from .names import generate_random_name, ensure_seed_room
+from .prompts import PromptTemplate, classify_template
+
+from .faq import FaqBase, default_faq
+
+from .context import QAMemory
+
+from .years import parse_years, YearsAnswer
+
+from .resilience import turn_budget, resilience_stats, Unavailable
+
+from .engine import ScreeningEngine, ConversationState, EXIT_REASONS, is_negative, mentions_no_experience
+
+from .names import generate_random_name, room_name, ensure_seed_room
+
+from . import metrics
 
 __all__ = [
     # constants
@@ -28,12 +48,29 @@ __all__ = [
     "EARLY_EXIT_CDL", "EARLY_EXIT_YEARS", "EARLY_EXIT_NIGHTS",
     "POST_THANKS_AND_Q", "FINAL_GOODBYE", "PAY_LINE",
     # state helpers
-    "new_state", "ensure_session_state", "current_state",
-    "say_assistant", "say_user", "is_negative", "mentions_no_experience",
-    "render_eligibility_panel",
+    "new_state", "ensure_session_state", "current_state", "is_admin", "owns_room",
+    "create_room", "open_room", "list_rooms", "ROOMS_PER_PAGE",
+    "say_assistant", "say_user", "render_history", "HISTORY_WINDOW",
+    "render_eligibility_panel", "render_metrics_panel", "render_faq_panel",
     # llm utils
-    "classify", "is_truck_related",
-    "answer_user_question", "answer_user_question_anytopic",
+    "classify", "aclassify", "classify_batch", "is_truck_related",
+    "answer_user_question", "answer_user_question_anytopic", "aanswer_user_question_anytopic",
+    "stream_user_question_anytopic", "AnswerStream",
+    "connection_stats", "tier_stats", "token_stats",
+    # prompts
+    "PromptTemplate", "classify_template",
+    # faq
+    "FaqBase", "default_faq",
+    # q&a context
+    "QAMemory",
+    # years parser
+    "parse_years", "YearsAnswer",
+    # resilience
+    "turn_budget", "resilience_stats", "Unavailable",
+    # screening flow
+    "ScreeningEngine", "ConversationState", "EXIT_REASONS", "is_negative", "mentions_no_experience",
     # names
-    "generate_random_name", "ensure_seed_room",
+    "generate_random_name", "room_name", "ensure_seed_room",
+    # instrumentation
+    "metrics",
 ]
@@ -0,0 +1,208 @@
+# src/analytics.py
+# Screening funnel across every stored conversation. Rows are streamed from the
+# store into NumPy columns: categoricals become small integer codes, missing
+# booleans become -1 and missing years become NaN. Aggregates are vectorized
+# over those columns. Exports are compressed .npz files. An incremental export
+# reads the previous file and only fetches conversations updated since its watermark.
+#
+#   python -m src.analytics export [--out .data/analytics.npz] [--incremental]
+#   python -m src.analytics report [--from .data/analytics.npz]
+import os
+import json
+import argparse
+import numpy as np
+
+from .engine import EXIT_REASONS
+from .store import get_store
+
+ANALYTICS_PATH = os.getenv("ANALYTICS_PATH", ".data/analytics.npz")
+OVERLAP = 5.0  # seconds re-read before the watermark, for writes that committed after a later timestamp
+CHUNK = 5000   # rows per fetch and per column build
+
+STEPS = ("greeting", "await_consent", "ask_cdl", "ask_years", "ask_nights", "post_offer", "post_qa_chat", "done")
+OUTCOMES = ("in_progress", "eligible", "not_eligible")
+VOCABS = {"step": STEPS, "outcome": OUTCOMES, "exit_reason": EXIT_REASONS}
+YEARS_BUCKETS = (("0", 0, 1), ("1", 1, 2), ("2", 2, 3), ("3-4", 3, 5), ("5-9", 5, 10), ("10+", 10, np.inf))
+
+COLUMNS = {
+    "room": None,  # fixed-width unicode
+    "step": np.int8, "outcome": np.int8, "exit_reason": np.int8,
+    "has_greeted": np.int8, "has_cdl": np.int8, "nights_ok": np.int8, "input_enabled": np.int8,
+    "years_experience": np.float32, "message_count": np.int32,
+    "created_at": np.float64, "updated_at": np.float64,
+}
+
+def _column(name: str, values: list) -> np.ndarray:
+    if name == "room":
+        return np.array(values, dtype=np.str_) if values else np.array([], dtype="<U1")
+    if name in VOCABS:
+        index = {v: i for i, v in enumerate(VOCABS[name])}
+        return np.fromiter((index.get(v, -1) for v in values), dtype=np.int8, count=len(values))
+    if name == "years_experience":
+        return np.fromiter((np.nan if v is None else v for v in values), dtype=np.float32, count=len(values))
+    if COLUMNS[name] is np.int8:  # tri-state booleans
+        return np.fromiter((-1 if v is None else int(v) for v in values), dtype=np.int8, count=len(values))
+    return np.fromiter(values, dtype=COLUMNS[name], count=len(values))
+
+class ConversationTable:
+    """
+    One row per conversation, stored as parallel column arrays (see COLUMNS).
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray]):
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return len(self.columns["room"])
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.columns[name]
+
+    @classmethod
+    def from_rows(cls, rows: list[dict]) -> "ConversationTable":
+        return cls({name: _column(name, [r.get(name) for r in rows]) for name in COLUMNS})
+
+    @classmethod
+    def from_store(cls, store=None, since: float | None = None) -> "ConversationTable":
+        """
+        :param store: conversation store; defaults to get_store()
+        :param since: only conversations updated at or after this time
+        """
+        chunks, buf = [], []
+        for row in (store or get_store()).iter_rows(since, batch=CHUNK):
+            buf.append(row)
+            if len(buf) == CHUNK:
+                chunks.append(cls.from_rows(buf))
+                buf = []
+        chunks.append(cls.from_rows(buf))
+        return cls.concat(chunks)
+
+    @classmethod
+    def concat(cls, tables: list["ConversationTable"]) -> "ConversationTable":
+        return cls({name: np.concatenate([t[name] for t in tables]) for name in COLUMNS})
+
+    def take(self, mask: np.ndarray) -> "ConversationTable":
+        return ConversationTable({name: col[mask] for name, col in self.columns.items()})
+
+    def merge(self, newer: "ConversationTable") -> "ConversationTable":
+        """
+        :return: this table with every room in `newer` replaced by its newer row
+        """
+        return ConversationTable.concat([self.take(~np.isin(self["room"], newer["room"])), newer])
+
+    def save(self, path: str, watermark: float | None):
+        """
+        Write a compressed .npz with the columns, their vocabularies and the watermark.
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        vocabs = {f"vocab_{name}": np.array(vocab) for name, vocab in VOCABS.items()}
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez_compressed(f, **self.columns, **vocabs,
+                                watermark=np.float64(np.nan if watermark is None else watermark))
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> tuple["ConversationTable", float | None]:
+        """
+        :return: (table, watermark) as written by save()
+        """
+        with np.load(path) as data:
+            for name, vocab in VOCABS.items():
+                if tuple(data[f"vocab_{name}"].tolist()) != vocab:
+                    raise ValueError(f"{path} was written with different {name} codes; run a full export")
+            watermark = float(data["watermark"])
+            return cls({name: data[name] for name in COLUMNS}), None if np.isnan(watermark) else watermark
+
+def _count(codes: np.ndarray, vocab: tuple) -> dict:
+    counts = np.bincount(codes[codes >= 0], minlength=len(vocab))
+    return {v: int(c) for v, c in zip(vocab, counts)}
+
+def _rate(part, whole) -> float:
+    return round(float(part) / float(whole), 4) if whole else 0.0
+
+def funnel(table: ConversationTable) -> dict:
+    """
+    Funnel aggregates over a table.
+    :return: dict with outcomes, stage counts, drop-off by step (open conversations),
+             missing requirements and exit reasons (ended ones), and the years distribution
+    """
+    outcome, step = table["outcome"], table["step"]
+    has_cdl, nights_ok, years = table["has_cdl"], table["nights_ok"], table["years_experience"]
+    ended = outcome > 0
+    answered_years = ~np.isnan(years)
+    stages = {
+        "started": len(table),
+        "greeted": int((table["has_greeted"] == 1).sum()),
+        "answered_cdl": int((has_cdl >= 0).sum()),
+        "has_cdl": int((has_cdl == 1).sum()),
+        "answered_years": int(answered_years.sum()),
+        "experienced": int((years >= 1).sum()),
+        "answered_nights": int((nights_ok >= 0).sum()),
+        "nights_ok": int((nights_ok == 1).sum()),
+        "eligible": int((outcome == OUTCOMES.index("eligible")).sum()),
+    }
+    n_ended = int(ended.sum())
+    exits = _count(table["exit_reason"][ended], EXIT_REASONS)
+    exits["unknown"] = int((table["exit_reason"][ended] < 0).sum())  # ended before exit reasons were recorded
+
+    known = years[answered_years]
+    buckets = {label: int(((known >= lo) & (known < hi)).sum()) for label, lo, hi in YEARS_BUCKETS}
+    return {
+        "conversations": len(table),
+        "outcomes": _count(outcome, OUTCOMES),
+        "stages": stages,
+        "dropoff_by_step": _count(step[~ended], STEPS),
+        # Same rules as eligibility.missing_requirements, over every ended conversation at once.
+        "missing_requirements": {
+            "cdl": int((has_cdl[ended] != 1).sum()),
+            "experience": int((np.isnan(years[ended]) | (years[ended] < 1)).sum()),
+            "nights": int((nights_ok[ended] != 1).sum()),
+        },
+        "exit_reasons": exits,
+        "off_topic_exit_rate": _rate(exits["off_topic"], n_ended),
+        "eligible_rate": _rate(stages["eligible"], n_ended),
+        "years_experience": {
+            "buckets": buckets,
+            "mean": round(float(known.mean()), 2) if known.size else None,
+            "median": float(np.median(known)) if known.size else None,
+            "p90": float(np.percentile(known, 90)) if known.size else None,
+        },
+    }
+
+def export(path: str = ANALYTICS_PATH, incremental: bool = False, store=None) -> dict:
+    """
+    Write the conversation table to `path` and return its funnel.
+    :param path: .npz output
+    :param incremental: start from the previous export and fetch only conversations updated since
+    :param store: conversation store; defaults to get_store()
+    :return: funnel() plus rows fetched and the new watermark
+    """
+    previous, watermark = None, None
+    if incremental and os.path.exists(path):
+        previous, watermark = ConversationTable.load(path)
+    fresh = ConversationTable.from_store(store, None if watermark is None else watermark - OVERLAP)
+    table = fresh if previous is None else previous.merge(fresh)
+    if len(fresh):
+        watermark = max(float(fresh["updated_at"].max()), watermark or float("-inf"))
+    table.save(path, watermark)
+    return {"fetched": len(fresh), "watermark": watermark, **funnel(table)}
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Screening funnel analytics over stored conversations.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_export = sub.add_parser("export")
+    p_export.add_argument("--out", default=ANALYTICS_PATH)
+    p_export.add_argument("--incremental", action="store_true")
+    p_report = sub.add_parser("report")
+    p_report.add_argument("--from", dest="path", default=ANALYTICS_PATH)
+    args = parser.parse_args(argv)
+
+    if args.cmd == "export":
+        report = export(args.out, args.incremental)
+    else:
+        report = funnel(ConversationTable.load(args.path)[0])
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
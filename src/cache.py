@@ -0,0 +1,173 @@
+# src/cache.py
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+
+CACHE_PATH = os.getenv("CLASSIFY_CACHE_PATH", ".cache/classify.sqlite3")
+CACHE_TTL = float(os.getenv("CLASSIFY_CACHE_TTL", str(30 * 24 * 3600)))
+MEMORY_ENTRIES = int(os.getenv("CLASSIFY_CACHE_MEMORY", "2048"))
+DISK_ENTRIES = int(os.getenv("CLASSIFY_CACHE_DISK", "100000"))
+
+_WS = re.compile(r"\s+")
+_EDGE_PUNCT = ".,!?;:\"'()[] "
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize applicant text so trivially different replies share a cache entry.
+    :param text: raw user text
+    :return: lowercased text with collapsed whitespace and no edge punctuation
+    """
+    t = (text or "").replace("’", "'").lower()
+    return _WS.sub(" ", t).strip(_EDGE_PUNCT)
+
+def cache_key(user_text: str, intent_hint: str, version: str) -> str:
+    """
+    Build the cache key for a classify() call.
+    :param user_text: user text
+    :param intent_hint: intent the text answers
+    :param version: model + prompt version, so prompt edits invalidate old entries
+    :return: hex digest key
+    """
+    raw = "\x1f".join([version, intent_hint or "", normalize_text(user_text)])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+class ClassifyCache:
+    """
+    Two-tier cache: an in-process LRU in front of a SQLite file that is shared
+    by every worker process on the box. Entries expire after `ttl` seconds and
+    each tier is bounded in size (least recently used entries go first).
+    """
+
+    def __init__(self, path: str | None = CACHE_PATH, ttl: float = CACHE_TTL,
+                 memory_entries: int = MEMORY_ENTRIES, disk_entries: int = DISK_ENTRIES):
+        self.path = path or None
+        self.ttl = ttl
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        if self.path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            self._db().execute(
+                "CREATE TABLE IF NOT EXISTS classify_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            self._db().execute(
+                "CREATE INDEX IF NOT EXISTS classify_cache_accessed ON classify_cache(accessed_at)"
+            )
+
+    def _db(self) -> sqlite3.Connection:
+        # sqlite3 connections are not shareable across threads; keep one per thread.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _bump(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _remember(self, key: str, value: dict, created_at: float):
+        with self._lock:
+            self._lru[key] = (value, created_at)
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.memory_entries:
+                self._lru.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def get(self, key: str) -> dict | None:
+        now = time.time()
+        with self._lock:
+            hit = self._lru.get(key)
+            if hit is not None:
+                value, created_at = hit
+                if now - created_at <= self.ttl:
+                    self._lru.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return dict(value)
+                del self._lru[key]
+
+        if self.path:
+            try:
+                row = self._db().execute(
+                    "SELECT value, created_at FROM classify_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and now - row[1] <= self.ttl:
+                    self._db().execute(
+                        "UPDATE classify_cache SET accessed_at = ? WHERE key = ?", (now, key)
+                    )
+                    value = json.loads(row[0])
+                    self._remember(key, value, row[1])
+                    self._bump("disk_hits")
+                    return dict(value)
+            except sqlite3.Error:
+                pass
+
+        self._bump("misses")
+        return None
+
+    def set(self, key: str, value: dict):
+        now = time.time()
+        self._remember(key, dict(value), now)
+        if not self.path:
+            return
+        try:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO classify_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(value), now, now),
+            )
+            with self._lock:
+                self._writes += 1
+                prune = self._writes % 256 == 0
+            if prune:
+                self._prune(db, now)
+        except sqlite3.Error:
+            pass
+
+    def _prune(self, db: sqlite3.Connection, now: float):
+        cur = db.execute("DELETE FROM classify_cache WHERE created_at < ?", (now - self.ttl,))
+        expired = cur.rowcount
+        cur = db.execute(
+            "DELETE FROM classify_cache WHERE key IN ("
+            " SELECT key FROM classify_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+            (self.disk_entries,),
+        )
+        with self._lock:
+            self.stats["evictions"] += max(expired, 0) + max(cur.rowcount, 0)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._lru)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        total = hits + stats["misses"]
+        stats["hit_ratio"] = round(hits / total, 4) if total else 0.0
+        return stats
+
+_default_lock = threading.Lock()
+_default_cache = None
+
+def default_cache() -> ClassifyCache:
+    """
+    Return the process-wide classify cache.
+    :return: ClassifyCache configured from CLASSIFY_CACHE_* env vars
+    """
+    global _default_cache
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = ClassifyCache()
+    return _default_cache
@@ -0,0 +1,22 @@
+# src/config.py
+# Imported first by the package: .env is read once per process, before any
+# module reads its env-var settings at import time. Variables already set in
+# the environment win over .env.
+from dotenv import load_dotenv
+
+_loaded = False
+
+def load_env(path: str | None = None) -> bool:
+    """
+    Load .env into os.environ, once.
+    :param path: explicit .env file; defaults to python-dotenv's search from the working directory
+    :return: True if this call loaded it
+    """
+    global _loaded
+    if _loaded:
+        return False
+    load_dotenv(path)
+    _loaded = True
+    return True
+
+load_env()
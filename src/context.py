@@ -0,0 +1,105 @@
+# src/context.py
+# Bounded context for post-screening Q&A. A follow-up like "and what about
+# weekends?" needs the earlier turns, but sending the whole history would make
+# every answer cost more than the last. The model gets the screening facts,
+# the last QA_CONTEXT_TURNS exchanges verbatim and a rolling summary of older
+# ones. An exchange is folded into the summary when it leaves the window, so
+# earlier turns are never re-read.
+#
+#   QA_CONTEXT_TOKENS=400   estimated token cap of everything added ahead of the question
+#   QA_CONTEXT_TURNS=2      recent exchanges kept verbatim
+import os
+import re
+import json
+from dataclasses import dataclass
+
+QA_CONTEXT_TOKENS = int(os.getenv("QA_CONTEXT_TOKENS", "400"))
+QA_CONTEXT_TURNS = int(os.getenv("QA_CONTEXT_TURNS", "2"))
+CHARS_PER_TOKEN = 4  # no tokenizer dependency; the cap is an estimate like the benchmarks' counts
+TURN_CHARS = 240     # per question or answer kept verbatim
+NOTE_CHARS = 90      # per summarized exchange
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s")
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+def _note(question: str, answer: str) -> str:
+    # Extractive: the question and the first sentence of its answer. No model call, so
+    # folding a turn costs nothing on the turn's LLM budget.
+    first = _SENTENCE.split(" ".join(answer.split()), 1)[0]
+    return _clip(f"{_clip(question, NOTE_CHARS // 2)} -> {first}", NOTE_CHARS)
+
+def facts(has_cdl: bool | None, years_experience: int | None, nights_ok: bool | None) -> list[str]:
+    """
+    :return: what the screening established, one phrase per answered question
+    """
+    found = []
+    if has_cdl is not None:
+        found.append("has a Class A CDL" if has_cdl else "has no Class A CDL")
+    if years_experience is not None:
+        found.append(f"{years_experience} year{'' if years_experience == 1 else 's'} of truck driving experience")
+    if nights_ok is not None:
+        found.append("is OK with two nights on the road each week" if nights_ok
+                     else "is not OK with two nights on the road each week")
+    return found
+
+@dataclass(frozen=True)
+class QAMemory:
+    """
+    Recent exchanges plus summary notes of older ones. Immutable; add()
+    returns a new memory. Stored on ConversationState as the JSON from dumps().
+    """
+    turns: tuple[tuple[str, str], ...] = ()
+    notes: tuple[str, ...] = ()
+
+    @classmethod
+    def loads(cls, raw: str | None) -> "QAMemory":
+        if not raw:
+            return cls()
+        data = json.loads(raw)
+        return cls(tuple((q, a) for q, a in data.get("turns", ())), tuple(data.get("notes", ())))
+
+    def dumps(self) -> str | None:
+        if not self.turns and not self.notes:
+            return None
+        return json.dumps({"turns": [list(t) for t in self.turns], "notes": list(self.notes)}, ensure_ascii=False)
+
+    def add(self, question: str, answer: str, facts: list[str] = (),
+            window: int = QA_CONTEXT_TURNS, budget: int = QA_CONTEXT_TOKENS) -> "QAMemory":
+        """
+        Record one exchange, folding the ones that leave the window into the
+        summary and dropping the oldest notes until render() fits the budget.
+        :param facts: facts() of the conversation, counted against the budget
+        :return: the new memory
+        """
+        turns = self.turns + ((_clip(question, TURN_CHARS), _clip(answer, TURN_CHARS)),)
+        notes = self.notes
+        if len(turns) > window:
+            notes += tuple(_note(q, a) for q, a in turns[:len(turns) - window])
+            turns = turns[len(turns) - window:]
+        memory = QAMemory(turns, notes)
+        while estimate_tokens(memory.render(facts)) > budget and (memory.notes or len(memory.turns) > 1):
+            if memory.notes:
+                memory = QAMemory(memory.turns, memory.notes[1:])
+            else:
+                memory = QAMemory(memory.turns[1:], memory.notes)
+        return memory
+
+    def render(self, facts: list[str] = ()) -> str:
+        """
+        :param facts: facts() of the conversation
+        :return: text placed ahead of the applicant's question, or "" when there is nothing to add
+        """
+        parts = []
+        if facts:
+            parts.append(f"Known about the applicant: {'; '.join(facts)}.")
+        if self.notes:
+            parts.append("Earlier in this chat:\n" + "\n".join(f"- {n}" for n in self.notes))
+        if self.turns:
+            parts.append("Recent messages:\n" + "\n".join(f"Applicant: {q}\nAssistant: {a}" for q, a in self.turns))
+        return "\n\n".join(parts)
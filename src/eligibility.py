@@ -0,0 +1,26 @@
+# src/eligibility.py
+
+def missing_requirements(state_dict: dict) -> list[str]:
+    """
+    List the screening requirements a conversation has not met.
+    :param state_dict: conversation state (has_cdl, years_experience, nights_ok)
+    :return: human-readable requirements, empty when eligible
+    """
+    missing = []
+    if state_dict.get("has_cdl") is not True:
+        missing.append("a valid Class A CDL")
+    years = state_dict.get("years_experience")
+    if years is None or not isinstance(years, int) or years < 1:
+        missing.append("at least one year of truck driving experience")
+    if state_dict.get("nights_ok") is not True:
+        missing.append("availability for two nights on the road each week")
+    return missing
+
+def outcome(state_dict: dict) -> str:
+    """
+    :param state_dict: conversation state
+    :return: "in_progress" until the chat ends, then "eligible" or "not_eligible"
+    """
+    if state_dict.get("step") != "done" and state_dict.get("input_enabled", True):
+        return "in_progress"
+    return "not_eligible" if missing_requirements(state_dict) else "eligible"
@@ -0,0 +1,212 @@
+# src/engine.py
+# The screening state machine without Streamlit: Main.py renders what it decides,
+# and benchmarks/tests can drive it directly.
+from dataclasses import dataclass, fields, replace
+
+from .constants import (
+    GREETING, PERSUASION_WITH_CDL,
+    CDL_QUESTION, YEARS_QUESTION, YEARS_FOLLOWUP, NIGHTS_QUESTION,
+    EARLY_EXIT_CDL, EARLY_EXIT_YEARS, EARLY_EXIT_NIGHTS,
+    POST_THANKS_AND_Q, FINAL_GOODBYE,
+)
+from .matcher import scan
+from .context import QAMemory, facts
+from .resilience import turn_budget
+from .llm import (
+    classify, aclassify, answer_user_question_anytopic, aanswer_user_question_anytopic, AnswerStream,
+)
+
+CDL_CONFIRM = "Just to confirm — do you have a valid Class A CDL? (Yes/No)"
+NIGHTS_CONFIRM = "Please let me know if two nights on the road each week is okay. (Yes/No)"
+
+@dataclass(slots=True, frozen=True)
+class ConversationState:
+    """
+    Scalar screening state of one conversation. The message history is kept
+    by the caller (session/store), so a state is a few dozen bytes and cheap to copy.
+    Post-screening Q&A adds `qa_memory`, a QAMemory as JSON, capped at QA_CONTEXT_TOKENS.
+    """
+    step: str = "greeting"
+    has_greeted: bool = False
+    has_cdl: bool | None = None
+    years_experience: int | None = None
+    nights_ok: bool | None = None
+    input_enabled: bool = True
+    exit_reason: str | None = None  # one of EXIT_REASONS once the chat has ended
+    qa_memory: str | None = None
+
+    @classmethod
+    def from_dict(cls, state_dict: dict) -> "ConversationState":
+        return cls(**{f.name: state_dict[f.name] for f in fields(cls) if f.name in state_dict})
+
+    def to_dict(self) -> dict:
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+def is_negative(user_text: str) -> bool:
+    """
+    Determine the tone of user's text
+    :param user_text: user text
+    :return: true if user has no more question false otherwise
+    """
+    return "closing" in scan(user_text)
+
+def mentions_no_experience(user_text: str) -> bool:
+    """
+    Determine what user responded regarding trucking experience.
+    :param user_text: user text
+    :return: true if user has no experience false otherwise
+    """
+    return "no_experience" in scan(user_text)
+
+Reply = str | AnswerStream
+
+# Why a conversation ended, recorded on the state for funnel analytics.
+EXIT_REASONS = ("no_cdl", "no_experience", "no_nights", "finished", "off_topic")
+
+# Screening steps that classify the applicant's reply, and the intent each asks about.
+STEP_INTENTS = {
+    "await_consent": "consent_boolean",
+    "ask_cdl": "cdl_boolean",
+    "ask_years": "years_number",
+    "ask_nights": "nights_boolean",
+}
+QA_STEPS = ("post_offer", "post_qa_chat")
+
+class ScreeningEngine:
+    """
+    Pure transition function over ConversationState:
+    `replies, state = engine.step(state, user_text)`.
+    Replies are assistant messages in order. With `stream_answer` set, a Q&A
+    reply is an AnswerStream; its topic is only known once it has been
+    consumed, so pass it to settle() afterwards.
+    """
+
+    def __init__(self, classify=classify, answer=answer_user_question_anytopic, stream_answer=None,
+                 aclassify=aclassify, aanswer=aanswer_user_question_anytopic):
+        """
+        :param classify: classify(user_text, intent_hint) -> classify-style dict
+        :param answer: answer(user_text, context=...) -> (answer text, on_topic)
+        :param stream_answer: optional stream_answer(user_text, context=...) -> AnswerStream for post-screening Q&A
+        :param aclassify: coroutine counterpart of classify, used by astep()
+        :param aanswer: coroutine counterpart of answer, used by astep()
+        """
+        self.classify = classify
+        self.answer = answer
+        self.stream_answer = stream_answer
+        self.aclassify = aclassify
+        self.aanswer = aanswer
+        self._handlers = {
+            "await_consent": self._await_consent,
+            "ask_cdl": self._ask_cdl,
+            "ask_years": self._ask_years,
+            "ask_nights": self._ask_nights,
+        }
+
+    def start(self, state: ConversationState) -> tuple[list[Reply], ConversationState]:
+        """
+        Greet a fresh conversation; a no-op for one already greeted.
+        """
+        if state.step == "greeting" and not state.has_greeted:
+            return [GREETING], replace(state, has_greeted=True, step="await_consent")
+        return [], state
+
+    def step(self, state: ConversationState, user_text: str) -> tuple[list[Reply], ConversationState]:
+        """
+        Advance the conversation by one applicant message. Model calls share
+        one LLM_TURN_BUDGET deadline and degrade to heuristics past it.
+        :param state: current state
+        :param user_text: applicant's message
+        :return: (assistant replies, new state)
+        """
+        with turn_budget():
+            intent = STEP_INTENTS.get(state.step)
+            if intent is not None:
+                return self._handlers[state.step](state, user_text, self.classify(user_text, intent_hint=intent))
+            if state.step in QA_STEPS:
+                if is_negative(user_text):
+                    return [FINAL_GOODBYE], self._end(state, "finished")
+                if self.stream_answer is not None:
+                    return [self.stream_answer(user_text, context=self._context(state))], \
+                        replace(state, step="post_qa_chat")
+                return self._answered(state, user_text, *self.answer(user_text, context=self._context(state)))
+            return self._other(state)
+
+    async def astep(self, state: ConversationState, user_text: str) -> tuple[list[str], ConversationState]:
+        """
+        step() for asyncio callers: model calls are awaited, and answers are never streamed.
+        """
+        with turn_budget():
+            intent = STEP_INTENTS.get(state.step)
+            if intent is not None:
+                result = await self.aclassify(user_text, intent_hint=intent)
+                return self._handlers[state.step](state, user_text, result)
+            if state.step in QA_STEPS:
+                if is_negative(user_text):
+                    return [FINAL_GOODBYE], self._end(state, "finished")
+                return self._answered(state, user_text,
+                                      *await self.aanswer(user_text, context=self._context(state)))
+            return self._other(state)
+
+    def settle(self, state: ConversationState, stream: AnswerStream) -> ConversationState:
+        """
+        Final state after a streamed Q&A reply has been consumed: off-topic questions end the chat.
+        """
+        if not stream.on_topic:
+            return self._end(state, "off_topic")
+        return self._remember(state, stream.question, stream.text)
+
+    @staticmethod
+    def _end(state: ConversationState, reason: str, **changes) -> ConversationState:
+        return replace(state, step="done", input_enabled=False, exit_reason=reason, **changes)
+
+    def _await_consent(self, state, user_text, result):
+        reply = CDL_QUESTION if result["answer_type"] == "affirmative" else PERSUASION_WITH_CDL
+        return [reply], replace(state, step="ask_cdl")
+
+    def _ask_cdl(self, state, user_text, result):
+        if result["answer_type"] == "negative":
+            return [EARLY_EXIT_CDL], self._end(state, "no_cdl", has_cdl=False)
+        if result["answer_type"] == "affirmative":
+            return [YEARS_QUESTION], replace(state, has_cdl=True, step="ask_years")
+        return [CDL_CONFIRM], state
+
+    def _ask_years(self, state, user_text, result):
+        number = result["number_value"] if result["answer_type"] == "number" else None
+        if not isinstance(number, int):
+            number = None
+        if result["answer_type"] == "negative" or (number is not None and number <= 0) \
+                or mentions_no_experience(user_text):
+            return [EARLY_EXIT_YEARS], self._end(state, "no_experience", years_experience=0)
+        if number is not None:
+            return [NIGHTS_QUESTION], replace(state, years_experience=number, step="ask_nights")
+        return [YEARS_FOLLOWUP], state
+
+    def _ask_nights(self, state, user_text, result):
+        if result["answer_type"] == "negative":
+            return [EARLY_EXIT_NIGHTS], self._end(state, "no_nights", nights_ok=False)
+        if result["answer_type"] == "affirmative":
+            return [POST_THANKS_AND_Q], replace(state, nights_ok=True, step="post_offer")
+        return [NIGHTS_CONFIRM], state
+
+    def _answered(self, state, user_text, answer, on_topic):
+        if not on_topic:
+            return [answer], self._end(state, "off_topic")
+        return [answer], self._remember(replace(state, step="post_qa_chat"), user_text, answer)
+
+    @staticmethod
+    def _facts(state):
+        return facts(state.has_cdl, state.years_experience, state.nights_ok)
+
+    def _context(self, state) -> str:
+        # Same size every turn: the facts, the recent window and the capped summary.
+        return QAMemory.loads(state.qa_memory).render(self._facts(state))
+
+    def _remember(self, state, user_text, answer):
+        memory = QAMemory.loads(state.qa_memory).add(user_text, answer, self._facts(state))
+        return replace(state, qa_memory=memory.dumps())
+
+    def _other(self, state):
+        # "done" (and any unknown step) only makes sure input stays locked.
+        if state.step == "done":
+            return [], replace(state, input_enabled=False)
+        return [], state
@@ -0,0 +1,341 @@
+# src/faq.py
+# Curated FAQ answers plus approved LLM answers, matched locally before any model call.
+#
+# Admin: python -m src.faq list [--pending]
+#        python -m src.faq add "Is there a sign-on bonus?" "A recruiter can share current bonuses."
+#        python -m src.faq approve 12 [--answer "edited answer"]
+#        python -m src.faq reject 12
+#
+#   FAQ_PATH=src/data/faq.json        curated entries: [{"id", "answer", "questions": [...]}]
+#   FAQ_DB_PATH=.data/faq.sqlite3     learned entries (pending/approved); empty disables them
+#   FAQ_THRESHOLD=0.55                cosine similarity needed to answer from the FAQ
+import os
+import re
+import json
+import math
+import time
+import sqlite3
+import argparse
+import threading
+import numpy as np
+
+from .cache import normalize_text
+
+FAQ_PATH = os.getenv("FAQ_PATH", os.path.join(os.path.dirname(__file__), "data", "faq.json"))
+FAQ_DB_PATH = os.getenv("FAQ_DB_PATH", ".data/faq.sqlite3")
+THRESHOLD = float(os.getenv("FAQ_THRESHOLD", "0.55"))
+RELOAD_INTERVAL = 30.0  # seconds between checks for entries approved by other processes
+NGRAMS = (3, 4, 5)
+
+_WORD = re.compile(r"[a-z0-9']+")
+# Question scaffolding shared by every entry ("how much ... do I get"); it would swamp the topic words.
+STOPWORDS = frozenset(
+    "a an the is are am be do does did i i'm me my you your we our us it it's this that there what what's whats "
+    "how when where which who will would can could should to of in on for with and or at any get got much many "
+    "about like have has".split()
+)
+
+def grams(text: str) -> dict[str, int]:
+    """
+    Character n-grams of each non-stopword (padded with spaces) plus the words themselves.
+    :param text: question text
+    :return: gram -> count
+    """
+    counts = {}
+    for w in _WORD.findall(normalize_text(text)):
+        if w in STOPWORDS:
+            continue
+        counts[f"w:{w}"] = counts.get(f"w:{w}", 0) + 1
+        padded = f" {w} "
+        for n in NGRAMS:
+            for i in range(len(padded) - n + 1):
+                g = padded[i:i + n]
+                counts[g] = counts.get(g, 0) + 1
+    return counts
+
+class FaqIndex:
+    """
+    TF-IDF over character n-grams, one row per known question. The matrix is
+    dense over the corpus vocabulary (a few thousand grams for a few hundred
+    questions), so a lookup is one gather plus a small matrix-vector product.
+    """
+
+    def __init__(self, rows: list[dict]):
+        """
+        :param rows: dicts with at least "question" and "answer"
+        """
+        self.rows = rows
+        docs = [grams(r["question"]) for r in rows]
+        self.vocab = {}
+        for d in docs:
+            for g in d:
+                self.vocab.setdefault(g, len(self.vocab))
+        df = np.zeros(len(self.vocab), dtype=np.float32)
+        for d in docs:
+            df[[self.vocab[g] for g in d]] += 1
+        self.idf = np.log((1 + len(docs)) / (1 + df)) + 1
+        self.oov_idf = float(math.log(1 + len(docs)) + 1)
+        self.matrix = np.zeros((len(docs), len(self.vocab)), dtype=np.float32)
+        for i, d in enumerate(docs):
+            idx = np.fromiter((self.vocab[g] for g in d), dtype=np.int64, count=len(d))
+            tf = 1 + np.log(np.fromiter(d.values(), dtype=np.float32, count=len(d)))
+            vec = tf * self.idf[idx]
+            self.matrix[i, idx] = vec / (np.linalg.norm(vec) or 1.0)
+
+    def search(self, text: str) -> tuple[dict | None, float]:
+        """
+        :param text: question text
+        :return: (closest row, cosine similarity), or (None, 0.0) for an empty index or query
+        """
+        d = grams(text)
+        if not d or not self.rows:
+            return None, 0.0
+        idx, weights, oov = [], [], 0.0
+        for g, c in d.items():
+            w = 1 + math.log(c)
+            j = self.vocab.get(g)
+            if j is None:
+                oov += (w * self.oov_idf) ** 2  # unseen grams only lower the similarity
+            else:
+                idx.append(j)
+                weights.append(w * self.idf[j])
+        if not idx:
+            return None, 0.0
+        q = np.asarray(weights, dtype=np.float32)
+        norm = math.sqrt(float(q @ q) + oov)
+        scores = self.matrix[:, idx] @ q / norm
+        best = int(scores.argmax())
+        return self.rows[best], float(scores[best])
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS faq_learned (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    question TEXT NOT NULL,
+    norm TEXT NOT NULL UNIQUE,
+    answer TEXT NOT NULL,
+    status TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS faq_learned_status ON faq_learned(status);
+"""
+
+class FaqBase:
+    """
+    Curated entries from FAQ_PATH plus learned entries in SQLite. LLM answers
+    to on-topic questions are remembered as "pending"; once an admin approves
+    one it joins the index and later paraphrases are answered without the LLM.
+    """
+
+    def __init__(self, faq_path: str = FAQ_PATH, db_path: str | None = FAQ_DB_PATH, threshold: float = THRESHOLD):
+        self.faq_path = faq_path
+        self.db_path = db_path or None
+        self.threshold = threshold
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._index = None
+        self._version = None
+        self._checked_at = 0.0
+        self.stats = {"lookups": 0, "hits": 0, "lookup_seconds": 0.0, "llm_answers": 0, "llm_seconds": 0.0}
+        if self.db_path:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+            self._db().executescript(_SCHEMA)
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=5, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    # --------- Index ---------
+
+    def _curated(self) -> list[dict]:
+        if not os.path.exists(self.faq_path):
+            return []
+        with open(self.faq_path, encoding="utf-8") as f:
+            entries = json.load(f)
+        return [{"key": e["id"], "question": q, "answer": e["answer"], "source": "curated"}
+                for e in entries for q in e["questions"]]
+
+    def _learned_version(self):
+        if not self.db_path:
+            return None
+        try:
+            return tuple(self._db().execute(
+                "SELECT COUNT(*), MAX(updated_at) FROM faq_learned WHERE status = 'approved'").fetchone())
+        except sqlite3.Error:
+            return None
+
+    def _learned(self) -> list[dict]:
+        if not self.db_path:
+            return []
+        rows = self._db().execute("SELECT id, question, answer FROM faq_learned WHERE status = 'approved'")
+        return [{"key": f"learned:{r['id']}", "question": r["question"], "answer": r["answer"], "source": "approved"}
+                for r in rows]
+
+    def index(self) -> FaqIndex:
+        """
+        Return the current index, rebuilding it when approved entries changed (checked every RELOAD_INTERVAL).
+        """
+        now = time.monotonic()
+        if self._index is not None and now - self._checked_at < RELOAD_INTERVAL:
+            return self._index
+        with self._lock:
+            if self._index is None or now - self._checked_at >= RELOAD_INTERVAL:
+                version = self._learned_version()
+                if self._index is None or version != self._version:
+                    self._index = FaqIndex(self._curated() + self._learned())
+                    self._version = version
+                self._checked_at = now
+        return self._index
+
+    def invalidate(self):
+        with self._lock:
+            self._checked_at = 0.0
+            self._version = None
+
+    def lookup(self, question: str) -> dict | None:
+        """
+        :param question: applicant's question
+        :return: {"key", "question", "answer", "source", "score"} when similar enough, else None
+        """
+        started = time.perf_counter()
+        row, score = self.index().search(question)
+        hit = row is not None and score >= self.threshold
+        with self._lock:
+            self.stats["lookups"] += 1
+            self.stats["hits"] += hit
+            self.stats["lookup_seconds"] += time.perf_counter() - started
+        return dict(row, score=round(score, 4)) if hit else None
+
+    def record_llm(self, seconds: float):
+        """
+        Note how long an LLM answer took, to estimate the time FAQ hits save.
+        """
+        with self._lock:
+            self.stats["llm_answers"] += 1
+            self.stats["llm_seconds"] += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            s = dict(self.stats)
+        llm_mean = s["llm_seconds"] / s["llm_answers"] if s["llm_answers"] else 0.0
+        return {
+            "lookups": s["lookups"],
+            "hits": s["hits"],
+            "hit_rate": round(s["hits"] / s["lookups"], 4) if s["lookups"] else 0.0,
+            "mean_lookup_ms": round(s["lookup_seconds"] / s["lookups"] * 1000, 3) if s["lookups"] else 0.0,
+            "mean_llm_answer_ms": round(llm_mean * 1000, 1),
+            "estimated_seconds_saved": round(s["hits"] * llm_mean, 1),
+        }
+
+    # --------- Learned entries ---------
+
+    def remember(self, question: str, answer: str):
+        """
+        Queue an LLM answer for review; repeats of an already known question are ignored.
+        """
+        if not self.db_path or not question.strip() or not answer.strip():
+            return
+        now = time.time()
+        try:
+            self._db().execute(
+                "INSERT OR IGNORE INTO faq_learned (question, norm, answer, status, created_at, updated_at)"
+                " VALUES (?, ?, ?, 'pending', ?, ?)",
+                (question.strip(), normalize_text(question), answer.strip(), now, now),
+            )
+        except sqlite3.Error:
+            pass
+
+    def add(self, question: str, answer: str) -> int:
+        """
+        Add (or overwrite) an approved entry directly.
+        :return: entry id
+        """
+        if not self.db_path:
+            raise RuntimeError("FAQ_DB_PATH is empty; learned entries are disabled")
+        now = time.time()
+        db = self._db()
+        db.execute(
+            "INSERT INTO faq_learned (question, norm, answer, status, created_at, updated_at)"
+            " VALUES (?, ?, ?, 'approved', ?, ?)"
+            " ON CONFLICT(norm) DO UPDATE SET answer = excluded.answer, status = 'approved', updated_at = excluded.updated_at",
+            (question.strip(), normalize_text(question), answer.strip(), now, now),
+        )
+        self.invalidate()
+        return db.execute("SELECT id FROM faq_learned WHERE norm = ?", (normalize_text(question),)).fetchone()[0]
+
+    def set_status(self, entry_id: int, status: str, answer: str | None = None) -> bool:
+        """
+        Approve or reject a learned entry, optionally editing its answer.
+        :return: True if the entry exists
+        """
+        if not self.db_path:
+            return False
+        sql = "UPDATE faq_learned SET status = ?, updated_at = ?" + (", answer = ?" if answer else "") + " WHERE id = ?"
+        args = (status, time.time(), *((answer.strip(),) if answer else ()), entry_id)
+        changed = self._db().execute(sql, args).rowcount > 0
+        self.invalidate()
+        return changed
+
+    def entries(self, status: str | None = None, limit: int = 100) -> list[dict]:
+        if not self.db_path:
+            return []
+        where, args = ("WHERE status = ?", (status,)) if status else ("", ())
+        rows = self._db().execute(
+            f"SELECT id, question, answer, status, updated_at FROM faq_learned {where} ORDER BY updated_at DESC LIMIT ?",
+            (*args, limit),
+        )
+        return [dict(r) for r in rows]
+
+_default_lock = threading.Lock()
+_default_faq = None
+
+def default_faq() -> FaqBase:
+    """
+    Return the process-wide FAQ base configured by the FAQ_* env vars.
+    """
+    global _default_faq
+    if _default_faq is None:
+        with _default_lock:
+            if _default_faq is None:
+                _default_faq = FaqBase()
+    return _default_faq
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the FAQ answer base.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_list = sub.add_parser("list")
+    p_list.add_argument("--pending", action="store_true")
+    p_add = sub.add_parser("add")
+    p_add.add_argument("question")
+    p_add.add_argument("answer")
+    p_approve = sub.add_parser("approve")
+    p_approve.add_argument("id", type=int)
+    p_approve.add_argument("--answer", help="replace the generated answer")
+    p_reject = sub.add_parser("reject")
+    p_reject.add_argument("id", type=int)
+    p_ask = sub.add_parser("ask", help="show what the index would answer")
+    p_ask.add_argument("question")
+    args = parser.parse_args(argv)
+
+    faq = default_faq()
+    if args.cmd == "list":
+        for e in faq.entries("pending" if args.pending else None):
+            print(json.dumps(e))
+    elif args.cmd == "add":
+        print(f"added {faq.add(args.question, args.answer)}")
+    elif args.cmd in ("approve", "reject"):
+        status = "approved" if args.cmd == "approve" else "rejected"
+        if not faq.set_status(args.id, status, getattr(args, "answer", None)):
+            raise SystemExit(f"no entry {args.id}")
+        print(f"{status} {args.id}")
+    else:
+        row, score = faq.index().search(args.question)
+        print(json.dumps({"score": round(score, 4), "hit": score >= faq.threshold, **(row or {})}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+# src/intent_model.py
+# Train: python -m src.intent_model train --data logs.jsonl --out src/data/intent_model.npz
+# Eval:  python -m src.intent_model eval --data logs.jsonl
+import os
+import re
+import json
+import zlib
+import argparse
+import threading
+import numpy as np
+
+INTENTS = ("consent_boolean", "cdl_boolean", "years_number", "nights_boolean")
+LABELS = ("affirmative", "negative", "number", "unknown")
+
+DIM = 4096
+NGRAMS = (2, 3, 4)
+MODEL_PATH = os.getenv(
+    "INTENT_MODEL_PATH", os.path.join(os.path.dirname(__file__), "data", "intent_model.npz")
+)
+THRESHOLD = float(os.getenv("INTENT_MODEL_THRESHOLD", "0.9"))
+
+_WS = re.compile(r"\s+")
+_NUMBER = re.compile(r"\b(-?\d+)\b")
+
+def features(text: str, dim: int = DIM) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Hash character n-grams and words of text into a sparse, L2-normalized vector.
+    crc32 keeps the hashing stable across processes (unlike hash()).
+    :param text: user text
+    :param dim: number of hash buckets
+    :return: (bucket indices, values)
+    """
+    t = _WS.sub(" ", (text or "").replace("’", "'").lower()).strip()
+    padded = f"^{t}$"
+    grams = [padded[i:i + n] for n in NGRAMS for i in range(len(padded) - n + 1)]
+    grams += [f"w:{w}" for w in t.split()]
+    if not grams:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    idx = np.fromiter((zlib.crc32(g.encode("utf-8")) % dim for g in grams), dtype=np.int64, count=len(grams))
+    idx, counts = np.unique(idx, return_counts=True)
+    vals = counts.astype(np.float32)
+    vals /= np.linalg.norm(vals)
+    return idx, vals
+
+class IntentModel:
+    """
+    Per-intent multinomial logistic regression over hashed n-gram features.
+    weights has shape (len(INTENTS), len(LABELS), dim); bias (len(INTENTS), len(LABELS)).
+    """
+
+    def __init__(self, weights: np.ndarray, bias: np.ndarray):
+        self.weights = weights.astype(np.float32)
+        self.bias = bias.astype(np.float32)
+        self.dim = weights.shape[-1]
+
+    @classmethod
+    def load(cls, path: str = MODEL_PATH) -> "IntentModel":
+        with np.load(path) as data:
+            return cls(data["weights"], data["bias"])
+
+    def save(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        np.savez_compressed(path, weights=self.weights.astype(np.float16), bias=self.bias)
+
+    def predict(self, text: str, intent: str) -> tuple[str, float]:
+        """
+        :param text: user text
+        :param intent: one of INTENTS
+        :return: (label, probability)
+        """
+        k = INTENTS.index(intent)
+        idx, vals = features(text, self.dim)
+        logits = self.weights[k][:, idx] @ vals + self.bias[k]
+        probs = np.exp(logits - logits.max())
+        probs /= probs.sum()
+        best = int(probs.argmax())
+        return LABELS[best], float(probs[best])
+
+    def classify(self, text: str, intent: str, threshold: float = THRESHOLD) -> dict | None:
+        """
+        Answer in classify()'s format when confident, otherwise return None so the caller escalates.
+        :param text: user text
+        :param intent: intent hint
+        :param threshold: minimum probability to answer locally
+        :return: classify-style dict or None
+        """
+        if intent not in INTENTS:
+            return None
+        label, prob = self.predict(text, intent)
+        if prob < threshold or label == "unknown":
+            return None
+        number = None
+        if label == "number":
+            m = _NUMBER.search(text or "")
+            if not m:
+                return None
+            number = int(m.group(1))
+        return {"answer_type": label, "number_value": number, "reason": f"local model {prob:.2f}"}
+
+_load_lock = threading.Lock()
+_loaded = False
+_model = None
+
+def default_model() -> IntentModel | None:
+    """
+    Load the shipped model once per process.
+    :return: IntentModel, or None when the weights file is missing
+    """
+    global _loaded, _model
+    if not _loaded:
+        with _load_lock:
+            if not _loaded:
+                _model = IntentModel.load(MODEL_PATH) if os.path.exists(MODEL_PATH) else None
+                _loaded = True
+    return _model
+
+# --------- Training ---------
+
+def load_rows(path: str) -> list[dict]:
+    """
+    Read logged examples, one JSON object per line: {"text", "intent", "label"}.
+    """
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+            if row.get("intent") in INTENTS and row.get("label") in LABELS:
+                rows.append(row)
+    return rows
+
+def train(rows: list[dict], dim: int = DIM, epochs: int = 300, lr: float = 2.0, l2: float = 1e-4,
+          seed: int = 0) -> IntentModel:
+    """
+    Fit one softmax regression per intent with full-batch gradient descent.
+    :param rows: examples with text, intent and label
+    :return: trained IntentModel
+    """
+    rng = np.random.default_rng(seed)
+    weights = np.zeros((len(INTENTS), len(LABELS), dim), dtype=np.float32)
+    bias = np.zeros((len(INTENTS), len(LABELS)), dtype=np.float32)
+    for k, intent in enumerate(INTENTS):
+        subset = [r for r in rows if r["intent"] == intent]
+        if not subset:
+            continue
+        x = np.zeros((len(subset), dim), dtype=np.float32)
+        for i, r in enumerate(subset):
+            idx, vals = features(r["text"], dim)
+            x[i, idx] = vals
+        y = np.array([LABELS.index(r["label"]) for r in subset])
+        onehot = np.eye(len(LABELS), dtype=np.float32)[y]
+        w = rng.normal(0, 0.01, (len(LABELS), dim)).astype(np.float32)
+        b = np.zeros(len(LABELS), dtype=np.float32)
+        for _ in range(epochs):
+            logits = x @ w.T + b
+            logits -= logits.max(axis=1, keepdims=True)
+            p = np.exp(logits)
+            p /= p.sum(axis=1, keepdims=True)
+            grad = (p - onehot) / len(subset)
+            w -= lr * (grad.T @ x + l2 * w)
+            b -= lr * grad.sum(axis=0)
+        weights[k], bias[k] = w, b
+    return IntentModel(weights, bias)
+
+def evaluate(model: IntentModel, rows: list[dict], threshold: float = THRESHOLD) -> dict:
+    """
+    Report accuracy overall and on the confident subset, plus how many rows stay local.
+    """
+    correct = confident = confident_correct = 0
+    for r in rows:
+        label, prob = model.predict(r["text"], r["intent"])
+        correct += label == r["label"]
+        if prob >= threshold and label != "unknown":
+            confident += 1
+            confident_correct += label == r["label"]
+    n = len(rows) or 1
+    return {
+        "rows": len(rows),
+        "accuracy": round(correct / n, 4),
+        "coverage": round(confident / n, 4),
+        "confident_accuracy": round(confident_correct / confident, 4) if confident else 0.0,
+        "threshold": threshold,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train or evaluate the local intent model.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_train = sub.add_parser("train")
+    p_train.add_argument("--data", required=True, help="JSONL of {text, intent, label}")
+    p_train.add_argument("--out", default=MODEL_PATH)
+    p_train.add_argument("--holdout", type=float, default=0.2, help="fraction kept aside for eval")
+    p_eval = sub.add_parser("eval")
+    p_eval.add_argument("--data", required=True)
+    p_eval.add_argument("--model", default=MODEL_PATH)
+    for p in (p_train, p_eval):
+        p.add_argument("--threshold", type=float, default=THRESHOLD)
+    args = parser.parse_args(argv)
+
+    rows = load_rows(args.data)
+    if args.cmd == "train":
+        order = np.random.default_rng(0).permutation(len(rows))
+        cut = int(len(rows) * (1 - args.holdout))
+        fit, held = [rows[i] for i in order[:cut]], [rows[i] for i in order[cut:]]
+        print("holdout:", json.dumps(evaluate(train(fit), held, args.threshold)))
+        model = train(rows)
+        model.save(args.out)
+        print(f"saved {args.out} ({os.path.getsize(args.out)} bytes)")
+    else:
+        print(json.dumps(evaluate(IntentModel.load(args.model), rows, args.threshold)))
+
+if __name__ == "__main__":
+    main()
@@ -2,68 +2,409 @@
 import os
 import json
 import re
-from dotenv import load_dotenv
-from openai import OpenAI
+import time
+import random
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from .constants import PAY_LINE, OFFTOPIC_NOTE
+from .cache import default_cache, cache_key, normalize_text
+from .matcher import scan, normalize
+from .intent_model import default_model
+from .faq import default_faq
+from .years import parse_years, whole_years, THRESHOLD as YEARS_THRESHOLD
+from .prompts import (
+    classify_template, CLASSIFY_PACKED, TRUCK_TOPIC, ANSWER, ANSWER_ANYTOPIC, ANSWER_FUSED, ANSWER_STREAM_FUSED,
+    STREAM_TAG_ON, STREAM_TAG_OFF,
+)
+from . import metrics
+from . import resilience
+from .resilience import Unavailable
 
-load_dotenv()
 API_KEY = os.getenv("OPENAI_API_KEY")
 
+# Connection pool limits shared by every session/thread in the process.
+MAX_CONNECTIONS = int(os.getenv("OPENAI_MAX_CONNECTIONS", "20"))
+MAX_KEEPALIVE = int(os.getenv("OPENAI_MAX_KEEPALIVE", "10"))
+KEEPALIVE_EXPIRY = float(os.getenv("OPENAI_KEEPALIVE_EXPIRY", "30"))
+
+_client_lock = threading.Lock()
+_shared_client = None
+_async_clients = weakref.WeakKeyDictionary()  # one AsyncOpenAI per event loop
+
+_conn_stats_lock = threading.Lock()
+_conn_stats = {"requests": 0, "new_connections": 0, "tls_handshakes": 0}
+
+def _count(key: str):
+    with _conn_stats_lock:
+        _conn_stats[key] += 1
+
+def _on_trace(name: str, info: dict):
+    if name == "connection.connect_tcp.complete":
+        _count("new_connections")
+    elif name == "connection.start_tls.complete":
+        _count("tls_handshakes")
+
+async def _on_trace_async(name: str, info: dict):
+    _on_trace(name, info)
+
+def _on_request(request):
+    _count("requests")
+    request.extensions["trace"] = _on_trace
+
+async def _on_request_async(request):
+    _count("requests")
+    request.extensions["trace"] = _on_trace_async
+
+def _limits():
+    import httpx
+    return httpx.Limits(
+        max_connections=MAX_CONNECTIONS,
+        max_keepalive_connections=MAX_KEEPALIVE,
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
 def _client():
-    return OpenAI(api_key=API_KEY) if API_KEY else None
+    """
+    Return the process-wide OpenAI client, creating it on first use.
+    The underlying httpx pool keeps connections alive across calls, so
+    concurrent Streamlit sessions share sockets instead of re-handshaking.
+    :return: OpenAI client or None when no API key is configured
+    """
+    global _shared_client
+    if not API_KEY:
+        return None
+    if _shared_client is None:
+        with _client_lock:
+            if _shared_client is None:
+                # Imported here: the SDK is the slowest import in the app, and turns answered
+                # by the local model, the cache or a heuristic never need it.
+                import httpx
+                from openai import OpenAI
+                http_client = httpx.Client(limits=_limits(), event_hooks={"request": [_on_request]})
+                # Retries are ours (src/resilience.py), bounded by the turn deadline.
+                _shared_client = OpenAI(api_key=API_KEY, http_client=http_client, max_retries=0)
+    return _shared_client
+
+def _async_client():
+    """
+    Return the AsyncOpenAI client bound to the running event loop.
+    httpx async pools cannot be shared across loops, so there is one per loop.
+    :return: AsyncOpenAI client or None when no API key is configured
+    """
+    if not API_KEY:
+        return None
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        import httpx
+        from openai import AsyncOpenAI
+        http_client = httpx.AsyncClient(limits=_limits(), event_hooks={"request": [_on_request_async]})
+        client = AsyncOpenAI(api_key=API_KEY, http_client=http_client, max_retries=0)
+        _async_clients[loop] = client
+    return client
+
+def connection_stats() -> dict:
+    """
+    Snapshot of HTTP connection reuse for the shared clients.
+    :return: dict with request, new connection and reuse counters
+    """
+    with _conn_stats_lock:
+        stats = dict(_conn_stats)
+    reused = max(stats["requests"] - stats["new_connections"], 0)
+    stats["reused_connections"] = reused
+    stats["reuse_ratio"] = round(reused / stats["requests"], 4) if stats["requests"] else 0.0
+    return stats
+
+_token_lock = threading.Lock()
+_token_counts = {}  # purpose -> {"calls", "prompt_tokens", "cached_tokens", "completion_tokens"}
+
+def _record_usage(sp, purpose: str, usage):
+    if usage is None:
+        return
+    details = getattr(usage, "prompt_tokens_details", None)
+    cached = getattr(details, "cached_tokens", None) or 0
+    sp.add(prompt_tokens=usage.prompt_tokens, cached_tokens=cached, completion_tokens=usage.completion_tokens)
+    with _token_lock:
+        counts = _token_counts.setdefault(purpose, dict.fromkeys(
+            ("calls", "prompt_tokens", "cached_tokens", "completion_tokens"), 0))
+        counts["calls"] += 1
+        counts["prompt_tokens"] += usage.prompt_tokens or 0
+        counts["cached_tokens"] += cached
+        counts["completion_tokens"] += usage.completion_tokens or 0
+
+def token_stats() -> dict:
+    """
+    Tokens billed per request purpose since start, including prompt tokens
+    the provider served from its prefix cache.
+    :return: flat dict: <purpose>_<counter> plus totals and cached_ratio
+    """
+    with _token_lock:
+        counts = {purpose: dict(c) for purpose, c in _token_counts.items()}
+    stats = {f"{purpose}_{k}": v for purpose, c in sorted(counts.items()) for k, v in c.items()}
+    for k in ("calls", "prompt_tokens", "cached_tokens", "completion_tokens"):
+        stats[k] = sum(c[k] for c in counts.values())
+    stats["cached_ratio"] = round(stats["cached_tokens"] / stats["prompt_tokens"], 4) if stats["prompt_tokens"] else 0.0
+    return stats
+
+def _create(client, purpose: str, **kwargs):
+    # Every non-streaming completion goes through here so it is timed, bounded and its tokens counted.
+    with metrics.span("llm", purpose=purpose, model=kwargs.get("model")) as sp:
+        resp = resilience.call(lambda timeout: client.chat.completions.create(timeout=timeout, **kwargs), purpose)
+        _record_usage(sp, purpose, getattr(resp, "usage", None))
+        return resp
+
+async def _acreate(client, purpose: str, **kwargs):
+    with metrics.span("llm", purpose=purpose, model=kwargs.get("model"), mode="async") as sp:
+        resp = await resilience.acall(lambda timeout: client.chat.completions.create(timeout=timeout, **kwargs),
+                                      purpose)
+        _record_usage(sp, purpose, getattr(resp, "usage", None))
+        return resp
+
+_NUMBER = re.compile(r"\b(-?\d+)\b")
+
+def _classify_heuristic(user_text: str, source: str, unknown_reason: str, intent_hint: str = "generic") -> dict:
+    found = scan(user_text)
+    if "yes" in found:
+        return {"answer_type": "affirmative", "number_value": None, "reason": f"{source} yes"}
+    if "no" in found:
+        return {"answer_type": "negative", "number_value": None, "reason": f"{source} no"}
+    years = parse_years(user_text)
+    if years is not None and years.confidence >= YEARS_THRESHOLD:
+        return {"answer_type": "number", "number_value": whole_years(years), "reason": f"{source} {years.reason}"}
+    if years is not None and intent_hint == "years_number":
+        # A number the parser declined (an age, "a few years"): ask again rather than record the digits.
+        return {"answer_type": "unknown", "number_value": None, "reason": f"{source} years {years.reason}"}
+    m = _NUMBER.search(normalize(user_text))
+    if m:
+        return {"answer_type": "number", "number_value": int(m.group(1)), "reason": f"{source} number"}
+    return {"answer_type": "unknown", "number_value": None, "reason": unknown_reason}
+
+_tier_lock = threading.Lock()
+_tier_counts = {"years_parser": 0, "local_model": 0, "cache": 0, "heuristic": 0, "llm": 0}
+
+def _tier(name: str):
+    with _tier_lock:
+        _tier_counts[name] += 1
+    metrics.incr("classify_tier", tier=name)
+
+def tier_stats() -> dict:
+    """
+    Count of classify() calls answered by each tier.
+    :return: dict of tier -> count plus the fraction that never hit the network
+    """
+    with _tier_lock:
+        stats = dict(_tier_counts)
+    total = sum(stats.values())
+    stats["offline_ratio"] = round((total - stats["llm"]) / total, 4) if total else 0.0
+    return stats
 
 def classify(user_text: str, intent_hint: str = "generic"):
     """
     Classify user intent using OpenAI's API.
+    Tiers, cheapest first: the years parser (years question only), local
+    intent model (when confident), memoized results keyed on (normalized
+    text, intent_hint, prompt version), the LLM.
     :param user_text: user text
     :param intent_hint: type of intent to classify
     :return: type of intent to classify
     """
+    with metrics.span("classify", intent=intent_hint):
+        return _classify(user_text, intent_hint)
+
+def _classify(user_text: str, intent_hint: str, degrade: bool = True, local: bool = True) -> dict:
+    if local:
+        found = _classify_local(user_text, intent_hint)
+        if found is not None:
+            return found
+
     client = _client()
     if client is None:
-        txt = (user_text or "").strip().lower()
-        if any(x in txt for x in ["yes", "yep", "yeah", "sure", "ok", "okay", "affirmative", "yup", "ya"]):
-            return {"answer_type": "affirmative", "number_value": None, "reason": "heuristic yes"}
-        if any(x in txt for x in ["no", "nope", "nah", "don't have", "do not have", "not really"]):
-            return {"answer_type": "negative", "number_value": None, "reason": "heuristic no"}
-        m = re.search(r"\b(-?\d+)\b", txt)
-        if m:
-            return {"answer_type": "number", "number_value": int(m.group(1)), "reason": "heuristic number"}
-        return {"answer_type": "unknown", "number_value": None, "reason": "heuristic unknown"}
-
-    system = (
-        "You extract structured answers from applicants for a truck driving role. "
-        "Return ONLY valid JSON with keys: "
-        '{"answer_type": one of ["affirmative","negative","number","unknown","other"], '
-        '"number_value": integer or null, "reason": short string}. Be strict JSON (no prose).'
-    )
-    # prompt
-    examples = """
-        User: "yep I have it" -> {"answer_type":"affirmative","number_value":null,"reason":"yes cdl"}
-        User: "nope" -> {"answer_type":"negative","number_value":null,"reason":"no"}
-        User: "about 3 years" -> {"answer_type":"number","number_value":3,"reason":"3 years"}
-        User: "a while" -> {"answer_type":"unknown","number_value":null,"reason":"vague"}
-    """
-    user_msg = f"Current question intent: {intent_hint}.\nApplicant said: {user_text}\n{examples}"
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0,
-        response_format={"type": "json_object"},
-        messages=[{"role": "system", "content": system},
-                  {"role": "user", "content": user_msg}],
-    )
+        _tier("heuristic")
+        return _classify_heuristic(user_text, "heuristic", "heuristic unknown", intent_hint)
+
     try:
-        return json.loads(resp.choices[0].message.content)
+        resp = _create(client, "classify", **_classify_request(user_text, intent_hint))
+    except Unavailable:
+        if not degrade:
+            raise
+        return _classify_unavailable(user_text, intent_hint)
+    return _classify_parse(user_text, intent_hint, resp, degrade)
+
+def _classify_strict(user_text: str, intent_hint: str) -> dict:
+    # Bulk re-scoring asks the current prompt every time: no parser, intent model or cached
+    # result, and an unavailable model is retried instead of writing heuristic guesses.
+    with metrics.span("classify", intent=intent_hint, mode="batch"):
+        return _classify(user_text, intent_hint, degrade=False, local=False)
+
+def _classify_unavailable(user_text: str, intent_hint: str) -> dict:
+    _tier("heuristic")
+    return _classify_heuristic(user_text, "fallback", "llm unavailable", intent_hint)
+
+async def aclassify(user_text: str, intent_hint: str = "generic") -> dict:
+    """
+    classify() for asyncio callers: the same tiers, with the LLM tier awaited
+    on the loop's AsyncOpenAI client so many requests overlap in one thread.
+    :param user_text: user text
+    :param intent_hint: type of intent to classify
+    :return: classify-style dict
+    """
+    with metrics.span("classify", intent=intent_hint, mode="async"):
+        # The cache tiers read and write SQLite, so they run off the event loop.
+        local = await asyncio.to_thread(_classify_local, user_text, intent_hint)
+        if local is not None:
+            return local
+
+        client = _async_client()
+        if client is None:
+            _tier("heuristic")
+            return _classify_heuristic(user_text, "heuristic", "heuristic unknown", intent_hint)
+
+        try:
+            resp = await _acreate(client, "classify", **_classify_request(user_text, intent_hint))
+        except Unavailable:
+            return _classify_unavailable(user_text, intent_hint)
+        return await asyncio.to_thread(_classify_parse, user_text, intent_hint, resp)
+
+def _classify_request(user_text: str, intent_hint: str) -> dict:
+    return classify_template(intent_hint).request(intent=intent_hint, text=user_text)
+
+def _classify_key(user_text: str, intent_hint: str) -> str:
+    # The template version is part of the key, so any prompt edit invalidates cached results.
+    return cache_key(user_text, intent_hint, classify_template(intent_hint).version)
+
+def _classify_parse(user_text: str, intent_hint: str, resp, degrade: bool = True) -> dict:
+    try:
+        result = json.loads(resp.choices[0].message.content)
     except Exception:
-        txt = (user_text or "").strip().lower()
-        if any(x in txt for x in ["yes", "yep", "yeah", "sure", "ok", "okay"]):
-            return {"answer_type": "affirmative", "number_value": None, "reason": "fallback yes"}
-        if any(x in txt for x in ["no", "nope", "nah"]):
-            return {"answer_type": "negative", "number_value": None, "reason": "fallback no"}
-        m = re.search(r"\b(-?\d+)\b", txt)
-        if m:
-            return {"answer_type": "number", "number_value": int(m.group(1)), "reason": "fallback number"}
-        return {"answer_type": "unknown", "number_value": None, "reason": "parse_error"}
+        if not degrade:
+            # Bulk re-scoring records a failed row rather than a heuristic guess.
+            raise Unavailable("parse_error", "classify")
+        _tier("heuristic")
+        return _classify_heuristic(user_text, "fallback", "parse_error", intent_hint)
+    _tier("llm")
+    default_cache().set(_classify_key(user_text, intent_hint), result)
+    return result
+
+def _classify_local(user_text: str, intent_hint: str) -> dict | None:
+    # Tiers that never touch the network: the years parser, the local intent model, then the cache.
+    if intent_hint == "years_number":
+        years = parse_years(user_text)
+        if years is not None and years.confidence >= YEARS_THRESHOLD:
+            _tier("years_parser")
+            return {"answer_type": "number", "number_value": whole_years(years),
+                    "reason": f"years parser {years.reason} {years.confidence:.2f}"}
+        if years is not None:
+            # The parser declined a number (an age, "a few years", two durations): only the LLM
+            # decides, so the intent model's digit extraction never gets to record it.
+            return _classify_cached(user_text, intent_hint)
+    model = default_model()
+    if model is not None:
+        local = model.classify(user_text, intent_hint)
+        if local is not None:
+            _tier("local_model")
+            return local
+    return _classify_cached(user_text, intent_hint)
+
+def _classify_cached(user_text: str, intent_hint: str) -> dict | None:
+    cached = default_cache().get(_classify_key(user_text, intent_hint))
+    if cached is not None:
+        _tier("cache")
+    return cached
+
+# --------- Bulk re-scoring ---------
+
+def _with_backoff(fn, *args, retries: int = 6, base_delay: float = 0.5, max_delay: float = 30.0):
+    for attempt in range(retries + 1):
+        try:
+            return fn(*args)
+        except (*resilience.retryable_errors(), Unavailable) as e:
+            if attempt == retries or getattr(e, "reason", None) == "error":
+                raise  # a non-retryable API error fails the same way every time
+            delay = min(max_delay, base_delay * 2 ** attempt) * (0.5 + random.random() / 2)
+            response = getattr(e, "response", None)
+            retry_after = response.headers.get("retry-after") if response is not None else None
+            if retry_after:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            time.sleep(delay)
+
+def _classify_packed(group: list[tuple[str, str]]) -> list[dict]:
+    """
+    Classify several short utterances with one JSON-mode request.
+    Items the model drops or mangles are classified individually; the caller's
+    backoff retries the group if that fails.
+    """
+    client = _client()
+    if client is None:
+        return [classify(text, intent) for text, intent in group]
+    payload = [{"id": i, "intent": intent, "text": text} for i, (text, intent) in enumerate(group)]
+    resp = _create(client, "classify_packed", **CLASSIFY_PACKED.request(items=json.dumps(payload)))
+    _tier("llm")
+    by_id = {}
+    try:
+        for r in json.loads(resp.choices[0].message.content)["results"]:
+            by_id[int(r.pop("id"))] = r
+    except Exception:
+        pass
+    out = []
+    for i, (text, intent) in enumerate(group):
+        r = by_id.get(i)
+        if isinstance(r, dict) and "answer_type" in r:
+            r.setdefault("number_value", None)
+            r.setdefault("reason", "")
+            default_cache().set(_classify_key(text, intent), r)
+            out.append(r)
+        else:
+            out.append(_classify_strict(text, intent))
+    return out
+
+def classify_batch(items, concurrency: int = 8, pack: int = 1):
+    """
+    Classify many (user_text, intent_hint) pairs with bounded concurrency.
+    Every pair goes to the LLM with the current prompt (the local tiers and the
+    cache are bypassed; results refresh the cache). Identical pairs (after
+    normalization) are sent once, rate-limit and connection errors are retried
+    with jittered backoff, and results are yielded in input order as soon as
+    each one is ready. A pair that still fails is yielded as an "unknown"
+    result with an "error" field, and the batch carries on.
+    :param items: iterable of (user_text, intent_hint)
+    :param concurrency: max in-flight LLM requests
+    :param pack: utterances per request; >1 packs short replies into one JSON-mode call
+    :return: generator of classify() result dicts
+    """
+    items = [(text, intent or "generic") for text, intent in items]
+    keys = [(normalize_text(text), intent) for text, intent in items]
+    first = {}
+    for key, item in zip(keys, items):
+        first.setdefault(key, item)
+
+    slots = {}  # key -> (future, index in its packed group or None)
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        if pack > 1:
+            pending = list(first)
+            for start in range(0, len(pending), pack):
+                group = pending[start:start + pack]
+                future = pool.submit(_with_backoff, _classify_packed, [first[k] for k in group])
+                for j, key in enumerate(group):
+                    slots[key] = (future, j)
+        else:
+            for key, (text, intent) in first.items():
+                slots[key] = (pool.submit(_with_backoff, _classify_strict, text, intent), None)
+
+        for key in keys:
+            future, j = slots[key]
+            try:
+                result = future.result()
+            except Exception as e:
+                metrics.incr("classify_batch_failed", reason=getattr(e, "reason", type(e).__name__))
+                yield {"answer_type": "unknown", "number_value": None,
+                       "reason": f"batch error {getattr(e, 'reason', type(e).__name__)}", "error": str(e)}
+                continue
+            yield dict(result if j is None else result[j])
 
 def is_truck_related(text: str) -> bool:
     """
@@ -71,36 +412,37 @@ def is_truck_related(text: str) -> bool:
     :param text: question text
     :return: true if related question is truck related
     """
-    t = (text or "").strip().lower()
-    truck_keywords = [
-        "truck", "driv", "cdl", "class a", "mvr", "routes", "lanes", "miles", "cents per mile",
-        "orientation", "ot", "home time", "dispatch", "equipment", "benefit", "policy", "policies",
-        "pay", "salary", "wage", "compensation", "dedicated", "regional", "otr",
-        "night", "shift", "schedule", "hazmat", "endorsement", "hours of service", "hos", "dot",
-        "pre-trip", "post-trip", "trailer", "reefer", "flatbed",
-        "location", "where", "based", "days off", "pto", "vacation", "holiday"
-    ]
-    if any(k in t for k in truck_keywords):
+    if "truck" in scan(text):
+        metrics.incr("short_circuit", reason="truck_keyword")
         return True
+    return _truck_related_llm(text)
 
+def _qa_values(text: str, context: str) -> dict:
+    return {"text": text, "context": f"{context}\n\n" if context else ""}
+
+def _truck_topic_request(text: str, context: str = "") -> dict:
+    return TRUCK_TOPIC.request(**_qa_values(text, context))
+
+def _is_truck_label(resp) -> bool:
+    return (resp.choices[0].message.content or "").strip().lower() == "truck"
+
+def _truck_related_llm(text: str, context: str = "") -> bool:
     client = _client()
     if client is None:
         return False
+    try:
+        return _is_truck_label(_create(client, "truck_topic", **_truck_topic_request(text, context)))
+    except Unavailable:
+        return False  # same as offline: only the keyword match counts as on topic
+
+async def _atruck_related_llm(client, text: str, context: str = "") -> bool:
+    try:
+        return _is_truck_label(await _acreate(client, "truck_topic", **_truck_topic_request(text, context)))
+    except Unavailable:
+        return False
 
-    system = (
-        "You are a binary classifier. Return exactly 'truck' if the user's message is about a truck driving job "
-        "or company/job details (requirements, pay/compensation, location/where the job is based, schedule/home time, "
-        "days off/PTO/vacation, benefits, routes/lanes, equipment, policies, HOS/DOT, CDL, endorsements, etc.). "
-        "Otherwise return exactly 'other'."
-    )
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0,
-        messages=[{"role": "system", "content": system},
-                  {"role": "user", "content": text}],
-    )
-    label = (resp.choices[0].message.content or "").strip().lower()
-    return label == "truck"
+OFFLINE_ANSWER = ("A recruiter can share more details about that during the next step. "
+                  "If you have any additional questions, please email us at help@getdoublenickel.com.")
 
 def answer_user_question(user_question_text: str) -> str:
     """
@@ -108,59 +450,317 @@ def answer_user_question(user_question_text: str) -> str:
     :param user_question_text: question text
     :return: answer text
     """
-    t = (user_question_text or "").lower()
-    if any(k in t for k in ["pay", "salary", "wage", "rate", "cents per mile", "compensation", "money"]):
+    if "pay" in scan(user_question_text):
+        metrics.incr("short_circuit", reason="pay_keyword")
         return PAY_LINE
 
     client = _client()
     if client is None:
-        return ("A recruiter can share more details about that during the next step. "
-                "If you have any additional questions, please email us at help@getdoublenickel.com.")
-
-    system = (
-        "You are the Happy Hauler recruiting assistant. Be concise, factual, and friendly. "
-        "If asked about pay, respond with: 'The pay range is 60 to 65 cents per mile based on experience.' "
-        "If you don't have a specific fact, say the recruiter can provide details. "
-        "Avoid making up benefits or policies not provided. Keep answers to 1–3 short sentences."
-    )
-    messages = [{"role": "system", "content": system},
-                {"role": "user", "content": user_question_text}]
-    resp = client.chat.completions.create(model="gpt-4o-mini", temperature=0.2, messages=messages)
+        return OFFLINE_ANSWER
+
+    try:
+        resp = _create(client, "answer", **ANSWER.request(text=user_question_text))
+    except Unavailable:
+        return OFFLINE_ANSWER
     return resp.choices[0].message.content.strip()
 
-def answer_user_question_anytopic(user_text: str) -> tuple[str, bool]:
+# QA_FUSED=0 restores the sequential is_truck_related + answer calls for A/B comparison.
+QA_FUSED = os.getenv("QA_FUSED", "1") != "0"
+
+OFFTOPIC_SUFFIX = (
+    "\n\n The eligibility result will be displayed below. "
+    f"Thank you for taking the time to chat with us. \n\n{OFFTOPIC_NOTE}"
+)
+OFFLINE_ON_TOPIC = "A recruiter can share more details about that during the next step. Anything else I can help with?"
+
+def _with_offtopic_note(core: str) -> str:
+    return f"{core}{OFFTOPIC_SUFFIX}"
+
+def _answer_request(user_text: str, context: str) -> dict:
+    return ANSWER_ANYTOPIC.request(**_qa_values(user_text, context))
+
+def _fused_request(user_text: str, context: str) -> dict:
+    return ANSWER_FUSED.request(**_qa_values(user_text, context))
+
+def _parse_fused(resp) -> tuple[str | None, bool]:
+    # (None, False) unless the reply is the {on_topic, answer} object asked for. Only a JSON
+    # true is on topic: bool("false") would be True.
+    try:
+        data = json.loads(resp.choices[0].message.content or "")
+        answer, on_topic = data.get("answer"), data.get("on_topic")
+    except Exception:
+        return None, False
+    if not isinstance(answer, str) or not answer.strip():
+        return None, False
+    return answer.strip(), on_topic is True
+
+def _answer_llm(client, user_text: str, context: str) -> str:
+    resp = _create(client, "answer_anytopic", **_answer_request(user_text, context))
+    return resp.choices[0].message.content.strip()
+
+async def _aanswer_llm(client, user_text: str, context: str) -> str:
+    resp = await _acreate(client, "answer_anytopic", **_answer_request(user_text, context))
+    return resp.choices[0].message.content.strip()
+
+def _answer_fused(client, user_text: str, context: str) -> tuple[str, bool]:
+    answer, on_topic = _parse_fused(_create(client, "answer_fused", **_fused_request(user_text, context)))
+    if answer is None:
+        # Malformed reply: fall back to the plain answer and the separate topic check.
+        return _answer_llm(client, user_text, context), _truck_related_llm(user_text, context)
+    return answer, on_topic
+
+async def _aanswer_fused(client, user_text: str, context: str) -> tuple[str, bool]:
+    answer, on_topic = _parse_fused(await _acreate(client, "answer_fused", **_fused_request(user_text, context)))
+    if answer is None:
+        answer, on_topic = await asyncio.gather(_aanswer_llm(client, user_text, context),
+                                                _atruck_related_llm(client, user_text, context))
+    return answer, on_topic
+
+def _local_answer(user_text: str, found: dict) -> str | None:
+    # On-topic answers that need no model: the pay line, then the FAQ base.
+    if "pay" in found:
+        metrics.incr("short_circuit", reason="pay_keyword")
+        return PAY_LINE
+    # Character n-grams alone match "what time is it?" to "what's the home time like?", so
+    # the FAQ only answers questions that name a job topic.
+    entry = default_faq().lookup(user_text) if "truck" in found or "job" in found else None
+    if entry is not None:
+        metrics.incr("short_circuit", reason="faq", source=entry["source"])
+        return entry["answer"]
+    return None
+
+def _answer_offline(user_text: str, found: dict, on_topic: bool | None = None) -> tuple[str, bool]:
+    # on_topic: a topic decision already made for this question; otherwise the keyword decides.
+    if on_topic if on_topic is not None else "truck" in found:
+        return OFFLINE_ON_TOPIC, True
+    return f"{OFFLINE_ANSWER}\n\n{OFFTOPIC_NOTE}", False
+
+def _learn(user_text: str, answer: str, on_topic: bool, seconds: float):
+    # Generated on-topic answers are queued for FAQ review; timings size the FAQ's savings.
+    faq = default_faq()
+    faq.record_llm(seconds)
+    if on_topic:
+        faq.remember(user_text, answer)
+
+def answer_user_question_anytopic(user_text: str, fused: bool | None = None, context: str = "") -> tuple[str, bool]:
     """
     Answer user's any question using OpenAI's API
+    The pay line and the FAQ base answer locally; keyword hits settle the topic
+    locally; otherwise the fused mode asks for the topic and the answer in one
+    structured request.
     :param user_text: question text
+    :param fused: one combined LLM call instead of two; defaults to QA_FUSED
+    :param context: conversation context sent ahead of the question (see src/context.py)
     :return: answer text and true if truck related false otherwise
     """
-    t = (user_text or "").lower()
-    if any(k in t for k in ["pay", "salary", "wage", "rate", "cents per mile", "compensation", "money"]):
-        return PAY_LINE, True
+    found = scan(user_text)
+    local = _local_answer(user_text, found)
+    if local is not None:
+        return local, True
 
     client = _client()
-    on_topic = is_truck_related(user_text)
+    if client is None:
+        return _answer_offline(user_text, found)
+
+    started = time.perf_counter()
+    try:
+        if "truck" in found:
+            metrics.incr("short_circuit", reason="truck_keyword")
+            core, on_topic = _answer_llm(client, user_text, context), True
+        elif QA_FUSED if fused is None else fused:
+            core, on_topic = _answer_fused(client, user_text, context)
+        else:
+            on_topic = _truck_related_llm(user_text, context)
+            core = _answer_llm(client, user_text, context)
+    except Unavailable:
+        return _answer_offline(user_text, found)
+    _learn(user_text, core, on_topic, time.perf_counter() - started)
+    return (core, True) if on_topic else (_with_offtopic_note(core), False)
+
+async def aanswer_user_question_anytopic(user_text: str, fused: bool | None = None,
+                                         context: str = "") -> tuple[str, bool]:
+    """
+    answer_user_question_anytopic() for asyncio callers. In the unfused mode
+    the topic check and the answer are requested concurrently.
+    :param user_text: question text
+    :param fused: one combined LLM call instead of two; defaults to QA_FUSED
+    :param context: conversation context sent ahead of the question
+    :return: answer text and true if truck related false otherwise
+    """
+    found = scan(user_text)
+    # FAQ lookups and _learn() touch SQLite, so they run off the event loop.
+    local = await asyncio.to_thread(_local_answer, user_text, found)
+    if local is not None:
+        return local, True
 
+    client = _async_client()
     if client is None:
-        if on_topic:
-            return "A recruiter can share more details about that during the next step. Anything else I can help with?", True
-        return f"{answer_user_question(user_text)}\n\n{OFFTOPIC_NOTE}", False
-
-    system = (
-        "You are the Happy Hauler recruiting assistant. "
-        "Be concise, factual, and friendly. "
-        "If the user asks about pay, the exact line to use is: "
-        "'The pay range is 60 to 65 cents per mile based on experience.' "
-        "If you don't have a specific fact, say the recruiter can provide details. "
-        "Avoid inventing policies. Keep answers to 1–3 short sentences. "
-        "If the user's question is unrelated to the truck driving role or the company/job details, "
-        "still provide a brief, polite response, and do not encourage follow-up in chat; instead, they should email."
-    )
-    resp = client.chat.completions.create(
-        model="gpt-4o-mini",
-        temperature=0.2,
-        messages=[{"role": "system", "content": system},
-                  {"role": "user", "content": user_text}],
-    )
-    core = resp.choices[0].message.content.strip()
-    return (core, True) if on_topic else (f"{core}\n\n The eligibility result will be displayed below. Thank you for taking the time to chat with us. \n\n{OFFTOPIC_NOTE}", False)
+        return _answer_offline(user_text, found)
+
+    started = time.perf_counter()
+    try:
+        if "truck" in found:
+            metrics.incr("short_circuit", reason="truck_keyword")
+            core, on_topic = await _aanswer_llm(client, user_text, context), True
+        elif QA_FUSED if fused is None else fused:
+            core, on_topic = await _aanswer_fused(client, user_text, context)
+        else:
+            on_topic, core = await asyncio.gather(_atruck_related_llm(client, user_text, context),
+                                                  _aanswer_llm(client, user_text, context))
+    except Unavailable:
+        return _answer_offline(user_text, found)
+    await asyncio.to_thread(_learn, user_text, core, on_topic, time.perf_counter() - started)
+    return (core, True) if on_topic else (_with_offtopic_note(core), False)
+
+# --------- Streaming ---------
+
+class AnswerStream:
+    """
+    Iterable of answer text chunks for st.write_stream.
+    `on_topic` and `text` (answer including any off-topic note) are final once
+    iteration ends, or once fail() is called if it raised; `topic_known` is
+    False only while a fused stream's topic tag is still outstanding.
+    `time_to_first_token` is seconds until the first chunk.
+    `question` is the applicant's text it answers.
+    """
+
+    def __init__(self, produce, question: str = ""):
+        self._produce = produce
+        self.question = question
+        self.on_topic = True
+        self.topic_known = True
+        self.text = ""
+        self.time_to_first_token = None
+
+    def __iter__(self):
+        started = time.perf_counter()
+        parts = []
+        for chunk in self._produce(self):
+            if not chunk:
+                continue
+            if self.time_to_first_token is None:
+                self.time_to_first_token = time.perf_counter() - started
+                metrics.observe("time_to_first_token", self.time_to_first_token)
+            parts.append(chunk)
+            yield chunk
+        self.text = "".join(parts)
+
+    def fail(self) -> str:
+        """
+        Settle a stream that raised before it finished: the reply becomes the
+        offline answer, so the exchange is not lost. A topic decision that
+        already arrived (the fused stream's tag) is kept.
+        :return: the offline answer text
+        """
+        metrics.incr("stream_failed")
+        self.text, self.on_topic = _answer_offline(self.question, scan(self.question),
+                                                   self.on_topic if self.topic_known else None)
+        return self.text
+
+def _stream_completion(client, template, user_text: str, context: str, purpose: str,
+                       deadline: float | None = None):
+    # The deadline bounds the wait for the response and the whole read: each chunk waits at most the
+    # attempt's timeout, and the stream is cut once the turn's deadline has passed. A stream that
+    # breaks off or runs over raises Unavailable.
+    deadline = resilience.current_deadline() if deadline is None else deadline
+    with metrics.span("llm", purpose=purpose, model=template.model, stream=True) as sp:
+        stream = resilience.call(lambda timeout: client.chat.completions.create(
+            **template.request(**_qa_values(user_text, context)),
+            stream=True,
+            stream_options={"include_usage": True},
+            timeout=timeout,
+        ), purpose, deadline)
+        try:
+            for chunk in stream:
+                if chunk.usage is not None:
+                    _record_usage(sp, purpose, chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+                if deadline is not None and time.monotonic() >= deadline:
+                    stream.close()
+                    raise resilience.stream_failed(purpose, "budget")
+        except resilience.api_errors() as e:
+            raise resilience.stream_failed(purpose) from e
+
+def _strip_tag(stream: AnswerStream, pieces, user_text: str, context: str):
+    # Buffer only until the topic tag is complete, then pass tokens straight through.
+    stream.topic_known = False
+    buf = ""
+    pieces = iter(pieces)
+    for piece in pieces:
+        buf += piece
+        head = buf.lstrip()
+        if head.startswith(STREAM_TAG_ON) or head.startswith(STREAM_TAG_OFF):
+            stream.on_topic, stream.topic_known = head.startswith(STREAM_TAG_ON), True
+            rest = head[len(STREAM_TAG_ON):].lstrip()
+            while not rest:
+                rest = next(pieces, None)
+                if rest is None:
+                    return
+                rest = rest.lstrip()
+            yield rest
+            yield from pieces
+            return
+        if len(head) >= len(STREAM_TAG_ON):
+            break
+    # No tag: show what arrived and settle the topic with the separate check.
+    yield buf.lstrip()
+    yield from pieces
+    stream.on_topic, stream.topic_known = _truck_related_llm(user_text, context), True
+
+def stream_user_question_anytopic(user_text: str, fused: bool | None = None, context: str = "") -> AnswerStream:
+    """
+    Streaming counterpart of answer_user_question_anytopic.
+    :param user_text: question text
+    :param fused: topic decision and answer in one request; defaults to QA_FUSED
+    :param context: conversation context sent ahead of the question
+    :return: AnswerStream yielding answer tokens, then the off-topic note if needed
+    """
+    found = scan(user_text)
+    deadline = resilience.current_deadline()  # the stream is read after the turn's step() returns
+
+    def produce(stream: AnswerStream):
+        local = _local_answer(user_text, found)
+        if local is not None:
+            yield local
+            return
+        client = _client()
+        if client is None:
+            answer, stream.on_topic = _answer_offline(user_text, found)
+            yield answer
+            return
+        started = time.perf_counter()
+        if "truck" in found:
+            metrics.incr("short_circuit", reason="truck_keyword")
+            pieces = _stream_completion(client, ANSWER_ANYTOPIC, user_text, context, "answer_stream", deadline)
+        elif QA_FUSED if fused is None else fused:
+            pieces = _strip_tag(stream, _stream_completion(client, ANSWER_STREAM_FUSED, user_text, context,
+                                                           "answer_stream_fused", deadline), user_text, context)
+        else:
+            stream.on_topic = _truck_related_llm(user_text, context)
+            pieces = _stream_completion(client, ANSWER_ANYTOPIC, user_text, context, "answer_stream", deadline)
+        parts = []
+        try:
+            for piece in pieces:
+                parts.append(piece)
+                yield piece
+        except Unavailable:
+            if not parts:
+                answer, stream.on_topic = _answer_offline(user_text, found,
+                                                          stream.on_topic if stream.topic_known else None)
+                yield answer
+                return
+            # Broke off mid-answer: keep what was shown, but don't queue it for the FAQ.
+        else:
+            _learn(user_text, "".join(parts), stream.on_topic, time.perf_counter() - started)
+        if not stream.on_topic:
+            yield OFFTOPIC_SUFFIX
+
+    return AnswerStream(produce, user_text)
+
+metrics.register_collector("connections", connection_stats)
+metrics.register_collector("classify_tiers", tier_stats)
+metrics.register_collector("classify_cache", lambda: default_cache().snapshot())
+metrics.register_collector("tokens", token_stats)
+metrics.register_collector("faq", lambda: default_faq().snapshot())
+metrics.register_collector("resilience", resilience.resilience_stats)
@@ -0,0 +1,138 @@
+# src/matcher.py
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+# Keyword lists shared by the heuristics in llm.py and state.py.
+# A trailing "*" matches any word starting with the stem ("driv*" -> driver, driving);
+# everything else must match on whole-word boundaries, so "no" never fires
+# inside "know" and "ot" never fires inside "not".
+KEYWORDS = {
+    "truck": [
+        "truck*", "driv*", "cdl", "class a", "mvr", "route*", "lane*", "mile*", "cents per mile",
+        "orientation*", "ot", "home time", "dispatch*", "equipment", "benefit*", "polic*",
+        "pay*", "salar*", "wage*", "compensation", "dedicated", "regional", "otr",
+        "night*", "shift*", "schedul*", "hazmat", "endorsement*", "hours of service", "hos", "dot",
+        "pre-trip", "post-trip", "trailer*", "reefer*", "flatbed*",
+        "location*", "where", "based", "days off", "pto", "vacation*", "holiday*",
+    ],
+    "pay": ["pay*", "salar*", "wage*", "rate*", "cents per mile", "compensation", "money"],
+    # Job topics the FAQ base covers beyond "truck": a FAQ match only counts when one of these is present.
+    "job": [
+        "job*", "role", "position", "company", "home", "weekend*", "insurance", "health", "dental", "vision",
+        "401k", "retirement", "requirement*", "qualif*", "need", "experience", "recruiter*", "next", "hear back",
+        "contact", "email", "phone", "call", "reach", "team", "solo", "rider", "pet*", "dog*", "spouse",
+    ],
+    "closing": [
+        "no", "nope", "nah", "not really", "i'm good", "im good", "all good",
+        "no questions", "no question", "nothing", "that's all", "thats all", "i'm fine", "im fine",
+        "no thanks", "no thank you",
+    ],
+    "yes": ["yes", "yep", "yeah", "sure", "ok", "okay", "affirmative", "yup", "ya"],
+    "no": ["no", "nope", "nah", "don't have", "do not have", "not really"],
+    "no_experience": [
+        "no experience", "none", "zero", "0", "never", "no exp", "new driver", "no driving experience",
+    ],
+}
+
+class Hit(NamedTuple):
+    keyword: str
+    categories: frozenset
+    position: int  # token index in the message
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+
+def normalize(text: str) -> str:
+    return (text or "").replace("’", "'").strip().lower()
+
+def tokenize(text: str) -> list[str]:
+    # A possessive matches its word: "cdl's" -> "cdl", "driver's" -> "driver".
+    return [t[:-2] if t.endswith("'s") else t for t in _TOKEN.findall(normalize(text))]
+
+def _build(keywords: dict):
+    phrases, prefixes, owners = {}, {}, {}
+    for category, words in keywords.items():
+        for w in words:
+            owners.setdefault(w, set()).add(category)
+    for w in owners:
+        if w.endswith("*"):
+            prefixes[w[:-1]] = w
+        else:
+            phrases[tuple(tokenize(w))] = w
+
+    def lookup(span: tuple):
+        if span in phrases:
+            return phrases[span]
+        if len(span) == 1:
+            for n in prefix_lengths:
+                kw = prefixes.get(span[0][:n])
+                if kw is not None:
+                    return kw
+        return None
+
+    prefix_lengths = sorted({len(p) for p in prefixes}, reverse=True)
+
+    # A phrase also counts for every category of the keywords it contains
+    # ("no thanks" is a closing phrase *and* a "no"), because the single pass
+    # consumes the longest phrase and never revisits its inner words.
+    categories = {}
+    for w, cats in owners.items():
+        toks = tuple(tokenize(w.rstrip("*")))
+        merged = set(cats)
+        for i in range(len(toks)):
+            for j in range(i + 1, len(toks) + 1):
+                inner = lookup(toks[i:j])
+                if inner is not None:
+                    merged |= owners[inner]
+        categories[w] = frozenset(merged)
+
+    # Longest multi-word phrase per leading word; most words start none.
+    longest = {}
+    for p in phrases:
+        if len(p) > 1:
+            longest[p[0]] = max(longest.get(p[0], 1), len(p))
+    return lookup, longest, categories
+
+_lookup, _LONGEST, _CATEGORIES = _build(KEYWORDS)
+
+@lru_cache(maxsize=8192)
+def _word(token: str):
+    return _lookup((token,))
+
+def hits(text: str) -> list[Hit]:
+    """
+    Scan text once and return every keyword hit in order of appearance.
+    Matching is on whole words; the longest phrase starting at a word wins.
+    :param text: user text
+    :return: list of Hit(keyword, categories, position)
+    """
+    toks = tokenize(text)
+    out = []
+    i, n = 0, len(toks)
+    while i < n:
+        tok = toks[i]
+        size = 1
+        keyword = None
+        for span in range(min(_LONGEST.get(tok, 1), n - i), 1, -1):
+            keyword = _lookup(tuple(toks[i:i + span]))
+            if keyword is not None:
+                size = span
+                break
+        if keyword is None:
+            keyword = _word(tok)
+        if keyword is not None:
+            out.append(Hit(keyword, _CATEGORIES[keyword], i))
+        i += size
+    return out
+
+def scan(text: str) -> dict[str, str]:
+    """
+    Scan text once and report the first matching keyword for each category.
+    :param text: user text
+    :return: dict mapping category -> keyword, e.g. {"truck": "driv*"}
+    """
+    found = {}
+    for hit in hits(text):
+        for category in hit.categories:
+            found.setdefault(category, hit.keyword)
+    return found
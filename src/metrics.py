@@ -0,0 +1,232 @@
+# src/metrics.py
+# Lightweight timing spans and counters. Disabled by default: span() then hands
+# back a shared no-op context and incr()/observe() return immediately.
+#
+#   METRICS_ENABLED=1                enable collection
+#   METRICS_SNAPSHOT_PATH=path.json  also write a snapshot every METRICS_SNAPSHOT_INTERVAL seconds
+#                                    (a path ending in .prom gets Prometheus text format)
+import os
+import json
+import time
+import threading
+from collections import deque
+
+ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+SNAPSHOT_PATH = os.getenv("METRICS_SNAPSHOT_PATH", "")
+SNAPSHOT_INTERVAL = float(os.getenv("METRICS_SNAPSHOT_INTERVAL", "15"))
+RESERVOIR = 512  # recent durations kept per series for percentiles
+
+_lock = threading.Lock()
+_series = {}      # (name, labels) -> {"count", "sum", "max", "recent", "fields"}
+_counters = {}    # (name, labels) -> int
+_collectors = {}  # name -> zero-arg callable returning a flat dict of numbers
+
+def _key(name: str, labels: dict) -> tuple:
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **labels):
+        pass
+
+    def add(self, **fields):
+        pass
+
+_NOOP = _NoopSpan()
+
+class _Span:
+    __slots__ = ("name", "labels", "fields", "started")
+
+    def __init__(self, name: str, labels: dict):
+        self.name = name
+        self.labels = labels
+        self.fields = {}
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Streamlit's st.stop()/st.rerun() unwind via exceptions; those still count as completed spans.
+        _record(self.name, self.labels, time.perf_counter() - self.started, self.fields)
+        return False
+
+    def set(self, **labels):
+        """Attach labels known only after the span started (e.g. which heuristic short-circuited)."""
+        self.labels.update(labels)
+
+    def add(self, **fields):
+        """Accumulate numeric fields such as prompt/completion tokens."""
+        for k, v in fields.items():
+            if v is not None:
+                self.fields[k] = self.fields.get(k, 0) + v
+
+def span(name: str, **labels):
+    """
+    Time a block: `with span("llm", purpose="classify") as sp: ...; sp.add(prompt_tokens=12)`.
+    :param name: series name
+    :param labels: low-cardinality labels (step, model, purpose, ...)
+    :return: context manager (a shared no-op when metrics are disabled)
+    """
+    if not ENABLED:
+        return _NOOP
+    return _Span(name, labels)
+
+def _record(name: str, labels: dict, seconds: float, fields: dict | None = None):
+    key = _key(name, labels)
+    with _lock:
+        s = _series.get(key)
+        if s is None:
+            s = _series[key] = {"count": 0, "sum": 0.0, "max": 0.0, "recent": deque(maxlen=RESERVOIR), "fields": {}}
+        s["count"] += 1
+        s["sum"] += seconds
+        s["max"] = max(s["max"], seconds)
+        s["recent"].append(seconds)
+        for k, v in (fields or {}).items():
+            s["fields"][k] = s["fields"].get(k, 0) + v
+
+def observe(name: str, seconds: float, **labels):
+    """
+    Record a duration measured elsewhere (e.g. time-to-first-token).
+    """
+    if ENABLED and seconds is not None:
+        _record(name, labels, seconds)
+
+def incr(name: str, amount: int = 1, **labels):
+    """
+    Increment a counter, e.g. incr("short_circuit", reason="pay_keyword").
+    """
+    if not ENABLED:
+        return
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+def register_collector(name: str, fn):
+    """
+    Include fn()'s numeric dict in every snapshot (pool stats, cache stats, ...).
+    """
+    _collectors[name] = fn
+
+def enable(on: bool = True):
+    global ENABLED
+    ENABLED = on
+    if on:
+        _start_writer()
+
+def reset():
+    with _lock:
+        _series.clear()
+        _counters.clear()
+
+def _quantile(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+def snapshot() -> dict:
+    """
+    :return: JSON-serializable aggregates of spans, counters and collectors
+    """
+    with _lock:
+        series = [(k, dict(v, recent=sorted(v["recent"]), fields=dict(v["fields"]))) for k, v in _series.items()]
+        counters = list(_counters.items())
+    spans = []
+    for (name, labels), s in sorted(series):
+        spans.append({
+            "name": name,
+            "labels": dict(labels),
+            "count": s["count"],
+            "total_ms": round(s["sum"] * 1000, 3),
+            "mean_ms": round(s["sum"] / s["count"] * 1000, 3),
+            "p50_ms": round(_quantile(s["recent"], 0.50) * 1000, 3),
+            "p95_ms": round(_quantile(s["recent"], 0.95) * 1000, 3),
+            "max_ms": round(s["max"] * 1000, 3),
+            "fields": s["fields"],
+        })
+    collected = {}
+    for name, fn in _collectors.items():
+        try:
+            collected[name] = fn()
+        except Exception as e:  # a broken collector must not break the snapshot
+            collected[name] = {"error": str(e)}
+    return {
+        "enabled": ENABLED,
+        "generated_at": time.time(),
+        "spans": spans,
+        "counters": [{"name": n, "labels": dict(l), "value": v} for (n, l), v in sorted(counters)],
+        "collectors": collected,
+    }
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _prom_labels(labels: dict, **extra) -> str:
+    items = {**labels, **extra}
+    if not items:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in items.items()) + "}"
+
+def prometheus_text(snap: dict | None = None) -> str:
+    """
+    Render a snapshot in the Prometheus text exposition format.
+    """
+    snap = snap or snapshot()
+    lines = ["# TYPE hauler_span_seconds summary"]
+    for s in snap["spans"]:
+        labels = dict(s["labels"], span=s["name"])
+        lines.append(f"hauler_span_seconds{_prom_labels(labels, quantile='0.5')} {round(s['p50_ms'] / 1000, 6)}")
+        lines.append(f"hauler_span_seconds{_prom_labels(labels, quantile='0.95')} {round(s['p95_ms'] / 1000, 6)}")
+        lines.append(f"hauler_span_seconds_sum{_prom_labels(labels)} {round(s['total_ms'] / 1000, 6)}")
+        lines.append(f"hauler_span_seconds_count{_prom_labels(labels)} {s['count']}")
+    lines.append("# TYPE hauler_span_field_total counter")
+    for s in snap["spans"]:
+        for field, value in s["fields"].items():
+            lines.append(f"hauler_span_field_total{_prom_labels(dict(s['labels'], span=s['name'], field=field))} {value}")
+    lines.append("# TYPE hauler_events_total counter")
+    for c in snap["counters"]:
+        lines.append(f"hauler_events_total{_prom_labels(dict(c['labels'], event=c['name']))} {c['value']}")
+    for name, values in snap["collectors"].items():
+        for k, v in values.items():
+            if isinstance(v, (int, float)) and not isinstance(v, bool):
+                lines.append(f"hauler_{name}_{k} {v}")
+    return "\n".join(lines) + "\n"
+
+def write_snapshot(path: str = SNAPSHOT_PATH):
+    """
+    Atomically write the current snapshot; `.prom` paths get Prometheus text, anything else JSON.
+    """
+    if not path:
+        return
+    snap = snapshot()
+    body = prometheus_text(snap) if path.endswith(".prom") else json.dumps(snap, indent=2)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(body)
+    os.replace(tmp, path)
+
+_writer_started = False
+
+def _start_writer():
+    global _writer_started
+    if _writer_started or not SNAPSHOT_PATH:
+        return
+    _writer_started = True
+
+    def loop():
+        while True:
+            time.sleep(SNAPSHOT_INTERVAL)
+            try:
+                write_snapshot(SNAPSHOT_PATH)
+            except OSError:
+                pass
+
+    threading.Thread(target=loop, name="metrics-snapshot", daemon=True).start()
+
+if ENABLED:
+    _start_writer()
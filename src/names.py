@@ -1,22 +1,43 @@
-import random
 import streamlit as st
-from src.state import new_state
+from src.state import create_room
+from src.store import get_store
 
-# Randomly generate client's name
-first_names = ["Alice", "Bob", "Charlie", "Diana", "Eve", "Timothy", "Kate", "Jane", "Kimberly", "Robert"]
-last_names  = ["Smith", "Jones", "Williams", "Brown", "Davis", "James", "Miller", "Doe", "Kim", "Garcia"]
+# Readable room names over a collision-free numeric id.
+first_names = ["Alice", "Bob", "Charlie", "Diana", "Eve", "Timothy", "Kate", "Jane", "Kimberly", "Robert",
+               "Maria", "Luis", "Grace", "Omar", "Nina", "Victor"]
+last_names  = ["Smith", "Jones", "Williams", "Brown", "Davis", "James", "Miller", "Doe", "Kim", "Garcia",
+               "Lopez", "Nguyen", "Patel", "Clark", "Young", "Reed"]
 
-# Precompute all unique combinations once per process
-_all_combos = [f"{f} {l}" for f in first_names for l in last_names]
-random.shuffle(_all_combos)
+_ID_ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"  # Crockford base32: no I, L, O, U
+
+def encode_id(room_id: int) -> str:
+    """
+    :param room_id: positive integer id
+    :return: short base32 code, e.g. 1234 -> "16J"
+    """
+    digits = ""
+    while True:
+        room_id, r = divmod(room_id, 32)
+        digits = _ID_ALPHABET[r] + digits
+        if not room_id:
+            return digits
+
+def room_name(room_id: int) -> str:
+    """
+    Readable, unique name for an id: a first/last name picked by a
+    multiplicative hash (so consecutive ids don't look alike) plus the id code.
+    :param room_id: id from the conversation store
+    :return: e.g. "Grace Patel · 16J"
+    """
+    h = (room_id * 2654435761) & 0xFFFFFFFF
+    first = first_names[h % len(first_names)]
+    last = last_names[(h // len(first_names)) % len(last_names)]
+    return f"{first} {last} · {encode_id(room_id)}"
 
 def generate_random_name():
-    if not _all_combos:
-        raise RuntimeError("No more unique names available")
-    return _all_combos.pop()
+    # O(1) and never exhausts: the store hands out each id once, across sessions and worker processes.
+    return room_name(get_store().next_id())
 
 def ensure_seed_room():
     if "current_room" not in st.session_state or not st.session_state.current_room:
-        name = generate_random_name()
-        st.session_state.conversations[name] = new_state()
-        st.session_state.current_room = name
+        create_room(generate_random_name())
@@ -0,0 +1,196 @@
+# src/prompts.py
+# Every prompt the app sends, as versioned templates. Static text (role, output
+# schema, few-shot examples) is laid out first and is byte-identical across
+# calls; the applicant's text is the last thing in the request. Providers that
+# cache prompt prefixes can then reuse everything up to the variable tail.
+import hashlib
+from dataclasses import dataclass, field
+
+MODEL = "gpt-4o-mini"
+
+@dataclass(frozen=True)
+class PromptTemplate:
+    """
+    A chat request with a static system prompt and a variable user message.
+    `version` changes with any edit to the model, text or settings, so cached
+    results keyed on it are invalidated by prompt changes.
+    """
+    name: str
+    system: str
+    tail: str = "{text}"
+    model: str = MODEL
+    temperature: float = 0.0
+    json: bool = False
+    version: str = field(init=False)
+
+    def __post_init__(self):
+        raw = "\x1f".join([self.name, self.model, self.system, self.tail, str(self.temperature), str(self.json)])
+        object.__setattr__(self, "version", hashlib.sha1(raw.encode("utf-8")).hexdigest()[:12])
+
+    def request(self, **values) -> dict:
+        """
+        :param values: fields of the tail, e.g. text=...
+        :return: kwargs for chat.completions.create
+        """
+        req = dict(
+            model=self.model,
+            temperature=self.temperature,
+            messages=[{"role": "system", "content": self.system},
+                      {"role": "user", "content": self.tail.format(**values)}],
+        )
+        if self.json:
+            req["response_format"] = {"type": "json_object"}
+        return req
+
+# --------- classify ---------
+
+CLASSIFY_SYSTEM = (
+    "You extract structured answers from applicants for a truck driving role. "
+    "Return ONLY valid JSON with keys: "
+    '{"answer_type": one of ["affirmative","negative","number","unknown","other"], '
+    '"number_value": integer or null, "reason": short string}. Be strict JSON (no prose).'
+)
+
+_GENERIC_EXAMPLES = [
+    ("yep I have it", "affirmative", None, "yes cdl"),
+    ("nope", "negative", None, "no"),
+    ("about 3 years", "number", 3, "3 years"),
+    ("a while", "unknown", None, "vague"),
+]
+# Few-shot examples per question; the shared schema above stays the common prefix of all of them.
+CLASSIFY_EXAMPLES = {
+    "generic": _GENERIC_EXAMPLES,
+    "consent_boolean": [
+        ("sure, go ahead", "affirmative", None, "agrees"),
+        ("nope", "negative", None, "no"),
+        ("what is this for?", "other", None, "question"),
+    ],
+    "cdl_boolean": [
+        ("yep I have it", "affirmative", None, "yes cdl"),
+        ("nope", "negative", None, "no"),
+        ("getting it next month", "negative", None, "no cdl yet"),
+    ],
+    "years_number": [
+        ("about 3 years", "number", 3, "3 years"),
+        ("none", "negative", None, "no experience"),
+        ("a while", "unknown", None, "vague"),
+    ],
+    "nights_boolean": [
+        ("that works", "affirmative", None, "ok with nights"),
+        ("nope", "negative", None, "no"),
+        ("depends", "unknown", None, "vague"),
+    ],
+}
+
+def _examples(rows) -> str:
+    lines = []
+    for text, answer_type, number, reason in rows:
+        out = '{"answer_type":"%s","number_value":%s,"reason":"%s"}' % (
+            answer_type, "null" if number is None else number, reason)
+        lines.append(f'User: "{text}" -> {out}')
+    return "\n".join(lines)
+
+CLASSIFY = {
+    intent: PromptTemplate(
+        name=f"classify.{intent}",
+        system=f"{CLASSIFY_SYSTEM}\nExamples:\n{_examples(rows)}",
+        tail="Current question intent: {intent}.\nApplicant said: {text}",
+        json=True,
+    )
+    for intent, rows in CLASSIFY_EXAMPLES.items()
+}
+
+def classify_template(intent_hint: str) -> PromptTemplate:
+    """
+    :param intent_hint: question intent; unknown ones use the generic examples
+    :return: the classify template for it
+    """
+    return CLASSIFY.get(intent_hint, CLASSIFY["generic"])
+
+CLASSIFY_PACKED = PromptTemplate(
+    name="classify.packed",
+    system=CLASSIFY_SYSTEM.replace(
+        "Return ONLY valid JSON with keys: ",
+        'You will receive a JSON list of {"id", "intent", "text"} items. '
+        'Return ONLY valid JSON of the form {"results": [{"id": ..., plus the keys below}, ...]} '
+        "with one result per item, each with keys: ",
+    ) + f"\nExamples:\n{_examples(_GENERIC_EXAMPLES)}",
+    tail="{items}",
+    json=True,
+)
+
+# --------- topic check and answers ---------
+
+# Q&A requests carry the conversation context (src/context.py) ahead of the
+# question; it is empty for a first question with nothing screened yet.
+QUESTION_MARKER = "Current question: "
+QA_TAIL = "{context}" + QUESTION_MARKER + "{text}"
+_CONTEXT_NOTE = (
+    " The message may start with what is known about the applicant and the earlier conversation; "
+    "use them only to understand the current question."
+)
+
+TRUCK_TOPIC = PromptTemplate(
+    name="truck_topic",
+    system=(
+        "You are a binary classifier. Return exactly 'truck' if the user's message is about a truck driving job "
+        "or company/job details (requirements, pay/compensation, location/where the job is based, schedule/home time, "
+        "days off/PTO/vacation, benefits, routes/lanes, equipment, policies, HOS/DOT, CDL, endorsements, etc.). "
+        "Otherwise return exactly 'other'."
+    ) + _CONTEXT_NOTE,
+    tail=QA_TAIL,
+)
+
+ANSWER = PromptTemplate(
+    name="answer",
+    system=(
+        "You are the Happy Hauler recruiting assistant. Be concise, factual, and friendly. "
+        "If asked about pay, respond with: 'The pay range is 60 to 65 cents per mile based on experience.' "
+        "If you don't have a specific fact, say the recruiter can provide details. "
+        "Avoid making up benefits or policies not provided. Keep answers to 1–3 short sentences."
+    ),
+    temperature=0.2,
+)
+
+ANYTOPIC_SYSTEM = (
+    "You are the Happy Hauler recruiting assistant. "
+    "Be concise, factual, and friendly. "
+    "If the user asks about pay, the exact line to use is: "
+    "'The pay range is 60 to 65 cents per mile based on experience.' "
+    "If you don't have a specific fact, say the recruiter can provide details. "
+    "Avoid inventing policies. Keep answers to 1–3 short sentences. "
+    "If the user's question is unrelated to the truck driving role or the company/job details, "
+    "still provide a brief, polite response, and do not encourage follow-up in chat; instead, they should email."
+) + _CONTEXT_NOTE
+_TOPICS = (
+    "(requirements, pay/compensation, location/where the job is based, schedule/home time, "
+    "days off/PTO/vacation, benefits, routes/lanes, equipment, policies, HOS/DOT, CDL, endorsements, etc.)"
+)
+
+ANSWER_ANYTOPIC = PromptTemplate(name="answer.anytopic", system=ANYTOPIC_SYSTEM, tail=QA_TAIL, temperature=0.2)
+
+ANSWER_FUSED = PromptTemplate(
+    name="answer.fused",
+    system=ANYTOPIC_SYSTEM + (
+        f" Also decide whether the message is about a truck driving job or company/job details {_TOPICS}. "
+        'Return ONLY valid JSON: {"on_topic": true or false, "answer": string}.'
+    ),
+    tail=QA_TAIL,
+    temperature=0.2,
+    json=True,
+)
+
+# Streaming: the reply starts with the topic tag, so answer tokens can be shown as soon as it is read.
+STREAM_TAG_ON, STREAM_TAG_OFF = "TRUCK|", "OTHER|"
+ANSWER_STREAM_FUSED = PromptTemplate(
+    name="answer.stream_fused",
+    system=ANYTOPIC_SYSTEM + (
+        f" Start your reply with exactly '{STREAM_TAG_ON}' if the message is about a truck driving job or "
+        f"company/job details {_TOPICS}, otherwise with exactly '{STREAM_TAG_OFF}'; then write the answer."
+    ),
+    tail=QA_TAIL,
+    temperature=0.2,
+)
+
+TEMPLATES = [*CLASSIFY.values(), CLASSIFY_PACKED, TRUCK_TOPIC, ANSWER, ANSWER_ANYTOPIC, ANSWER_FUSED,
+             ANSWER_STREAM_FUSED]
@@ -0,0 +1,40 @@
+# src/rescore.py
+# Re-score stored applicant replies after a classify() prompt change.
+# Run: python -m src.rescore replies.jsonl -o rescored.jsonl --concurrency 16 --pack 10
+import sys
+import json
+import argparse
+from contextlib import nullcontext
+
+from .llm import classify_batch, tier_stats
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Classify JSONL replies ({\"text\": ..., \"intent\": ...} per line) "
+                    "and write each line back with a \"result\" field, in input order."
+    )
+    parser.add_argument("input", help="input JSONL file, or - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="output JSONL file (default stdout)")
+    parser.add_argument("--concurrency", type=int, default=8, help="max in-flight LLM requests")
+    parser.add_argument("--pack", type=int, default=1, help="utterances per JSON-mode request")
+    args = parser.parse_args(argv)
+
+    src = nullcontext(sys.stdin) if args.input == "-" else open(args.input, encoding="utf-8")
+    with src as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+
+    dst = nullcontext(sys.stdout) if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    items = ((row.get("text", ""), row.get("intent", "generic")) for row in rows)
+    errors = 0
+    with dst as out:
+        for row, result in zip(rows, classify_batch(items, concurrency=args.concurrency, pack=args.pack)):
+            # Rows the model could not re-score carry result["error"]; the run keeps going.
+            errors += "error" in result
+            row["result"] = result
+            out.write(json.dumps(row, ensure_ascii=False) + "\n")
+            out.flush()
+    print(json.dumps({"rows": len(rows), "errors": errors, "tiers": tier_stats()}), file=sys.stderr)
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,273 @@
+# src/resilience.py
+# Bounded model calls: a per-turn deadline, a per-attempt timeout, jittered
+# retries that never outlive the deadline, and one circuit breaker shared by
+# every session in the process. Callers catch Unavailable and fall back to the
+# offline heuristics.
+#
+#   LLM_TURN_BUDGET=8          seconds one applicant turn may spend waiting on the model
+#   LLM_CALL_TIMEOUT=4         seconds per attempt (also the budget of calls made outside a turn)
+#   LLM_RETRIES=2              extra attempts after a timeout, connection error, 429 or 5xx
+#   LLM_BREAKER_FAILURES=5     consecutive failures that open the breaker
+#   LLM_BREAKER_COOLDOWN=30    seconds the breaker stays open before one probe is let through
+import os
+import time
+import random
+import asyncio
+import threading
+import contextvars
+from contextlib import contextmanager
+from functools import lru_cache
+from . import metrics
+
+TURN_BUDGET = float(os.getenv("LLM_TURN_BUDGET", "8"))
+CALL_TIMEOUT = float(os.getenv("LLM_CALL_TIMEOUT", "4"))
+RETRIES = int(os.getenv("LLM_RETRIES", "2"))
+BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+BREAKER_COOLDOWN = float(os.getenv("LLM_BREAKER_COOLDOWN", "30"))
+BACKOFF_BASE = 0.25  # seconds before the first retry, doubled per attempt
+MIN_ATTEMPT = 0.25   # never start an attempt with less time than this left
+
+# The SDK's exception types are looked up on first failure, so processes that
+# never reach the model never import openai.
+@lru_cache(maxsize=None)
+def retryable_errors() -> tuple:
+    """
+    :return: errors worth another attempt: timeouts, connection errors, 429 and 5xx
+    """
+    import openai
+    return openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError
+
+@lru_cache(maxsize=None)
+def api_errors() -> tuple:
+    """
+    :return: any SDK or transport error, including ones raised while reading a stream
+    """
+    import httpx
+    import openai
+    return openai.APIError, httpx.HTTPError
+
+class Unavailable(Exception):
+    """
+    The model could not answer within the budget: deadline spent, breaker open,
+    retries exhausted or a non-retryable API error. `reason` says which.
+    """
+
+    def __init__(self, reason: str, purpose: str):
+        super().__init__(f"LLM unavailable for {purpose}: {reason}")
+        self.reason = reason
+        self.purpose = purpose
+
+# --------- Turn deadline ---------
+
+_deadline = contextvars.ContextVar("llm_deadline", default=None)
+
+@contextmanager
+def turn_budget(seconds: float | None = None):
+    """
+    Bound every model call inside the block by one shared deadline.
+    Nested budgets never extend an outer one. asyncio tasks started inside
+    the block inherit it.
+    :param seconds: budget; defaults to LLM_TURN_BUDGET
+    """
+    deadline = time.monotonic() + (TURN_BUDGET if seconds is None else seconds)
+    outer = _deadline.get()
+    token = _deadline.set(deadline if outer is None else min(outer, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def current_deadline() -> float | None:
+    """
+    :return: monotonic deadline of the enclosing turn, or None outside one
+    """
+    return _deadline.get()
+
+def _time_left(deadline: float | None) -> float:
+    return CALL_TIMEOUT if deadline is None else deadline - time.monotonic()
+
+# --------- Circuit breaker ---------
+
+class CircuitBreaker:
+    """
+    closed -> open after `failures` consecutive failures; open -> half_open once
+    `cooldown` has passed, letting a single probe through; the probe's outcome
+    closes or re-opens it. Thread-safe; also used from event loops.
+    """
+
+    def __init__(self, failures: int = BREAKER_FAILURES, cooldown: float = BREAKER_COOLDOWN):
+        self.threshold = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._stats = {"opened": 0, "rejected": 0}
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == "closed":
+                return True
+            if self.state == "open" and time.monotonic() - self._opened_at >= self.cooldown:
+                self.state = "half_open"
+            if self.state == "half_open" and not self._probing:
+                self._probing = True
+                return True
+            self._stats["rejected"] += 1
+            return False
+
+    def success(self):
+        with self._lock:
+            self.state = "closed"
+            self._failures = 0
+            self._probing = False
+
+    def failure(self):
+        with self._lock:
+            self._failures += 1
+            self._probing = False
+            if self.state == "half_open" or (self.state == "closed" and self._failures >= self.threshold):
+                self.state = "open"
+                self._opened_at = time.monotonic()
+                self._stats["opened"] += 1
+
+    def abandon(self):
+        """
+        Release a half-open probe that ended without an answer either way (an
+        unexpected exception, a cancelled task), so the next call can probe.
+        """
+        with self._lock:
+            self._probing = False
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "open": int(self.state == "open"),
+                "half_open": int(self.state == "half_open"),
+                "consecutive_failures": self._failures,
+                **self._stats,
+            }
+
+BREAKER = CircuitBreaker()
+
+# --------- Bounded calls ---------
+
+_stats_lock = threading.Lock()
+_unavailable = {"budget": 0, "breaker_open": 0, "retries": 0, "error": 0, "stream": 0}
+_retries = 0
+
+def _give_up(reason: str, purpose: str) -> Unavailable:
+    with _stats_lock:
+        _unavailable[reason] += 1
+    metrics.incr("llm_unavailable", reason=reason, purpose=purpose)
+    return Unavailable(reason, purpose)
+
+def _backoff(attempt: int, error: Exception) -> float:
+    delay = BACKOFF_BASE * 2 ** attempt * (0.5 + random.random() / 2)
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            delay = max(delay, float(retry_after))
+        except ValueError:
+            pass
+    return delay
+
+def _retry_delay(attempt: int, error: Exception, deadline: float | None) -> float | None:
+    # None when another attempt would not fit in what is left of the budget.
+    global _retries
+    if attempt == RETRIES:
+        return None
+    delay = _backoff(attempt, error)
+    if _time_left(deadline) - delay < MIN_ATTEMPT:
+        return None
+    with _stats_lock:
+        _retries += 1
+    return delay
+
+def call(fn, purpose: str, deadline: float | None = None):
+    """
+    Run a model request under the turn deadline, the breaker and the retry policy.
+    :param fn: fn(timeout) performing one attempt with that many seconds
+    :param purpose: label for metrics
+    :param deadline: explicit deadline; defaults to the enclosing turn_budget()
+    :return: fn's result
+    :raises Unavailable: when the caller should use its offline fallback
+    """
+    deadline = current_deadline() if deadline is None else deadline
+    for attempt in range(RETRIES + 1):
+        left = _time_left(deadline)
+        if left < MIN_ATTEMPT:
+            raise _give_up("budget", purpose)
+        if not BREAKER.allow():
+            raise _give_up("breaker_open", purpose)
+        try:
+            result = fn(min(left, CALL_TIMEOUT))
+        except retryable_errors() as e:
+            BREAKER.failure()
+            delay = _retry_delay(attempt, e, deadline)
+            if delay is None:
+                raise _give_up("retries", purpose) from e
+            time.sleep(delay)
+        except api_errors() as e:
+            # The endpoint answered (bad request, auth, ...): not a reason to trip the breaker.
+            BREAKER.success()
+            raise _give_up("error", purpose) from e
+        except BaseException:
+            BREAKER.abandon()
+            raise
+        else:
+            BREAKER.success()
+            return result
+
+async def acall(fn, purpose: str, deadline: float | None = None):
+    """
+    call() for coroutines: fn(timeout) returns an awaitable.
+    """
+    deadline = current_deadline() if deadline is None else deadline
+    for attempt in range(RETRIES + 1):
+        left = _time_left(deadline)
+        if left < MIN_ATTEMPT:
+            raise _give_up("budget", purpose)
+        if not BREAKER.allow():
+            raise _give_up("breaker_open", purpose)
+        try:
+            result = await fn(min(left, CALL_TIMEOUT))
+        except retryable_errors() as e:
+            BREAKER.failure()
+            delay = _retry_delay(attempt, e, deadline)
+            if delay is None:
+                raise _give_up("retries", purpose) from e
+            await asyncio.sleep(delay)
+        except api_errors() as e:
+            BREAKER.success()
+            raise _give_up("error", purpose) from e
+        except BaseException:  # includes asyncio.CancelledError
+            BREAKER.abandon()
+            raise
+        else:
+            BREAKER.success()
+            return result
+
+def stream_failed(purpose: str, reason: str = "stream") -> Unavailable:
+    """
+    Record a streamed response that broke off after it started.
+    :param reason: "stream" when the endpoint failed, "budget" when the turn deadline
+                   passed mid-stream (like call(), not held against the breaker)
+    :return: Unavailable to raise from the stream
+    """
+    if reason == "stream":
+        BREAKER.failure()
+    return _give_up(reason, purpose)
+
+def resilience_stats() -> dict:
+    """
+    Breaker state plus how often model calls were retried or abandoned for a fallback.
+    :return: flat dict of counters
+    """
+    with _stats_lock:
+        stats = {f"unavailable_{k}": v for k, v in _unavailable.items()}
+        stats["retries"] = _retries
+        stats["fallbacks"] = sum(_unavailable.values())
+    return {**BREAKER.snapshot(), **stats}
@@ -0,0 +1,292 @@
+# src/server.py
+# Run: python -m src.server --host 0.0.0.0 --port 8080
+#
+# JSON/webhook channel for the screening flow (SMS gateways, other front ends).
+# One asyncio worker serves many conversations at once: model calls are awaited
+# on the shared AsyncOpenAI pool, so a turn waiting on the LLM costs no thread.
+#
+#   POST /conversations/<id>/messages  {"text": "..."}  -> {"replies": [...], "state": {...}, "done": bool}
+#                                       (the first message to a new id starts the chat and returns the greeting
+#                                       plus a "token"; every later request for it needs
+#                                       "Authorization: Bearer <token>")
+#   GET  /conversations/<id>           state and history
+#   GET  /healthz
+#   GET  /stats, GET /metrics (Prometheus text): loopback clients, or "Authorization: Bearer <ADMIN_TOKEN>"
+#
+#   SERVER_MAX_INFLIGHT=256   turns processed at once; beyond that requests get 503 + Retry-After
+#   SERVER_MAX_BODY=16384     request body limit in bytes
+#   SERVER_READ_TIMEOUT=30    seconds to wait for a request on an open connection
+#   ADMIN_TOKEN               opens /stats and /metrics to remote clients (the app's recruiter view uses it too)
+import os
+import re
+import hmac
+import json
+import asyncio
+import hashlib
+import secrets
+import argparse
+import weakref
+import ipaddress
+
+from .engine import ScreeningEngine, ConversationState
+from .store import get_store
+from .llm import connection_stats
+from . import metrics
+
+MAX_INFLIGHT = int(os.getenv("SERVER_MAX_INFLIGHT", "256"))
+MAX_BODY = int(os.getenv("SERVER_MAX_BODY", "16384"))
+READ_TIMEOUT = float(os.getenv("SERVER_READ_TIMEOUT", "30"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+MAX_TEXT = 2000  # characters of applicant text passed to the models
+MAX_HEADERS = 64
+MAX_HEADER_BYTES = 16384  # request line plus headers
+
+_REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 403: "Forbidden", 404: "Not Found",
+            405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+            431: "Request Header Fields Too Large", 503: "Service Unavailable"}
+_ROUTE = re.compile(r"^/conversations/([A-Za-z0-9_.:+@-]{1,128})(/messages)?/?$")
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str, headers: dict | None = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+class ScreeningServer:
+    """
+    asyncio HTTP/1.1 front end over ScreeningEngine.astep().
+    Turns for the same conversation run one at a time; turns for different
+    conversations overlap, up to max_inflight, after which new turns are
+    rejected with 503 instead of queueing without bound.
+    """
+
+    def __init__(self, engine: ScreeningEngine | None = None, store=None, max_inflight: int = MAX_INFLIGHT):
+        self.engine = engine or ScreeningEngine()
+        self.store = store or get_store()
+        self.max_inflight = max_inflight
+        self.inflight = 0
+        self.stats = {"turns": 0, "rejected": 0, "errors": 0, "peak_inflight": 0, "open_connections": 0}
+        self._locks = weakref.WeakValueDictionary()  # conversation id -> asyncio.Lock while in use
+
+    # --------- HTTP plumbing ---------
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.stats["open_connections"] += 1
+        peer = writer.get_extra_info("peername")
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), READ_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    return
+                except HttpError as e:
+                    await self._respond(writer, e.status, {"error": str(e)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                try:
+                    status, payload, extra = 200, await self.route(method, path, body, headers, peer), {}
+                except HttpError as e:
+                    status, payload, extra = e.status, {"error": str(e)}, e.headers
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    status, payload, extra = 500, {"error": type(e).__name__}, {}
+                await self._respond(writer, status, payload, keep_alive, extra)
+                if not keep_alive:
+                    return
+        finally:
+            self.stats["open_connections"] -= 1
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await _readline(reader)
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "malformed request line")
+        headers, size = {}, len(line)
+        while True:
+            raw = await _readline(reader)
+            if raw in (b"\r\n", b"\n", b""):
+                break
+            size += len(raw)
+            if len(headers) >= MAX_HEADERS or size > MAX_HEADER_BYTES:
+                raise HttpError(431, f"more than {MAX_HEADERS} headers or {MAX_HEADER_BYTES} header bytes")
+            name, _, value = raw.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length") or 0)
+        except ValueError:
+            raise HttpError(400, "bad Content-Length")
+        if length > MAX_BODY:
+            raise HttpError(413, f"body over {MAX_BODY} bytes")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    async def _respond(self, writer, status: int, payload, keep_alive: bool = True, headers: dict | None = None):
+        if isinstance(payload, str):
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        head = [f"HTTP/1.1 {status} {_REASONS.get(status, 'Internal Server Error')}",
+                f"Content-Type: {content_type}",
+                f"Content-Length: {len(body)}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        head += [f"{k}: {v}" for k, v in (headers or {}).items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+    # --------- Routes ---------
+
+    async def route(self, method: str, path: str, body: bytes, headers: dict | None = None, peer=None):
+        token = _bearer(headers or {})
+        if path == "/healthz":
+            return {"ok": True}
+        if path in ("/stats", "/metrics"):
+            if not _is_loopback(peer) and not (ADMIN_TOKEN and token and hmac.compare_digest(token, ADMIN_TOKEN)):
+                raise HttpError(403, "admin token required")
+            return self.snapshot() if path == "/stats" else metrics.prometheus_text()
+        m = _ROUTE.match(path)
+        if not m:
+            raise HttpError(404, "not found")
+        conversation_id, messages = m.group(1), m.group(2)
+        if messages and method == "POST":
+            return await self.post_message(conversation_id, _text_of(body), token)
+        if not messages and method == "GET":
+            return await self.get_conversation(conversation_id, token)
+        raise HttpError(405, "method not allowed")
+
+    def snapshot(self) -> dict:
+        return {**self.stats, "inflight": self.inflight, "max_inflight": self.max_inflight,
+                "connections": connection_stats()}
+
+    async def _authorize(self, conversation_id: str, token: str | None):
+        # Unknown ids get the same 401/403 as known ones, so callers can't probe which exist.
+        if token is None:
+            raise HttpError(401, "missing conversation token", {"WWW-Authenticate": "Bearer"})
+        expected = await asyncio.to_thread(self.store.token_hash, conversation_id)
+        # Rooms started in the Streamlit app have no token and are not reachable from this channel.
+        if expected is None or not hmac.compare_digest(_digest(token), expected):
+            raise HttpError(403, "invalid conversation token")
+
+    async def get_conversation(self, conversation_id: str, token: str | None = None) -> dict:
+        await self._authorize(conversation_id, token)
+        data = await asyncio.to_thread(self.store.load, conversation_id)
+        if data is None:
+            raise HttpError(404, "unknown conversation")
+        history = data.pop("history")
+        return {"conversation_id": conversation_id, "state": data, "history": history,
+                "done": not data["input_enabled"]}
+
+    async def post_message(self, conversation_id: str, text: str, token: str | None = None) -> dict:
+        if self.inflight >= self.max_inflight:
+            self.stats["rejected"] += 1
+            metrics.incr("server_rejected")
+            raise HttpError(503, "busy, retry shortly", {"Retry-After": "1"})
+        self.inflight += 1
+        self.stats["peak_inflight"] = max(self.stats["peak_inflight"], self.inflight)
+        try:
+            lock = self._locks.get(conversation_id)
+            if lock is None:
+                lock = self._locks[conversation_id] = asyncio.Lock()
+            async with lock:
+                with metrics.span("server_turn"):
+                    return await self._turn(conversation_id, text, token)
+        finally:
+            self.inflight -= 1
+
+    async def _turn(self, conversation_id: str, text: str, token: str | None) -> dict:
+        data = await asyncio.to_thread(self.store.load, conversation_id, False)
+        issued = None
+        if data is None:
+            # A new conversation: whatever the applicant sent just opens it, and its token is returned once.
+            state = ConversationState()
+            issued = secrets.token_urlsafe(24)
+            await asyncio.to_thread(self.store.create, conversation_id, state.to_dict(), _digest(issued))
+            replies, new = self.engine.start(state)
+        else:
+            await self._authorize(conversation_id, token)
+            state = ConversationState.from_dict(data)
+            if not state.input_enabled:
+                raise HttpError(409, "conversation has ended")
+            replies, new = await self.engine.astep(state, text)
+        self.stats["turns"] += 1
+        await asyncio.to_thread(self._save, conversation_id, text, replies, state, new)
+        result = {"conversation_id": conversation_id, "replies": replies, "state": new.to_dict(),
+                  "done": not new.input_enabled}
+        if issued is not None:
+            result["token"] = issued
+        return result
+
+    def _save(self, conversation_id: str, text: str, replies: list[str],
+              old: ConversationState, new: ConversationState):
+        self.store.append_message(conversation_id, "user", text)
+        for reply in replies:
+            self.store.append_message(conversation_id, "assistant", reply)
+        before, after = old.to_dict(), new.to_dict()
+        changed = {k: v for k, v in after.items() if before[k] != v}
+        if changed:
+            self.store.update(conversation_id, **changed)
+
+async def _readline(reader: asyncio.StreamReader) -> bytes:
+    try:
+        return await reader.readline()
+    except (ValueError, asyncio.LimitOverrunError):
+        # A line longer than the stream's buffer limit (64 KiB).
+        raise HttpError(431, "request line or header too long")
+
+def _is_loopback(peer) -> bool:
+    try:
+        return ipaddress.ip_address(peer[0]).is_loopback
+    except (TypeError, IndexError, ValueError):
+        return False
+
+def _digest(token: str) -> str:
+    # Tokens are random, so a plain hash is enough; the store never holds the token itself.
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def _bearer(headers: dict) -> str | None:
+    scheme, _, token = headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer":
+        return None
+    return token.strip() or None
+
+def _text_of(body: bytes) -> str:
+    try:
+        data = json.loads(body or b"{}")
+    except ValueError:
+        raise HttpError(400, "body must be JSON")
+    text = data.get("text") if isinstance(data, dict) else None
+    if not isinstance(text, str):
+        raise HttpError(400, 'expected {"text": "..."}')
+    return text.strip()[:MAX_TEXT]
+
+async def serve(host: str = "127.0.0.1", port: int = 8080, server: ScreeningServer | None = None):
+    """
+    Run the JSON channel until cancelled.
+    """
+    server = server or ScreeningServer()
+    metrics.register_collector("server", lambda: {k: v for k, v in server.snapshot().items()
+                                                  if not isinstance(v, dict)})
+    listener = await asyncio.start_server(server.handle, host, port, backlog=1024)
+    print(f"screening server listening on http://{host}:{listener.sockets[0].getsockname()[1]}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="asyncio JSON channel for the screening flow.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-inflight", type=int, default=MAX_INFLIGHT)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port, ScreeningServer(max_inflight=args.max_inflight)))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
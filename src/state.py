@@ -1,6 +1,12 @@
 # hauler/state.py
-import re
+import os
+import hmac
+import json
 import streamlit as st
+from .eligibility import missing_requirements
+from .store import FIELDS, get_store
+from .faq import default_faq
+from . import metrics
 
 def new_state():
     return {
@@ -11,49 +17,130 @@ def new_state():
         "nights_ok": None,
         "history": [],
         "input_enabled": True,
+        "exit_reason": None,
+        "qa_memory": None,
     }
 
+ROOMS_PER_PAGE = 20
+# Messages rendered live on every rerun; older ones are revealed HISTORY_WINDOW at a time on request.
+HISTORY_WINDOW = int(os.getenv("HISTORY_WINDOW", "40"))
+# Recruiter view (every room, metrics, FAQ review): open the app with ?admin=<ADMIN_TOKEN>. Empty disables it.
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+class StoredState(dict):
+    """
+    The open conversation. Setting a scalar field (step, has_cdl, ...) writes
+    it through to the conversation store; history is appended via say_*().
+    """
+
+    def __init__(self, room: str, data: dict):
+        super().__init__(data)
+        self.room = room
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        if key in FIELDS:
+            get_store().update(self.room, **{key: value})
+
+    def apply(self, fields: dict):
+        """
+        Write the fields that changed (e.g. an engine state's to_dict()) in one store update.
+        """
+        changed = {k: v for k, v in fields.items() if k in FIELDS and self.get(k) != v}
+        if changed:
+            super().update(changed)
+            get_store().update(self.room, **changed)
+
 def ensure_session_state():
-    if "conversations" not in st.session_state:
-        st.session_state.conversations = {}
     if "current_room" not in st.session_state:
         st.session_state.current_room = None
+    if "room_page" not in st.session_state:
+        st.session_state.room_page = 0
+    if "my_rooms" not in st.session_state:
+        st.session_state.my_rooms = []
 
-def current_state():
-    return st.session_state.conversations[st.session_state.current_room]
+def is_admin() -> bool:
+    """
+    :return: True when the page was opened with ?admin=<ADMIN_TOKEN>
+    """
+    given = st.query_params.get("admin", "")
+    return bool(ADMIN_TOKEN) and hmac.compare_digest(given.encode("utf-8"), ADMIN_TOKEN.encode("utf-8"))
 
-def say_assistant(text: str):
-    current_state()["history"].append({"role": "assistant", "content": text})
+def owns_room(name: str | None) -> bool:
+    """
+    :return: True when this browser session created the room (only its owner can type into it)
+    """
+    return name in st.session_state.get("my_rooms", ())
 
-def say_user(text: str):
-    current_state()["history"].append({"role": "user", "content": text})
+def create_room(name: str):
+    get_store().create(name, new_state())
+    st.session_state.my_rooms.append(name)
+    open_room(name)
+
+def open_room(name: str):
+    # Only the open room's history is held in the session; it is loaded on first access.
+    if not owns_room(name) and not is_admin():
+        return
+    st.session_state.current_room = name
+    st.session_state.pop("conversation", None)
+    st.session_state.history_shown = 0
+
+def current_state():
+    room = st.session_state.current_room
+    conv = st.session_state.get("conversation")
+    if conv is None or conv.room != room:
+        data = get_store().load(room)
+        if data is None:
+            data = new_state()
+            get_store().create(room, data)
+        conv = StoredState(room, data)
+        st.session_state.conversation = conv
+    return conv
 
-def is_negative(user_text: str) -> bool:
+def list_rooms(page: int, page_size: int = ROOMS_PER_PAGE, everyone: bool = False) -> tuple[list[dict], int]:
     """
-    Determine the tone of user's text
-    :param user_text: user text
-    :return: true if user has no more question false otherwise
+    One page of rooms for the sidebar, newest first.
+    :param page: zero-based page number
+    :param page_size: rooms per page
+    :param everyone: every stored room (recruiter view) instead of this session's own
+    :return: (room rows with room/step/outcome, total number of rooms)
     """
-    t = (user_text or "").strip().lower()
-    negative_terms = [
-        "no", "nope", "nah", "not really", "i'm good", "im good", "all good",
-        "no questions", "no question", "nothing", "that's all", "thats all", "i'm fine", "im fine",
-        "no thanks", "no thank you"
-    ]
-    return any(term in t for term in negative_terms)
+    store = get_store()
+    rooms = None if everyone else st.session_state.my_rooms
+    return store.list_rooms(offset=page * page_size, limit=page_size, rooms=rooms), store.count_rooms(rooms=rooms)
 
-def mentions_no_experience(user_text: str) -> bool:
+def _say(role: str, text: str):
+    state = current_state()
+    state["history"].append({"role": role, "content": text})
+    get_store().append_message(state.room, role, text)
+
+def say_assistant(text: str):
+    _say("assistant", text)
+
+def say_user(text: str):
+    _say("user", text)
+
+def render_history(history: list[dict], window: int | None = None):
     """
-    Determine what user responded regarding trucking experience.
-    :param user_text: user text
-    :return: true if user has no experience false otherwise
+    Render the tail of the conversation. Only the last `window` messages (plus
+    any earlier pages the user asked for) are rebuilt on a rerun, so rerun cost
+    stays flat however long the chat gets.
+    :param history: message dicts with role and content
+    :param window: messages shown live (default HISTORY_WINDOW)
+    :return: None
     """
-    t = (user_text or "").strip().lower()
-    patterns = [
-        r"\bno experience\b", r"\bnone\b", r"\bzero\b", r"\b0\b", r"\bnever\b",
-        r"\bno exp\b", r"\bnew driver\b", r"\bno driving experience\b"
-    ]
-    return any(re.search(p, t) for p in patterns)
+    window = window or HISTORY_WINDOW
+    extra = st.session_state.get("history_shown", 0)
+    hidden = max(len(history) - window - extra, 0)
+    if hidden and st.button(f"Show earlier messages ({hidden} hidden)", key="btn_history_more", type="tertiary"):
+        st.session_state.history_shown = extra + window
+        st.rerun()
+    if extra and st.button("Hide earlier messages", key="btn_history_less", type="tertiary"):
+        st.session_state.history_shown = 0
+        st.rerun()
+    for m in history[hidden:]:
+        with st.chat_message(m["role"]):
+            st.markdown(m["content"])
 
 def render_eligibility_panel(state_dict: dict):
     """
@@ -61,14 +148,7 @@ def render_eligibility_panel(state_dict: dict):
     :param state_dict: state dictionary
     :return: None
     """
-    missing = []
-    if state_dict.get("has_cdl") is not True:
-        missing.append("a valid Class A CDL")
-    years = state_dict.get("years_experience")
-    if years is None or not isinstance(years, int) or years < 1:
-        missing.append("at least one year of truck driving experience")
-    if state_dict.get("nights_ok") is not True:
-        missing.append("availability for two nights on the road each week")
+    missing = missing_requirements(state_dict)
 
     if missing:
         bullets = "".join(f"- {m}\n" for m in missing)
@@ -77,3 +157,59 @@ def render_eligibility_panel(state_dict: dict):
         )
     else:
         st.info("You're eligible. We will reach out to you soon.")
+
+def render_metrics_panel():
+    """
+    Recruiter-only metrics view for the sidebar (open the app with ?admin=<ADMIN_TOKEN>)
+    :return: None
+    """
+    with st.expander("📈 Metrics", expanded=False):
+        if not metrics.ENABLED:
+            st.caption("Metrics are off. Set METRICS_ENABLED=1 or enable them for this process.")
+            if st.button("Enable metrics", key="btn_enable_metrics"):
+                metrics.enable()
+                st.rerun()
+            return
+        snap = metrics.snapshot()
+        st.dataframe(
+            [{"span": s["name"], **s["labels"], "count": s["count"], "p50 ms": s["p50_ms"],
+              "p95 ms": s["p95_ms"], "max ms": s["max_ms"], **s["fields"]} for s in snap["spans"]],
+            hide_index=True,
+        )
+        st.dataframe(
+            [{"event": c["name"], **c["labels"], "count": c["value"]} for c in snap["counters"]],
+            hide_index=True,
+        )
+        st.json(snap["collectors"], expanded=False)
+        st.download_button("Download JSON", data=json.dumps(snap, indent=2), file_name="metrics.json")
+        st.download_button("Download Prometheus", data=metrics.prometheus_text(snap), file_name="metrics.prom")
+
+def render_faq_panel():
+    """
+    Recruiter-only review of LLM answers queued for the FAQ base (open the app with ?admin=<ADMIN_TOKEN>)
+    :return: None
+    """
+    faq = default_faq()
+    with st.expander("📚 FAQ", expanded=False):
+        stats = faq.snapshot()
+        st.caption(f"{stats['hits']}/{stats['lookups']} questions answered locally · "
+                   f"~{stats['estimated_seconds_saved']} s of model time saved")
+        if not faq.db_path:
+            st.caption("Learned entries are off (FAQ_DB_PATH is empty).")
+            return
+        for entry in faq.entries("pending", limit=10):
+            st.markdown(f"**{entry['question']}**")
+            answer = st.text_area("Answer", entry["answer"], key=f"faq_answer_{entry['id']}",
+                                  label_visibility="collapsed")
+            approve, reject = st.columns(2)
+            if approve.button("Approve", key=f"btn_faq_approve_{entry['id']}"):
+                faq.set_status(entry["id"], "approved", answer)
+                st.rerun()
+            if reject.button("Reject", key=f"btn_faq_reject_{entry['id']}"):
+                faq.set_status(entry["id"], "rejected")
+                st.rerun()
+        with st.form("faq_add", clear_on_submit=True):
+            question = st.text_input("Question")
+            answer = st.text_area("Answer")
+            if st.form_submit_button("Add entry") and question.strip() and answer.strip():
+                faq.add(question, answer)
@@ -0,0 +1,397 @@
+# src/store.py
+# Conversation persistence behind the state helpers.
+#   CONVERSATION_STORE=sqlite:///.data/conversations.sqlite3   (default)
+#   CONVERSATION_STORE=memory                                  (per-process, for local dev)
+import os
+import time
+import sqlite3
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Collection
+
+from . import eligibility
+
+STORE_URL = os.getenv("CONVERSATION_STORE", "sqlite:///.data/conversations.sqlite3")
+
+# Scalar state fields persisted as indexed columns; "history" lives in the message log.
+FIELDS = ("step", "has_greeted", "has_cdl", "years_experience", "nights_ok", "input_enabled", "exit_reason",
+          "qa_memory")
+
+class ConversationStore(ABC):
+    """
+    Interface for conversation backends. A conversation is its scalar FIELDS
+    plus an append-only message log; rooms are listed newest first.
+    """
+
+    @abstractmethod
+    def create(self, room: str, state: dict, token_hash: str | None = None):
+        """
+        :param token_hash: digest of the room's access token (JSON channel); None for rooms without one
+        """
+
+    @abstractmethod
+    def token_hash(self, room: str) -> str | None:
+        """
+        :return: the token digest given to create(), or None
+        """
+
+    @abstractmethod
+    def load(self, room: str, with_history: bool = True) -> dict | None:
+        ...
+
+    @abstractmethod
+    def update(self, room: str, **fields):
+        ...
+
+    @abstractmethod
+    def append_message(self, room: str, role: str, content: str):
+        ...
+
+    @abstractmethod
+    def next_id(self) -> int:
+        """
+        :return: a new positive integer, never handed out before by this store (room name allocation)
+        """
+
+    @abstractmethod
+    def list_rooms(self, offset: int = 0, limit: int = 20, step: str | None = None,
+                   outcome: str | None = None, rooms: Collection[str] | None = None) -> list[dict]:
+        """
+        :param rooms: only these rooms (a session's own chats); None lists every room
+        """
+
+    @abstractmethod
+    def count_rooms(self, step: str | None = None, outcome: str | None = None,
+                    rooms: Collection[str] | None = None) -> int:
+        ...
+
+    @abstractmethod
+    def iter_rows(self, since: float | None = None, batch: int = 5000):
+        """
+        Stream conversation rows (FIELDS plus room, outcome, message_count,
+        created_at, updated_at) in updated_at order, without their messages.
+        :param since: only rows with updated_at >= since
+        :param batch: rows fetched per round trip
+        :return: iterator of row dicts
+        """
+
+class MemoryStore(ConversationStore):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rows = {}
+        self._messages = {}
+        self._tokens = {}
+        self._ids = itertools.count(1)  # next() on a count is atomic under the GIL
+
+    def create(self, room: str, state: dict, token_hash: str | None = None):
+        now = time.time()
+        row = {k: state.get(k) for k in FIELDS}
+        row.update(room=room, outcome=eligibility.outcome(row), message_count=0, created_at=now, updated_at=now)
+        with self._lock:
+            self._rows[room] = row
+            self._messages[room] = []
+            if token_hash is not None:
+                self._tokens[room] = token_hash
+        for m in state.get("history", []):
+            self.append_message(room, m["role"], m["content"])
+
+    def token_hash(self, room: str) -> str | None:
+        with self._lock:
+            return self._tokens.get(room)
+
+    def load(self, room: str, with_history: bool = True) -> dict | None:
+        with self._lock:
+            row = self._rows.get(room)
+            if row is None:
+                return None
+            state = {k: row[k] for k in FIELDS}
+            if with_history:
+                state["history"] = [dict(m) for m in self._messages[room]]
+        return state
+
+    def update(self, room: str, **fields):
+        with self._lock:
+            row = self._rows[room]
+            row.update({k: v for k, v in fields.items() if k in FIELDS})
+            row["outcome"] = eligibility.outcome(row)
+            row["updated_at"] = time.time()
+
+    def append_message(self, room: str, role: str, content: str):
+        with self._lock:
+            self._messages[room].append({"role": role, "content": content})
+            row = self._rows[room]
+            row["message_count"] += 1
+            row["updated_at"] = time.time()
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+    def _filtered(self, step, outcome, rooms):
+        candidates = self._rows.values() if rooms is None else [self._rows[r] for r in rooms if r in self._rows]
+        return [r for r in candidates
+                if (step is None or r["step"] == step) and (outcome is None or r["outcome"] == outcome)]
+
+    def list_rooms(self, offset=0, limit=20, step=None, outcome=None, rooms=None):
+        with self._lock:
+            rows = sorted(self._filtered(step, outcome, rooms), key=lambda r: r["created_at"], reverse=True)
+            return [dict(r) for r in rows[offset:offset + limit]]
+
+    def count_rooms(self, step=None, outcome=None, rooms=None):
+        with self._lock:
+            return len(self._filtered(step, outcome, rooms))
+
+    def iter_rows(self, since=None, batch=5000):
+        with self._lock:
+            rows = [dict(r) for r in self._rows.values() if since is None or r["updated_at"] >= since]
+        return iter(sorted(rows, key=lambda r: r["updated_at"]))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    room TEXT PRIMARY KEY,
+    step TEXT NOT NULL,
+    has_greeted INTEGER NOT NULL DEFAULT 0,
+    has_cdl INTEGER,
+    years_experience INTEGER,
+    nights_ok INTEGER,
+    input_enabled INTEGER NOT NULL DEFAULT 1,
+    exit_reason TEXT,
+    qa_memory TEXT,
+    outcome TEXT NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS conversations_step ON conversations(step);
+CREATE INDEX IF NOT EXISTS conversations_outcome ON conversations(outcome);
+CREATE INDEX IF NOT EXISTS conversations_created ON conversations(created_at);
+CREATE INDEX IF NOT EXISTS conversations_updated ON conversations(updated_at);
+CREATE TABLE IF NOT EXISTS messages (
+    room TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    content TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    PRIMARY KEY (room, seq)
+);
+CREATE TABLE IF NOT EXISTS room_ids (id INTEGER PRIMARY KEY AUTOINCREMENT);
+CREATE TABLE IF NOT EXISTS room_tokens (room TEXT PRIMARY KEY, token_hash TEXT NOT NULL);
+"""
+
+# Columns added after the first release, for stores created before them.
+_ADDED_COLUMNS = {"exit_reason": "TEXT", "qa_memory": "TEXT"}
+
+# Room ids reserved per write to the shared sequence (see SQLiteStore.next_id).
+ID_BLOCK = 100
+
+_BOOL_FIELDS = ("has_greeted", "has_cdl", "nights_ok", "input_enabled")
+
+def _to_db(key: str, value):
+    return int(value) if key in _BOOL_FIELDS and value is not None else value
+
+def _from_db(key: str, value):
+    return bool(value) if key in _BOOL_FIELDS and value is not None else value
+
+class SQLiteStore(ConversationStore):
+    """
+    SQLite backend: one row per conversation with indexed step/outcome, and
+    an append-only messages table keyed by (room, seq). WAL mode lets several
+    Streamlit worker processes share the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        self._ids = iter(())
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        db = self._db()
+        db.executescript(_SCHEMA)
+        existing = {r["name"] for r in db.execute("PRAGMA table_info(conversations)")}
+        for column, decl in _ADDED_COLUMNS.items():
+            if column not in existing:
+                try:
+                    db.execute(f"ALTER TABLE conversations ADD COLUMN {column} {decl}")
+                except sqlite3.OperationalError:
+                    pass  # another process added it first
+
+    def _db(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def create(self, room: str, state: dict, token_hash: str | None = None):
+        now = time.time()
+        row = {k: state.get(k) for k in FIELDS}
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                f"INSERT INTO conversations (room, {', '.join(FIELDS)}, outcome, message_count, created_at, updated_at)"
+                f" VALUES (?, {', '.join('?' for _ in FIELDS)}, ?, ?, ?, ?)",
+                (room, *(_to_db(k, row[k]) for k in FIELDS), eligibility.outcome(row),
+                 len(state.get("history", [])), now, now),
+            )
+            db.executemany(
+                "INSERT INTO messages (room, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(room, i, m["role"], m["content"], now) for i, m in enumerate(state.get("history", []))],
+            )
+            if token_hash is not None:
+                # A table of its own, so room listings and exports never carry it.
+                db.execute("INSERT INTO room_tokens (room, token_hash) VALUES (?, ?)", (room, token_hash))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def token_hash(self, room: str) -> str | None:
+        row = self._db().execute("SELECT token_hash FROM room_tokens WHERE room = ?", (room,)).fetchone()
+        return row[0] if row else None
+
+    def load(self, room: str, with_history: bool = True) -> dict | None:
+        db = self._db()
+        row = db.execute(f"SELECT {', '.join(FIELDS)} FROM conversations WHERE room = ?", (room,)).fetchone()
+        if row is None:
+            return None
+        state = {k: _from_db(k, row[k]) for k in FIELDS}
+        if with_history:
+            state["history"] = [
+                {"role": r["role"], "content": r["content"]}
+                for r in db.execute("SELECT role, content FROM messages WHERE room = ? ORDER BY seq", (room,))
+            ]
+        return state
+
+    def update(self, room: str, **fields):
+        fields = {k: v for k, v in fields.items() if k in FIELDS}
+        if not fields:
+            return
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(f"SELECT {', '.join(FIELDS)} FROM conversations WHERE room = ?", (room,)).fetchone()
+            merged = {k: _from_db(k, row[k]) for k in FIELDS}
+            merged.update(fields)
+            assignments = ", ".join(f"{k} = ?" for k in fields)
+            db.execute(
+                f"UPDATE conversations SET {assignments}, outcome = ?, updated_at = ? WHERE room = ?",
+                (*(_to_db(k, v) for k, v in fields.items()), eligibility.outcome(merged), time.time(), room),
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def append_message(self, room: str, role: str, content: str):
+        now = time.time()
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            seq = db.execute("SELECT message_count FROM conversations WHERE room = ?", (room,)).fetchone()[0]
+            db.execute(
+                "INSERT INTO messages (room, seq, role, content, created_at) VALUES (?, ?, ?, ?, ?)",
+                (room, seq, role, content, now),
+            )
+            db.execute(
+                "UPDATE conversations SET message_count = ?, updated_at = ? WHERE room = ?", (seq + 1, now, room)
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+
+    def next_id(self) -> int:
+        # Ids come from blocks reserved in the shared sequence, so almost every
+        # allocation is a next() on a range iterator: atomic under the GIL, no
+        # lock and no database write. Two threads that both find the block used
+        # up each reserve one; the overwritten block's ids are simply never used.
+        while True:
+            try:
+                return next(self._ids)
+            except StopIteration:
+                self._ids = iter(self._reserve_ids())
+
+    def _reserve_ids(self) -> range:
+        # AUTOINCREMENT never reuses a value, even after the row is deleted, so the
+        # table stays empty while the sequence is shared by every worker process.
+        # Value v owns ids (v - 1) * ID_BLOCK + 1 .. v * ID_BLOCK. Sequences started
+        # before blocks handed out v itself, which is below the first new block.
+        db = self._db()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            block = db.execute("INSERT INTO room_ids DEFAULT VALUES").lastrowid
+            db.execute("DELETE FROM room_ids WHERE id = ?", (block,))
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return range((block - 1) * ID_BLOCK + 1, block * ID_BLOCK + 1)
+
+    @staticmethod
+    def _where(step, outcome, rooms) -> tuple[str, list]:
+        clauses, args = [], []
+        if rooms is not None:
+            rooms = list(rooms)
+            clauses.append(f"room IN ({', '.join('?' for _ in rooms)})" if rooms else "0")
+            args.extend(rooms)
+        if step is not None:
+            clauses.append("step = ?")
+            args.append(step)
+        if outcome is not None:
+            clauses.append("outcome = ?")
+            args.append(outcome)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+    def list_rooms(self, offset=0, limit=20, step=None, outcome=None, rooms=None):
+        where, args = self._where(step, outcome, rooms)
+        rows = self._db().execute(
+            f"SELECT * FROM conversations{where} ORDER BY created_at DESC LIMIT ? OFFSET ?", (*args, limit, offset)
+        )
+        return [{k: _from_db(k, r[k]) for k in r.keys()} for r in rows]
+
+    def count_rooms(self, step=None, outcome=None, rooms=None):
+        where, args = self._where(step, outcome, rooms)
+        return self._db().execute(f"SELECT COUNT(*) FROM conversations{where}", args).fetchone()[0]
+
+    def iter_rows(self, since=None, batch=5000):
+        # A separate connection, so a long export never holds up this thread's writes.
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.row_factory = sqlite3.Row
+        try:
+            cur = conn.execute(
+                "SELECT * FROM conversations WHERE updated_at >= ? ORDER BY updated_at",
+                (float("-inf") if since is None else since,),
+            )
+            while rows := cur.fetchmany(batch):
+                for r in rows:
+                    yield {k: _from_db(k, r[k]) for k in r.keys()}
+        finally:
+            conn.close()
+
+def open_store(url: str = STORE_URL) -> ConversationStore:
+    """
+    :param url: "memory" or "sqlite:///relative/or/absolute/path.sqlite3"
+    :return: store backend
+    """
+    if url == "memory":
+        return MemoryStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteStore(url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported CONVERSATION_STORE: {url}")
+
+_store_lock = threading.Lock()
+_store = None
+
+def get_store() -> ConversationStore:
+    """
+    Return the process-wide store configured by CONVERSATION_STORE.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = open_store()
+    return _store
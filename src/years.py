@@ -0,0 +1,247 @@
+# src/years.py
+# Deterministic parser for answers to "how many years of truck driving
+# experience do you have?". It understands digits and number words ("three",
+# "twenty-five", "a couple"), years/months/weeks/decades, halves ("a year and
+# a half"), compounds ("2 years 6 months"), ranges ("3-4 years", lower bound),
+# hedges ("almost a year", "over a decade") and calendar years ("since 2015",
+# "2012 to 2020"). Every answer comes with a confidence, so classify() can
+# settle clear answers locally and send only vague ones to the model.
+#
+#   YEARS_PARSER_THRESHOLD=0.8   minimum confidence for classify() to use the parse
+import os
+import re
+import datetime
+from typing import NamedTuple
+from .matcher import normalize
+
+THRESHOLD = float(os.getenv("YEARS_PARSER_THRESHOLD", "0.8"))
+MAX_YEARS = 60      # longer durations are not a driving career (probably an age or a typo)
+FIRST_YEAR = 1950   # four-digit numbers from here to this year are calendar years
+
+class YearsAnswer(NamedTuple):
+    value: float       # years, fractional ("18 months" -> 1.5)
+    confidence: float  # 0..1
+    reason: str
+
+ONES = {"zero": 0, "one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7,
+        "eight": 8, "nine": 9}
+TEENS = {"ten": 10, "eleven": 11, "twelve": 12, "thirteen": 13, "fourteen": 14, "fifteen": 15, "sixteen": 16,
+         "seventeen": 17, "eighteen": 18, "nineteen": 19}
+TENS = {"twenty": 20, "thirty": 30, "forty": 40, "fifty": 50, "sixty": 60}
+# Quantity words: (value, confidence). "a few"/"several" name no number, so they stay below THRESHOLD.
+VAGUE = {"couple": (2, 0.85), "few": (3, 0.5), "several": (3, 0.5), "dozen": (12, 0.95)}
+# Units in months.
+UNITS = {
+    "year": 12, "years": 12, "yr": 12, "yrs": 12, "y": 12,
+    "month": 1, "months": 1, "mo": 1, "mos": 1, "mth": 1, "mths": 1,
+    "week": 12 / 52, "weeks": 12 / 52, "wk": 12 / 52, "wks": 12 / 52,
+    "decade": 120, "decades": 120,
+}
+# Words before a duration that move or soften it.
+BELOW = ("almost", "nearly", "under", "less than", "not quite", "not even", "just under", "shy of", "barely")
+ABOVE = ("over", "more than", "at least", "above", "plus", "upwards of", "better than")
+ROUGH = ("about", "around", "roughly", "approximately", "approx", "like", "maybe", "probably", "close to", "ish",
+         "or so", "give or take", "i think", "i guess")
+SINCE = ("since", "started", "start", "starting", "began", "begin", "from", "in", "back in")
+NOW = ("now", "present", "today", "current", "currently")
+RANGE = ("-", "to", "or", "~", "/", "through", "thru", "until", "till")
+
+_TOKEN = re.compile(r"\d+(?:\.\d+)?|[a-z]+|[-~/+½]")
+
+def _tokens(text: str) -> list[str]:
+    text = normalize(text).replace("–", "-").replace("—", "-")
+    text = re.sub(r"(?<=[a-z])-(?=[a-z])", " ", text)  # twenty-five, year-and-a-half
+    return _TOKEN.findall(text)
+
+def _phrase_before(tokens: list[str], i: int, phrases: tuple) -> bool:
+    before = " ".join(tokens[max(0, i - 3):i])
+    return any(before == p or before.endswith(" " + p) for p in phrases)
+
+def _phrase_after(tokens: list[str], j: int, phrases: tuple) -> bool:
+    after = " ".join(tokens[j:j + 3])
+    return any(after == p or after.startswith(p + " ") for p in phrases)
+
+def _half_at(tokens: list[str], j: int) -> int:
+    # "and a half", "and half", "½": tokens consumed, 0 when absent.
+    if tokens[j:j + 3] == ["and", "a", "half"]:
+        return 3
+    if tokens[j:j + 2] == ["and", "half"]:
+        return 2
+    if tokens[j:j + 1] == ["½"]:
+        return 1
+    return 0
+
+def _number_at(tokens: list[str], i: int) -> tuple[float, int, float] | None:
+    """
+    :return: (value, index after the number, confidence), or None when no number starts at i
+    """
+    n = len(tokens)
+    tok = tokens[i]
+    nxt = tokens[i + 1] if i + 1 < n else ""
+    conf = 1.0
+    if tok[0].isdigit():
+        value, j = float(tok), i + 1
+    elif tok in ("a", "an"):
+        if UNITS.get(nxt):
+            value, j = 1.0, i + 1
+        elif nxt == "half":
+            value, j = 0.5, i + 2
+        elif nxt in VAGUE:
+            (value, conf), j = VAGUE[nxt], i + 2
+        else:
+            return None
+    elif tok == "half":
+        value, j = 0.5, i + 1
+        if nxt in ("a", "an"):
+            j += 1
+    elif tok in TENS:
+        value, j = TENS[tok], i + 1
+        if nxt in ONES and ONES[nxt]:
+            value, j = value + ONES[nxt], j + 1
+    elif tok in TEENS:
+        value, j = TEENS[tok], i + 1
+    elif tok in ONES:
+        value, j = ONES[tok], i + 1
+    elif tok in ("year", "month", "decade") and _half_at(tokens, i + 1):  # "year and a half"
+        value, j = 1.0, i
+    elif tok in VAGUE:
+        (value, conf), j = VAGUE[tok], i + 1
+    else:
+        return None
+    if tokens[j:j + 1] == ["of"]:  # "a couple of years"
+        j += 1
+    half = _half_at(tokens, j)
+    return float(value) + (0.5 if half else 0.0), j + half, conf
+
+class _Span(NamedTuple):
+    months: float
+    confidence: float
+    start: int
+    end: int
+    kind: str
+
+def _calendar_years(tokens: list[str], today: datetime.date) -> list[_Span]:
+    found = []
+    now = today.year + (today.timetuple().tm_yday - 1) / 365.25
+    for i, tok in enumerate(tokens):
+        if found and i < found[-1].end:
+            continue
+        if not (tok.isdigit() and len(tok) == 4 and FIRST_YEAR <= int(tok) <= today.year):
+            continue
+        year = int(tok)
+        # "2012 to 2020", "2015-present"
+        if i + 2 < len(tokens) and tokens[i + 1] in RANGE:
+            end = tokens[i + 2]
+            if end.isdigit() and len(end) == 4 and year <= int(end) <= today.year:
+                found.append(_Span((int(end) - year) * 12, 0.95, i, i + 3, "calendar range"))
+                continue
+            if end in NOW:
+                found.append(_Span((now - year - 0.5) * 12, 0.9, i, i + 3, "since year"))
+                continue
+        # "since 2015": the start month is unknown, so assume mid-year.
+        if _phrase_before(tokens, i, SINCE):
+            found.append(_Span(max(now - year - 0.5, 0.0) * 12, 0.9, i, i + 1, "since year"))
+        else:
+            found.append(_Span(max(now - year - 0.5, 0.0) * 12, 0.7, i, i + 1, "bare year"))
+    return found
+
+def _durations(tokens: list[str], taken: set) -> list[_Span]:
+    found = []
+    i, n = 0, len(tokens)
+    while i < n:
+        if i in taken:
+            i += 1
+            continue
+        parsed = _number_at(tokens, i)
+        if parsed is None:
+            i += 1
+            continue
+        value, j, conf = parsed
+        low = value
+        kind = "duration"
+        while j < n and tokens[j] in ("+", "ish"):  # "20+ years", "5ish years"
+            conf = min(conf, 0.9) if tokens[j] == "ish" else conf
+            j += 1
+        if j + 1 < n and tokens[j] in RANGE:  # "3-4 years", "5 or 6": the lower bound counts
+            other = _number_at(tokens, j + 1)
+            if other is not None and other[0] > value:
+                j, conf, kind = other[1], min(conf, 0.9), "range"
+        unit = UNITS.get(tokens[j]) if j < n else None
+        if unit is None:
+            # No unit: the question asked for years.
+            if j < n and tokens[j] in ("old", "yo"):
+                found.append(_Span(0.0, 0.0, i, j + 1, "age"))
+                i = j + 1
+                continue
+            found.append(_Span(low * 12, min(conf, 0.9), i, j, "bare number"))
+            i = j
+            continue
+        months = low * unit
+        j += 1
+        half = _half_at(tokens, j)
+        months += unit / 2 if half else 0
+        j += half
+        if j < n and tokens[j] == "old":  # "45 years old" is an age
+            found.append(_Span(0.0, 0.0, i, j + 1, "age"))
+            i = j + 1
+            continue
+        if j < n and tokens[j] == "ago":  # "3 years ago" dates something, but not necessarily the driving
+            conf, kind = min(conf, 0.5), "ago"
+        # "2 years 6 months", "1 year and 3 months": smaller units add up.
+        k = j + (1 if j < n and tokens[j] == "and" else 0)
+        while k < n:
+            more = _number_at(tokens, k)
+            if more is None or more[1] >= n or not UNITS.get(tokens[more[1]]) or UNITS[tokens[more[1]]] >= unit:
+                break
+            unit = UNITS[tokens[more[1]]]
+            months += more[0] * unit
+            j = k = more[1] + 1
+            k += 1 if k < n and tokens[k] == "and" else 0
+        found.append(_Span(months, conf, i, j, kind))
+        i = j
+    return found
+
+def parse_years(text: str, today: datetime.date | None = None) -> YearsAnswer | None:
+    """
+    Parse how much experience an answer states.
+    :param text: the applicant's answer
+    :param today: reference date for calendar years; defaults to today
+    :return: YearsAnswer, or None when the answer has no number in it at all.
+             Ages ("45 years old") and implausible durations come back with confidence 0:
+             the answer names a number, but not one to record as experience.
+    """
+    tokens = _tokens(text)
+    if not tokens:
+        return None
+    spans = _calendar_years(tokens, today or datetime.date.today())
+    taken = {k for s in spans for k in range(s.start, s.end)}
+    spans += _durations(tokens, taken)
+    if not spans:
+        return None
+    if all(s.kind == "age" for s in spans):
+        return YearsAnswer(0.0, 0.0, "age")
+    spans = [s for s in spans if s.kind != "age"]  # "I'm 45 years old, driving for 10 years"
+    spans.sort(key=lambda s: s.start)
+    span = spans[0]
+    confidence = span.confidence
+    if len(spans) > 1:
+        # "3 years OTR and 2 local", "5 years, my CDL for 2": more than one answer.
+        confidence = min(confidence, 0.5)
+    months = span.months
+    if _phrase_before(tokens, span.start, BELOW):
+        months -= 1  # "almost a year" is less than a year
+        confidence = min(confidence, 0.9)
+    elif _phrase_before(tokens, span.start, ABOVE) or _phrase_after(tokens, span.end, ("+", "plus")):
+        pass  # a lower bound is enough to screen on
+    elif _phrase_before(tokens, span.start, ROUGH) or _phrase_after(tokens, span.end, ROUGH):
+        confidence = min(confidence, 0.9)
+    years = max(months, 0.0) / 12
+    if years > MAX_YEARS:
+        return YearsAnswer(round(years, 2), 0.0, "implausible")
+    return YearsAnswer(round(years, 2), confidence, span.kind)
+
+def whole_years(answer: YearsAnswer) -> int:
+    """
+    :return: completed years, the way the screening compares experience ("18 months" -> 1)
+    """
+    return int(answer.value + 1e-9)